@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+공유 메모리 버스 소비자 - 모니터 프로세스(SHM_BUS=<이름>)가 발행한 시간대 행을 별도 프로세스에서 처리
+모니터는 디코딩/탐지만, 로깅과 분석은 다른 CPU 코어에서 (parser/shm_bus.py)
+
+사용 예:
+  SHM_BUS=can_monitor_bus python entry.py 0            # 모니터 (발행)
+  python bus_consumer.py csv                            # 행 → logs/bus_log_*.csv
+  python bus_consumer.py stats --interval 5             # 초당 행 수, 이벤트 구간, 신호 최댓값
+  SHM_BUS_ATTACH=can_monitor_bus python -m uvicorn dashboard_mode:app   # 대시보드 (구독)
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from parser.event_spans import EventSpanSink
+from parser.pipeline import CsvLogSink
+from parser.shm_bus import DEFAULT_NAME, ShmRowReader
+
+POLL_INTERVAL = 0.02
+
+
+def run_csv(reader, args):
+    """행 → CSV (모니터 프로세스의 CsvLogSink와 같은 형식)"""
+    sink = CsvLogSink(prefix="bus_log")
+    sink.open()
+    sequence = reader.sequence
+    try:
+        while True:
+            sequence, rows = reader.since(sequence)
+            for row in rows:
+                sink.write(row)
+            time.sleep(POLL_INTERVAL)
+    finally:
+        sink.close()
+
+
+def run_stats(reader, args):
+    """주기마다 행 수/놓친 행 수/이벤트 구간/신호 절댓값 최댓값 출력 (numpy 배열 그대로 집계)"""
+    spans = EventSpanSink()
+    sequence = reader.sequence
+    started = time.monotonic()
+    rows_total = missed_total = 0
+    peaks = None
+    while True:
+        time.sleep(args.interval)
+        previous = sequence
+        sequence, numbers, values = reader.arrays(sequence)
+        for row in reader.rows(values):  # 이벤트 구간은 행 단위로 누적
+            spans.write(row)
+        rows_total += len(numbers)
+        missed_total += max(0, sequence - previous - len(numbers))
+        if len(values):
+            window = np.fmax.reduce(np.abs(values), axis=0)  # NaN(값 없음)은 무시
+            peaks = window if peaks is None else np.fmax(peaks, window)
+        elapsed = time.monotonic() - started
+        _, found = spans.query()
+        print(f"🧩 {rows_total}행 ({rows_total / elapsed:.1f}행/초), 놓친 행 {missed_total}, "
+              f"이벤트 구간 {len(found)}개")
+        if peaks is not None and args.signals:
+            print("   " + ", ".join(f"{name}={peaks[reader.columns.index(name)]:g}"
+                                   for name in args.signals if name in reader.columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공유 메모리 버스 소비자")
+    parser.add_argument('mode', choices=['csv', 'stats'], help="csv: CSV 로깅, stats: 처리량/이벤트 집계")
+    parser.add_argument('--name', default=DEFAULT_NAME, help="버스 이름 (모니터의 SHM_BUS 값)")
+    parser.add_argument('--interval', type=float, default=5, help="stats 출력 주기 (초)")
+    parser.add_argument('--signals', default='SPEED,BRAKE_PRESSURE,STEERING_RATE',
+                        help="stats에서 최댓값을 출력할 신호 (쉼표 구분)")
+    args = parser.parse_args()
+    args.signals = [name for name in args.signals.split(',') if name]
+
+    reader = ShmRowReader(args.name)
+    print(f"⏳ 공유 메모리 버스 연결 대기: {args.name}")
+    while not reader.attached:
+        time.sleep(0.5)
+    try:
+        {'csv': run_csv, 'stats': run_stats}[args.mode](reader, args)
+    except KeyboardInterrupt:
+        print("🛑 종료")
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+CAN FD 트래픽 생성기 - DBC의 모든 메시지를 설정된 주기로 인코딩하여
+"CAN FD RX: ID=..., DLC=..., Data=..." 라인을 생성 (decode_line으로 그대로 해석 가능)
+
+사용 예:
+  python can_traffic_generator.py --duration 60 --output logs/original/synthetic.txt
+  python can_traffic_generator.py --duration 60 --output logs/original/synthetic.cap   # 바이너리 캡처
+  python can_traffic_generator.py --pty --scale 5          # 가상 시리얼(pty)로 실시간 송신
+"""
+
+import argparse
+import heapq
+import math
+import os
+import random
+import sys
+import time
+import tty
+
+from parser.can_decoder import get_dbc, encode_line, split_line
+from parser.pipeline import BinaryCaptureWriter
+
+# 메시지별 송신 주기 (Hz) - 지정하지 않은 메시지는 DEFAULT_RATE_HZ
+# 0xEA(MDPS)는 시간 기준 메시지이므로 MonitorCore의 0.1초 틱에 맞춤
+DEFAULT_RATE_HZ = 10
+MESSAGE_RATES = {
+    0xEA: 10,    # MDPS
+    0x35: 50,    # ACCELERATOR
+    0x60: 50,    # ESP_STATUS
+    0x65: 50,    # BRAKE
+    0xA0: 50,    # WHEEL_SPEEDS
+    0x100: 50,   # ACCELERATOR_BRAKE_ALT
+    0x125: 50,   # STEERING_SENSORS
+}
+
+
+class CanTrafficGenerator:
+    """DBC 기반 CAN FD 라인 생성기 (주기 메시지들을 시간순으로 병합)"""
+
+    def __init__(self, rates=None, default_rate=DEFAULT_RATE_HZ, scale=1.0, seed=0):
+        rates = {**MESSAGE_RATES, **(rates or {})}
+        self.dbc = get_dbc()
+        self.random = random.Random(seed)
+        self.rates = {msg.frame_id: rates.get(msg.frame_id, default_rate) * scale
+                      for msg in self.dbc.messages}
+        self.counters = {frame_id: 0 for frame_id in self.rates}
+        # COUNTER 신호 주기 (비트 수에 맞춰 순환, 중복 프레임으로 걸러지지 않도록 매번 증가)
+        self.counter_modulo = {msg.frame_id: 2 ** sig.length
+                               for msg in self.dbc.messages for sig in msg.signals if sig.name == 'COUNTER'}
+
+    @property
+    def frames_per_second(self):
+        return sum(self.rates.values())
+
+    def drive_state(self, t):
+        """시간 t(초)의 주행 상태 - 가감속/제동/조향이 섞인 반복 주행 패턴"""
+        phase = t % 60
+        accel = 1 if 5 <= phase < 20 else 0
+        brake = 1 if 40 <= phase < 46 else 0
+        sharp_steer = 30 <= phase < 31
+        speed = 40 + 25 * math.sin(2 * math.pi * t / 60)
+        angle = 20 * math.sin(2 * math.pi * t / 8) + (150 * (phase - 30) if sharp_steer else 0)
+        rate = 152 if sharp_steer else abs(20 * 2 * math.pi / 8 * math.cos(2 * math.pi * t / 8))
+        return {
+            'ACCELERATOR_PEDAL_PRESSED': accel,
+            'BRAKE_PRESSED': brake,
+            'BRAKE_PRESSURE': 350 if brake else 0,
+            'WHEEL_SPEED_1': speed,
+            'WHEEL_SPEED_2': speed,
+            'WHEEL_SPEED_3': speed,
+            'WHEEL_SPEED_4': speed,
+            'STEERING_ANGLE_2': angle,
+            'STEERING_RATE': min(rate, 1016),
+            'STEERING_COL_TORQUE': 0,
+            'ACCELERATOR_PEDAL': 30 if accel else 0,
+        }
+
+    def encode(self, frame_id, t):
+        msg = self.dbc.get_message_by_frame_id(frame_id)
+        state = self.drive_state(t)
+        signals = {sig.name: state[sig.name] for sig in msg.signals if sig.name in state}
+        if frame_id in self.counter_modulo:
+            self.counters[frame_id] = (self.counters[frame_id] + 1) % self.counter_modulo[frame_id]
+            signals['COUNTER'] = self.counters[frame_id]
+        return encode_line(frame_id, signals)
+
+    def frames(self, duration):
+        """(송신 시각, 라인)을 시간순으로 생성"""
+        queue = [(self.random.uniform(0, 1 / rate), frame_id)
+                 for frame_id, rate in self.rates.items() if rate > 0]
+        heapq.heapify(queue)
+        while queue:
+            t, frame_id = heapq.heappop(queue)
+            if t >= duration:
+                continue
+            yield t, self.encode(frame_id, t)
+            heapq.heappush(queue, (t + 1 / self.rates[frame_id], frame_id))
+
+
+def open_pty():
+    """가상 시리얼 포트 생성 → (송신용 master fd, 수신측 장치 경로)"""
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    return master, os.ttyname(slave)
+
+
+def feed(fd, frames, realtime=True):
+    """라인들을 fd에 송신 - realtime이면 송신 시각에 맞춰 대기, 아니면 최대 속도"""
+    started = time.perf_counter()
+    sent = 0
+    for t, line in frames:
+        if realtime:
+            delay = t - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+        os.write(fd, (line + '\n').encode('utf-8'))
+        sent += 1
+    return sent, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DBC 기반 CAN FD 트래픽 생성기")
+    parser.add_argument('--duration', type=float, default=60, help="생성 구간 (초)")
+    parser.add_argument('--scale', type=float, default=1.0, help="모든 메시지 주기 배율")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="라인을 저장할 파일 (.txt, .cap이면 바이너리 캡처)")
+    parser.add_argument('--pty', action='store_true', help="가상 시리얼(pty)로 실시간 송신")
+    args = parser.parse_args()
+
+    generator = CanTrafficGenerator(scale=args.scale, seed=args.seed)
+    print(f"📡 메시지 {len(generator.rates)}개, 총 {generator.frames_per_second:.0f} 프레임/초")
+
+    if args.pty:
+        master, path = open_pty()
+        print(f"🔌 가상 시리얼 포트: {path} (Ctrl+C로 종료)")
+        try:
+            sent, duration = feed(master, generator.frames(args.duration))
+            print(f"✅ 송신 완료: {sent} 프레임, {duration:.1f}초")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.close(master)
+    elif args.output and args.output.endswith('.cap'):
+        writer = BinaryCaptureWriter(args.output)
+        for t, line in generator.frames(args.duration):
+            can_id, data_bytes = split_line(line)
+            writer.write(can_id, data_bytes, t)
+        writer.close()
+        print(f"✅ {writer.count} 프레임 저장: {args.output}")
+    else:
+        out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        count = 0
+        for _, line in generator.frames(args.duration):
+            out.write(line + '\n')
+            count += 1
+        if args.output:
+            out.close()
+            print(f"✅ {count} 프레임 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+# config/buses.py
+# CAN 버스(채널)별 DBC 설정 - 차량의 여러 CAN FD 버스(샤시/ADAS/바디)가 서로 다른 DBC와 겹치는 ID를 가질 때
+# 게이트웨이 라인의 ", BUS=<채널 번호 또는 이름>" 태그로 버스를 구분, 태그가 없으면 채널 0
+#   예: "CAN FD RX: ID=0x1A0, BUS=1, DLC=24, Data=..."  또는  "..., BUS=adas, ..."
+# 채널 번호는 0~7 (CAN ID 29비트 위의 3비트에 채널을 넣어 프레임 키 하나로 처리)
+# prefix: 이 버스 신호명 앞에 붙일 문자열 - 다른 버스와 신호명이 겹칠 때 사용 (채널 0은 보통 비워 둠)
+
+BUSES = {
+    0: {'name': 'chassis', 'dbc': "dbc/openDBC_현대기아.dbc", 'prefix': ''},
+    # 1: {'name': 'adas', 'dbc': "dbc/adas.dbc", 'prefix': 'ADAS_'},
+    # 2: {'name': 'body', 'dbc': "dbc/body.dbc", 'prefix': 'BODY_'},
+}
@@ -0,0 +1,35 @@
+# config/capture.py
+# 로깅 방식 설정 - 환경변수 LOG_MODE로 덮어쓸 수 있음
+#   'continuous' : 모든 시간대를 CSV로 기록 (기본값)
+#   'trigger'    : 이벤트(*_on 트리거) 전후 구간만 이벤트 파일로 기록, 연속 CSV 로깅 안 함 (차량 로거용)
+#   'both'       : 연속 CSV + 이벤트 파일
+LOG_MODE = 'continuous'
+
+# 이벤트 파일 저장 위치 (구간마다 rows .csv.gz + 원본 프레임 .cap, index.jsonl에 목록)
+CAPTURE_DIR = 'logs/events'
+
+# 트리거 이전/이후 구간 (초) - 이후 구간 안에 새 트리거가 오면 그만큼 연장
+CAPTURE_PRE_SECONDS = 10
+CAPTURE_POST_SECONDS = 10
+
+# 이벤트 구간이 계속 연장될 때 한 파일의 최대 길이 (초) - 넘으면 저장 후 새 파일
+CAPTURE_MAX_SECONDS = 300
+
+# 디코딩 전 원본 프레임도 저장 (.cap - entry.py 2 <파일> 로 그대로 재생 가능)
+CAPTURE_RAW_FRAMES = True
+
+# 연속 CSV 로그 세그먼트 (LOG_MODE continuous/both) - parser/log_segments.py
+# 크기나 시간 한도에 도달하면 새 세그먼트 파일로 전환 (None이면 제한 없음)
+LOG_SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+LOG_SEGMENT_MAX_SECONDS = 3600
+
+# 기록 중인 세그먼트 저널의 fsync 주기 (초) - 정전 시 유실은 이 구간 이내 (프로세스 강제 종료는 유실 없음)
+# 0이면 행마다 fsync (기록 경로에서 디스크를 기다림), None이면 세그먼트를 닫을 때만
+LOG_FSYNC_INTERVAL = 1.0
+
+# 닫힌 세그먼트 압축 (백그라운드 스레드): 'gzip', 'zstd'(zstandard 모듈 필요 - 없으면 gzip), None(압축 안 함)
+LOG_COMPRESSION = 'gzip'
+
+# 보존 정책 - 넘으면 오래된 세그먼트부터 삭제 (None이면 제한 없음)
+LOG_RETENTION_MAX_BYTES = 2 * 1024 * 1024 * 1024
+LOG_RETENTION_MAX_DAYS = 30
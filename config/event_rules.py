@@ -0,0 +1,127 @@
+# config/event_rules.py
+# 이벤트 감지 규칙 설정 - 임계값(파라미터)과 규칙 구조를 코드와 분리
+# 차종별 튜닝은 VEHICLE_PROFILES에 바꿀 파라미터만 적으면 됨 (환경변수 VEHICLE_PROFILE로 선택)
+
+# 이벤트 우선순위 (앞쪽이 높음): PM > DD > SA > SB > SH
+EVENT_PRIORITY = ['PM', 'DD', 'SA', 'SB', 'SH']
+
+# 규칙 식에서 사용하는 신호 별칭 (별칭: DBC/파생 신호명)
+# REQUIRED_SIGNALS(config/signals.py)가 없으면 해당 틱은 판단하지 않고, 나머지는 0으로 간주
+RULE_SIGNALS = {
+    'a': 'ACCELERATOR_PEDAL_PRESSED',
+    'b': 'BRAKE_PRESSED',
+    'v': 'SPEED',
+    'p': 'BRAKE_PRESSURE',
+    'ang': 'STEERING_ANGLE_2',
+    'rate': 'STEERING_RATE',
+    'tq': 'STEERING_COL_TORQUE',
+}
+
+# 기본 임계값 (시간 단위: 초, 속도: km/h)
+DEFAULT_PARAMS = {
+    # PM - 페달 오조작
+    'PM_both_hold': 1.0,        # 가속+브레이크 동시 입력 누적 시간
+    'PM_check_time': 1.0,       # 가속 단독 입력 후 속도 변화 확인 시간
+    'PM_low_speed': 6,          # 저속/고속 구분 속도
+    'PM_dv_low': 4,             # 저속 시작 시 속도 증가량
+    'PM_dv_high': 8,            # 고속 시작 시 속도 증가량
+    'PM_off_hold': 0.5,
+    # SA - 급가속
+    'SA_check_time': 0.5,
+    'SA_low_speed': 6,
+    'SA_dv_low': 2,
+    'SA_dv_high': 4,
+    'SA_off_hold': 0.5,
+    # SB - 급제동
+    'SB_min_speed': 6,
+    'SB_hold': 0.3,
+    'SB_window': 0.3,
+    'SB_pressure': 300,
+    'SB_off_hold': 0.3,
+    # DD - 졸음운전
+    'DD_min_speed': 6,
+    'DD_max_torque': 1.0,
+    'DD_max_angle': 3.0,
+    'DD_max_rate': 30,
+    'DD_hold': 3.0,
+    'DD_off_hold': 0.3,
+    # SH - 급조향
+    'SH_min_speed': 6,
+    'SH_rate': 100,
+    'SH_window': 0.3,
+    'SH_min_samples': 2,
+    'SH_angle_change': 30,
+    'SH_off_rate': 10,
+    'SH_off_hold': 1.0,
+}
+
+# 차종별 파라미터 덮어쓰기 (예: 'EV6': {'SB_pressure': 280, 'DD_hold': 4.0})
+VEHICLE_PROFILES = {
+    'default': {},
+}
+
+# 이벤트별 on/off 규칙
+# 공통 키
+#   when  : 조건식 (RULE_SIGNALS 별칭과 DEFAULT_PARAMS 이름 사용 가능, 파라미터는 로드 시 상수로 치환)
+#   gate  : (선택) 거짓이면 이 규칙의 타이머/상태를 그대로 유지 (갱신도 초기화도 하지 않음)
+# type 'hold'  : when이 hold초 이상 유지되면 발생
+#   reset : when이 거짓일 때 타이머 초기화 여부 (False면 누적)
+#   rearm : 발생 후 타이머를 0으로 되돌릴지 여부
+#   window: (선택) 최근 seconds초 구간 검사, check 식의 별칭은 구간 값 리스트
+# type 'delta' : when이 시작된 시점의 signal 값(start)과 after초 뒤 값의 차이(delta)로 check 판단
+EVENT_RULES = {
+    'PM': {
+        'on': [
+            {'type': 'hold', 'when': 'a and b', 'hold': 'PM_both_hold', 'reset': False},
+            {'type': 'delta', 'when': 'a and not b', 'gate': 'not (a and b)',
+             'signal': 'v', 'after': 'PM_check_time',
+             'check': '(start < PM_low_speed and delta >= PM_dv_low) or '
+                      '(start >= PM_low_speed and delta >= PM_dv_high)'},
+        ],
+        'off': [
+            {'type': 'hold', 'when': 'not a', 'hold': 'PM_off_hold', 'reset': False},
+        ],
+    },
+    'SA': {
+        'on': [
+            {'type': 'delta', 'when': 'a and not b',
+             'signal': 'v', 'after': 'SA_check_time',
+             'check': '(start < SA_low_speed and delta >= SA_dv_low) or '
+                      '(start >= SA_low_speed and delta >= SA_dv_high)'},
+        ],
+        'off': [
+            {'type': 'hold', 'when': 'a == 0', 'hold': 'SA_off_hold', 'rearm': True},
+        ],
+    },
+    'SB': {
+        'on': [
+            {'type': 'hold', 'when': 'v >= SB_min_speed and b', 'hold': 'SB_hold',
+             'window': {'seconds': 'SB_window', 'check': 'max(p) >= SB_pressure'}},
+        ],
+        'off': [
+            {'type': 'hold', 'when': 'b == 0', 'hold': 'SB_off_hold'},
+        ],
+    },
+    'DD': {
+        'on': [
+            {'type': 'hold', 'hold': 'DD_hold',
+             'when': 'v >= DD_min_speed and not a and not b and abs(tq) < DD_max_torque '
+                     'and abs(ang) < DD_max_angle and abs(rate) < DD_max_rate'},
+        ],
+        'off': [
+            {'type': 'hold', 'when': 'a == 1 or b == 1', 'hold': 'DD_off_hold',
+             'gate': 'not (v >= DD_min_speed and not a and not b and abs(tq) < DD_max_torque '
+                     'and abs(ang) < DD_max_angle and abs(rate) < DD_max_rate)'},
+        ],
+    },
+    'SH': {
+        'on': [
+            {'type': 'hold', 'when': 'v >= SH_min_speed and abs(rate) >= SH_rate',
+             'window': {'seconds': 'SH_window', 'min_samples': 'SH_min_samples',
+                        'check': 'max(ang) - min(ang) > SH_angle_change'}},
+        ],
+        'off': [
+            {'type': 'hold', 'when': 'abs(rate) < SH_off_rate', 'hold': 'SH_off_hold'},
+        ],
+    },
+}
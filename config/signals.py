@@ -35,6 +35,11 @@ VISUALIZATION_SIGNALS = [
     'STEERING_COL_TORQUE',
 ]
 
+# 대시보드 그래프 렌더러 (generate_dashboard.py로 생성하는 페이지의 기본값)
+# - 'svg': Plotly scatter (기본, 신호가 적을 때 선명함)
+# - 'webgl': Plotly scattergl - 신호를 많이 표시하거나 수신 주기가 빠를 때 (static/benchmark.html로 비교)
+DASHBOARD_RENDERER = 'svg'
+
 # 신호별 색상 설정 (대시보드용)
 SIGNAL_COLORS = {
     'SPEED': "#1f77b4",
@@ -66,4 +71,41 @@ SIGNAL_SCALE_SUFFIXES = {
     'STEERING_ANGLE_2': " (÷30)",
     'STEERING_RATE': " (÷20)",
     'STEERING_COL_TORQUE': " (÷30)",
-} 
\ No newline at end of file
+} 
+
+# 이벤트 구간(span)마다 기록할 신호 최댓값 (절댓값 기준, 대시보드 구간 라벨/조회 API에 표시)
+EVENT_SPAN_PEAK_SIGNALS = [
+    'SPEED',
+    'BRAKE_PRESSURE',
+    'STEERING_RATE',
+    'LONG_ACCEL',
+]
+
+# 파생 신호 정의 (입력 신호로부터 계산되는 신호)
+# - formula: inputs 값으로 계산되는 식 (mean/abs/min/max 사용 가능)
+# - derivative: input 신호의 window(초) 구간 변화율 × scale
+# 입력 신호 값이 실제로 바뀐 경우에만 재계산되며, 파생 신호끼리 의존해도 됨 (순서 자동 결정)
+DERIVED_SIGNALS = {
+    'SPEED': {
+        'kind': 'formula',
+        'inputs': ['WHEEL_SPEED_1', 'WHEEL_SPEED_2', 'WHEEL_SPEED_3', 'WHEEL_SPEED_4'],
+        'formula': 'mean(WHEEL_SPEED_1, WHEEL_SPEED_2, WHEEL_SPEED_3, WHEEL_SPEED_4)',
+        'default': 0,
+    },
+    # 종방향 가속도 (m/s², SPEED는 km/h)
+    'LONG_ACCEL': {
+        'kind': 'derivative',
+        'input': 'SPEED',
+        'window': 0.5,
+        'scale': 1 / 3.6,
+        'default': 0,
+    },
+    # 조향 저크 (deg/s², STEERING_RATE의 변화율)
+    'STEERING_JERK': {
+        'kind': 'derivative',
+        'input': 'STEERING_RATE',
+        'window': 0.3,
+        'scale': 1,
+        'default': 0,
+    },
+}
@@ -0,0 +1,14 @@
+# config/tick.py
+# 시간대(틱) 분할 기준 설정 - 환경변수 TICK_SOURCE로 덮어쓸 수 있음
+#   'frame:0xEA' : 지정한 CAN ID 프레임이 들어올 때마다 (기본값, MDPS 10Hz)
+#   'rate:50'    : 수신 시각 기준 고정 주기 (Hz) - 높이면 감지 지연 감소, 낮추면 CPU 절약
+#                  프레임 시각이 있어야 함 (실시간 수신, TS= 포함 로그, .cap 캡처) - 시각 없는 텍스트 로그는 거부
+#   'every'      : 중복이 아닌 모든 프레임마다
+TICK_SOURCE = 'frame:0xEA'
+
+# 수신 시각을 알 수 없을 때(파일 재생 등) 사용하는 틱 주기 (초)
+FRAME_TICK_DT = {
+    0xEA: 0.1,   # MDPS
+}
+DEFAULT_FRAME_TICK_DT = 0.1
+EVERY_FRAME_TICK_DT = 0.002  # 모든 프레임 틱: 약 500 프레임/초 기준
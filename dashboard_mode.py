@@ -1,14 +1,21 @@
 # dashboard_mode.py
 
 from fastapi import FastAPI, WebSocket, UploadFile, File, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response
 from fastapi.staticfiles import StaticFiles
-import uvicorn, os, pandas as pd, asyncio, signal, sys
+import uvicorn, os, pandas as pd, asyncio, signal
 from parser.monitor_core import MonitorCore
 from parser.can_decoder import decode_line
 from parser.log_buffer import LogBuffer
-from event_logic.event_detector import process_data
-from config.signals import STANDARD_COLUMNS, VISUALIZATION_SIGNALS
+from parser.profiler import profiler, DEFAULT_SECONDS
+from parser.shutdown import ShutdownCoordinator
+from parser import hot_reload
+from parser.dashboard_bundle import DashboardBundle
+from parser.subscriptions import RowSnapshots, Subscription
+from parser import shm_bus
+from parser.log_segments import decompress_bytes, split_compression
+from event_logic.event_detector import process_data, detached_state, tick_dt
+from config import signals as signal_config  # 핫 리로드로 교체되므로 모듈 속성으로 참조
 
 from io import StringIO
 import datetime
@@ -25,59 +32,41 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 
 clients = set()
 monitor = MonitorCore()
+monitor.metrics.register_gauge('dashboard_clients', lambda: len(clients))
 log_buffer = monitor.log_buffer
 serial = None
 logging_start_time = None  # 로깅 시작 시간 추적
 csv_save_timer = None  # CSV 저장 타이머
 csv_filename = None  # CSV 파일명
-csv_data_buffer = []  # CSV 데이터 버퍼
 csv_save_lock = threading.Lock()  # CSV 저장용 락
+replay_task = None  # 서버 측 파일 재생 작업
+logging_task = None  # UART 수신 작업 (monitor.start)
+WS_MAX_ROWS = 200  # websocket 1회 확인당 최대 전송 행 수 (최대 속도 재생 시 중간 행 생략)
 
-def signal_handler(signum, frame):
-    """시그널 핸들러 - 안전한 종료"""
-    print(f"\n🛑 종료 신호 수신 (시그널: {signum})")
-    print("📊 데이터 저장 중...")
-    
-    # CSV 최종 저장
-    if monitor.csv_data_buffer:
-        monitor.stop_csv_logging()
-        print(f"💾 최종 CSV 저장 완료: {monitor.csv_filename}")
-    
-    # 시리얼 연결 종료
-    global serial
-    if serial:
-        serial.close()
-        print("🔌 UART 연결 종료")
-    
-    print("✅ 프로그램 안전 종료 완료")
-    sys.exit(0)
-
-# 시그널 핸들러 설정
-signal.signal(signal.SIGINT, signal_handler)
-signal.signal(signal.SIGTERM, signal_handler)
+# 종료 처리 - SIGINT/SIGTERM은 uvicorn이 받아 shutdown 이벤트로 전달 (import만으로 시그널 핸들러를 설치하지 않음)
+shutdown = ShutdownCoordinator(monitor)
+# DBC / config/signals.py 변경 시 재시작 없이 적용 (HOT_RELOAD=0 이면 끔)
+reloader = hot_reload.HotReloader(monitor)
+# 대시보드 페이지/자산은 메모리에서 제공 (generate_dashboard.py --bundle 결과가 있으면 오프라인 번들 사용)
+dashboard_bundle = DashboardBundle()
 
 def process_csv_simple(df):
     """CSV 데이터를 단순히 처리하는 함수 (이미 0xEA 기준으로 처리된 데이터)"""
     processed = []
+    # 업로드된 주행 데이터는 별도 주행 - 실시간 로깅 중이어도 그 FSM 타이머/파생 신호 히스토리를 건드리지 않도록 별도 상태 사용
+    state = detached_state()
+    times = df['Time'].tolist() if 'Time' in df.columns else None
     
-    for _, row in df.iterrows():
+    for index, (_, row) in enumerate(df.iterrows()):
         row_dict = row.to_dict()
-        
-        # 대시보드용: 모든 시각화 신호가 result에 없으면 None으로 채움
-        for sig in VISUALIZATION_SIGNALS:
-            if sig == "SPEED":
-                # SPEED는 원본 데이터에서 계산
-                if all(col in row_dict for col in ['WHEEL_SPEED_1','WHEEL_SPEED_2','WHEEL_SPEED_3','WHEEL_SPEED_4']):
-                    row_dict['SPEED'] = sum(float(row_dict[col]) for col in ['WHEEL_SPEED_1','WHEEL_SPEED_2','WHEEL_SPEED_3','WHEEL_SPEED_4']) / 4
-                else:
-                    row_dict['SPEED'] = None
-            elif sig not in row_dict:
-                row_dict[sig] = None
+        # 시간대 길이: 다음 행과의 Time 차이 (실시간 경로와 같이 행이 닫히는 시점까지의 간격)
+        dt = tick_dt(times, index)
         
         # Trigger와 Event 상태 로깅 추가 (실시간과 동일한 방식 사용)
         try:
             # process_data 함수를 사용하여 실시간과 동일한 방식으로 처리
-            processed_row = process_data(row_dict)
+            # (process_data가 row_dict에 SPEED 등 파생 신호를 채워 넣음)
+            processed_row = process_data(row_dict, dt, state)
             row_dict['trigger'] = processed_row.get('trigger', 'none')
             row_dict['event'] = processed_row.get('event', 'none')
             
@@ -85,6 +74,11 @@ def process_csv_simple(df):
             row_dict['trigger'] = 'error'  # 오류 발생 시 'error'
             row_dict['event'] = 'error'
         
+        # 대시보드용: 모든 시각화 신호가 result에 없으면 None으로 채움
+        for sig in signal_config.VISUALIZATION_SIGNALS:
+            if sig not in row_dict:
+                row_dict[sig] = None
+        
         processed.append(row_dict)
     
     return processed
@@ -97,63 +91,293 @@ def to_jsonable(data):
         return str(val)
     return {k: convert(v) for k, v in data.items()}
 
+def prepare_dashboard_row(row):
+    """websocket 공통 행 (시간대마다 한 번만 변환해 모든 클라이언트가 공유)"""
+    # 로깅 시작 시간 정보 추가
+    if logging_start_time:
+        row['logging_start_time'] = logging_start_time.isoformat()
+        row['logging_duration'] = (datetime.datetime.now() - logging_start_time).total_seconds()
+    return to_jsonable(row)
+
+# SHM_BUS_ATTACH=<이름>: 별도 모니터 프로세스(SHM_BUS=<이름> 으로 실행한 entry.py 0)가
+# 공유 메모리 버스에 발행한 행을 표시 - 웹 서버는 디코딩/탐지를 하지 않음
+bus_reader = shm_bus.reader_from_env()
+row_snapshots = RowSnapshots(bus_reader or monitor.dashboard_sink, prepare_dashboard_row)
+
+@app.on_event("startup")
+async def install_profiler_signal():
+    # kill -USR1 <pid> 로도 프로파일링 시작/종료
+    profiler.install_signal_toggle()
+
+@app.on_event("startup")
+async def recover_logs():
+    # 이전 실행(정전/강제 종료)이 남긴 로그 저널을 CSV로 마감 (작업 스레드에서)
+    monitor.csv_sink.recover()
+
+@app.on_event("startup")
+async def start_hot_reload():
+    if hot_reload.enabled():
+        asyncio.create_task(reloader.run())
+
+@app.on_event("startup")
+async def start_replay_from_env():
+    # entry.py 2 <파일> [배속] → 대시보드 시작과 함께 서버 측 재생
+    path = os.environ.get("REPLAY_FILE")
+    if path:
+        monitor.open_replay(path, float(os.environ.get("REPLAY_SPEED", "1")))
+        start_replay_task()
+
+async def follow_bus_spans():
+    """공유 메모리 버스의 행으로 이벤트 구간 누적 (구독 모드에서는 이 프로세스의 모니터가 행을 만들지 않음)"""
+    sequence = 0  # 연결 시점에 버스에 남아 있는 행부터
+    while True:
+        sequence, rows = bus_reader.since(sequence)
+        for row in rows:
+            monitor.span_sink.write(row)
+        await asyncio.sleep(0.05)
+
+@app.on_event("startup")
+async def start_ipc():
+    # IPC_SOCKET=<경로> 이면 다른 도구용 Unix 소켓 발행 (ipc_subscriber.py로 구독)
+    await monitor.start_ipc()
+
+@app.on_event("startup")
+async def start_bus_follower():
+    if bus_reader:
+        print(f"🧩 공유 메모리 버스 구독 모드: {bus_reader.name}")
+        asyncio.create_task(follow_bus_spans())
+
+def bundle_response(asset, request):
+    """ETag 재검증(304)과 Accept-Encoding에 따른 미리 압축된 본문 선택"""
+    status, headers, body = asset.respond(request.headers.get('accept-encoding'),
+                                          request.headers.get('if-none-match'))
+    return Response(content=body, status_code=status, headers=headers)
+
 @app.get("/", response_class=HTMLResponse)
-async def root():
-    with open("static/index.html", encoding="utf-8") as f:
-        return f.read()
+async def root(request: Request):
+    return bundle_response(dashboard_bundle.index(), request)
+
+@app.get("/assets/{name}")
+async def bundle_asset(name: str, request: Request):
+    """번들 자산 (해시가 붙은 이름 - 1년 캐시)"""
+    asset = dashboard_bundle.asset(name)
+    if asset is None:
+        return PlainTextResponse("❌ 없는 파일입니다.", status_code=404)
+    return bundle_response(asset, request)
+
+@app.get("/bundle")
+async def bundle_status():
+    """현재 제공 중인 대시보드 번들 정보"""
+    return dashboard_bundle.status()
+
+async def receive_subscriptions(websocket, state):
+    """클라이언트 구독 메시지 수신 - 연결이 끊기면 종료"""
+    while True:
+        try:
+            message = await websocket.receive_json()
+        except ValueError:
+            continue  # JSON이 아닌 메시지는 무시
+        except Exception:
+            return
+        if not isinstance(message, dict) or message.get('type') != 'subscribe':
+            continue
+        try:
+            state['subscription'] = Subscription.from_message(message)
+        except (ValueError, TypeError) as e:
+            await websocket.send_json({'type': 'error', 'message': f"구독 설정 오류: {e}"})
+            continue
+        await websocket.send_json({'type': 'subscribed', **state['subscription'].describe()})
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
     clients.add(websocket)
     print("INFO: connection open")
+    # 구독 메시지를 보내기 전까지는 모든 필드를 제한 없이 전송
+    state = {'subscription': Subscription()}
+    reader = asyncio.create_task(receive_subscriptions(websocket, state))
     try:
-        last_sent_time = None
-        check_count = 0
-        while True:
+        # 접속 시점의 최신 행부터 전송, 이후 기록된 행은 배속 재생 중에도 빠짐없이 전송
+        last_sequence = max(0, row_snapshots.latest_sequence() - 1)
+        span_sequence = monitor.span_sink.sequence  # 이전 구간은 페이지가 /events/spans로 조회
+        config_version = 0  # 페이지에 반영된 신호 설정 버전 (0: 페이지 생성 시점 설정)
+        while not reader.done():
             await asyncio.sleep(0.05)  # 0.05초 간격으로 더 빠르게 체크
-            check_count += 1
-            
-            # 메모리에서 최신 데이터 가져오기 (매우 빠름)
-            latest_data = monitor.get_latest_data_for_dashboard()
-            
-            if latest_data:
-                # 로깅 시작 시간 정보 추가
-                if logging_start_time:
-                    latest_data['logging_start_time'] = logging_start_time.isoformat()
-                    latest_data['logging_duration'] = (datetime.datetime.now() - logging_start_time).total_seconds()
-                
-                # SPEED 계산 추가
-                if 'WHEEL_SPEED_1' in latest_data and 'WHEEL_SPEED_2' in latest_data and 'WHEEL_SPEED_3' in latest_data and 'WHEEL_SPEED_4' in latest_data:
-                    try:
-                        speed = (float(latest_data['WHEEL_SPEED_1']) + float(latest_data['WHEEL_SPEED_2']) + 
-                                float(latest_data['WHEEL_SPEED_3']) + float(latest_data['WHEEL_SPEED_4'])) / 4
-                        latest_data['SPEED'] = speed
-                    except (ValueError, TypeError):
-                        latest_data['SPEED'] = 0
-                
-                # 새로운 데이터인 경우에만 전송
-                current_time = latest_data.get('Time', 0)
-                if last_sent_time != current_time:
-                    await websocket.send_json(to_jsonable(latest_data))
-                    last_sent_time = current_time
-            
-            else:
-                # 20번마다 한 번씩 상태 출력
-                if check_count % 20 == 0:
-                    pass
-                    
+
+            # 신호 설정이 다시 읽혔으면 체크박스/색상/스케일 갱신용 설정 전송
+            if reloader.version != config_version:
+                config_version = reloader.version
+                await websocket.send_json({'type': 'config', 'version': config_version,
+                                           **hot_reload.visualization_config()})
+
+            # 이벤트 구간 open/close (구독한 클라이언트만, 행보다 먼저 보내 구간이 행과 같이 그려지도록)
+            span_sequence, span_messages = monitor.span_sink.messages_since(span_sequence)
+            if state['subscription'].spans:
+                for message in span_messages:
+                    await websocket.send_json(message)
+
+            # 새로 기록된 행 (변환은 공유) → 이 클라이언트의 구독에 맞는 필드/주기만 직렬화
+            last_sequence, snapshots = row_snapshots.since(last_sequence, limit=WS_MAX_ROWS)
+            for text in state['subscription'].messages(snapshots):
+                started = time.perf_counter()
+                await websocket.send_text(text)
+                if monitor.metrics.enabled:
+                    monitor.metrics.observe_stage('websocket', time.perf_counter() - started)
+                    monitor.metrics.inc('websocket_messages_total')
+                    monitor.metrics.inc('websocket_bytes_total', len(text.encode('utf-8')))
+        print("INFO: connection closed")
+
     except Exception as e:
         print(f"INFO: connection closed - {e}")
     finally:
+        reader.cancel()
         clients.discard(websocket)
 
+@app.get("/events/spans")
+async def get_event_spans(start: float = None, end: float = None, code: str = None, limit: int = 500):
+    """[start, end] 시간 범위와 겹치는 이벤트 구간 (진행 중인 구간은 end가 null, 최근 limit개)"""
+    sequence, spans = monitor.span_sink.query(start, end, code, limit)
+    return {'sequence': sequence, 'spans': spans}
+
+@app.get("/captures")
+async def get_captures(limit: int = 100):
+    """트리거 캡처로 저장한 이벤트 구간 파일 목록 (LOG_MODE=trigger/both)"""
+    if not monitor.capture_sink:
+        return {'mode': monitor.log_mode, 'captures': []}
+    return {**monitor.capture_sink.status(), 'captures': monitor.capture_sink.index(limit)}
+
+@app.get("/logs/segments")
+async def get_log_segments():
+    """연속 CSV 로그 세그먼트 목록 (크기, 압축 여부, 보존 정책)"""
+    return monitor.csv_sink.segments() or {'segments': []}
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 형식 계측 값"""
+    return PlainTextResponse(monitor.metrics.render_prometheus(),
+                             media_type="text/plain; version=0.0.4")
+
+@app.get("/bus")
+async def bus_status():
+    """공유 메모리 버스 상태 (발행: SHM_BUS, 구독: SHM_BUS_ATTACH)와 IPC 발행 상태 (IPC_SOCKET)"""
+    publishing = monitor.bus_sink
+    return {'publish': {'name': publishing.name, 'sequence': publishing.sequence,
+                        'slots': publishing.slots} if publishing else None,
+            'attach': bus_reader.status() if bus_reader else None,
+            'ipc': monitor.ipc.status() if monitor.ipc else None}
+
+@app.get("/config")
+async def get_config():
+    """현재 시각화 신호 설정과 핫 리로드 상태"""
+    return {**hot_reload.visualization_config(), 'reload': reloader.status()}
+
+@app.post("/metrics/toggle")
+async def toggle_metrics(enabled: bool = True):
+    """계측 on/off (오버헤드 비교용)"""
+    monitor.metrics.set_enabled(enabled)
+    return f"📊 계측 {'활성화' if enabled else '비활성화'}"
+
+@app.post("/profile/start")
+async def start_profile(seconds: float = DEFAULT_SECONDS, mode: str = "sample"):
+    """프로파일링 시작 (seconds 후 자동 종료, 결과는 logs/profile_*)"""
+    try:
+        profiler.start(seconds, mode)
+    except (RuntimeError, ValueError) as e:
+        return JSONResponse(content={"success": False, "message": str(e)}, status_code=409)
+    return {"success": True, **profiler.status()}
+
+@app.post("/profile/stop")
+async def stop_profile():
+    path = profiler.stop()
+    return {"success": path is not None, "output": path}
+
+@app.get("/profile/status")
+async def profile_status():
+    return profiler.status()
+
+def start_replay_task():
+    global replay_task
+    replay_task = shutdown.track(asyncio.create_task(monitor.replay()))
+
+async def stop_replay_task():
+    """진행 중인 재생 중지 - 이미 기록된 행/CSV는 그대로 둠"""
+    global replay_task
+    if replay_task and not replay_task.done():
+        monitor.running = False
+        if monitor.replay_source:
+            monitor.replay_source.resume()  # 일시정지 중이면 대기에서 빠져나오도록
+        await replay_task
+    replay_task = None
+
+def replay_running():
+    return replay_task is not None and not replay_task.done()
+
+@app.post("/replay/start")
+async def start_replay(speed: float = 1.0, path: str = None, file: UploadFile = File(None)):
+    """녹화 파일(원본 캡처 .txt/.cap 또는 CSV)을 실시간과 같은 경로로 서버에서 재생
+    speed: 배속 (0이면 대기 없이 최대 속도), 업로드 파일 또는 서버의 path 중 하나"""
+    if serial:
+        return JSONResponse(content={"success": False, "message": "UART 로깅 중에는 재생할 수 없습니다."},
+                            status_code=409)
+    if file is not None and file.filename:
+        replay_dir = os.path.join("logs", "replay")
+        os.makedirs(replay_dir, exist_ok=True)
+        path = os.path.join(replay_dir, os.path.basename(file.filename))
+        with open(path, "wb") as f:
+            f.write(await file.read())
+    if not path or not os.path.exists(path):
+        return JSONResponse(content={"success": False, "message": f"재생할 파일이 없습니다: {path}"},
+                            status_code=404)
+
+    await stop_replay_task()
+    try:
+        monitor.open_replay(path, speed)
+    except Exception as e:
+        return JSONResponse(content={"success": False, "message": f"재생 준비 실패: {e}"}, status_code=400)
+    start_replay_task()
+    return {"success": True, **monitor.replay_source.status()}
+
+@app.post("/replay/speed")
+async def set_replay_speed(speed: float):
+    if not monitor.replay_source:
+        return JSONResponse(content={"success": False, "message": "재생 중이 아닙니다."}, status_code=409)
+    monitor.replay_source.set_speed(speed)
+    return {"success": True, **monitor.replay_source.status()}
+
+@app.post("/replay/pause")
+async def pause_replay():
+    if not replay_running():
+        return JSONResponse(content={"success": False, "message": "재생 중이 아닙니다."}, status_code=409)
+    monitor.replay_source.pause()
+    return {"success": True, **monitor.replay_source.status()}
+
+@app.post("/replay/resume")
+async def resume_replay():
+    if not replay_running():
+        return JSONResponse(content={"success": False, "message": "재생 중이 아닙니다."}, status_code=409)
+    monitor.replay_source.resume()
+    return {"success": True, **monitor.replay_source.status()}
+
+@app.post("/replay/stop")
+async def stop_replay():
+    await stop_replay_task()
+    return {"success": True, **(monitor.replay_source.status() if monitor.replay_source else {})}
+
+@app.get("/replay/status")
+async def replay_status():
+    if not monitor.replay_source:
+        return {"running": False}
+    return {"running": replay_running(), **monitor.replay_source.status()}
+
 @app.post("/start_logging")
 async def start_logging():
-    global serial, logging_start_time
+    global serial, logging_start_time, logging_task
     if Serial is None:
         return "❌ pyserial 미설치"
     try:
+        # 서버 측 재생 중이면 중지 (같은 MonitorCore 사용)
+        await stop_replay_task()
+
         # 기존 연결이 있으면 종료
         if serial:
             serial.close()
@@ -165,10 +389,8 @@ async def start_logging():
         serial = Serial("/dev/ttyS0", 115200, timeout=1)  # ttyUSB0 → ttyS0로 변경
         logging_start_time = datetime.datetime.now()  # 로깅 시작 시간 기록
         
-        # CSV 로깅 시작
-        monitor.start_csv_logging()
-        
-        asyncio.create_task(monitor.start(serial))
+        # 수신 시작 (monitor.start가 CSV 로깅 시작)
+        logging_task = shutdown.track(asyncio.create_task(monitor.start(serial)))
         start_time_str = logging_start_time.strftime("%Y-%m-%d %H:%M:%S")
         return f"✅ 로깅 시작됨 ({start_time_str})"
     except Exception as e:
@@ -176,14 +398,19 @@ async def start_logging():
 
 @app.post("/stop_logging")
 async def stop_logging():
-    global serial, logging_start_time
+    global serial, logging_start_time, logging_task
     try:
-        # 모니터링 중지
+        # 모니터링 중지 - 이미 도착한 라인까지 처리하고 수신 작업이 끝나기를 기다림
         monitor.running = False
-        
-        # CSV 최종 저장
-        if monitor.csv_data_buffer:
-            monitor.stop_csv_logging()
+        if logging_task and not logging_task.done():
+            await asyncio.wait({logging_task}, timeout=shutdown.timeout)
+        logging_task = None
+
+        # 최종 저장 (마지막 시간대 처리 → 마지막 세그먼트 fsync 후 마감, 진행 중인 이벤트 구간 캡처 저장)
+        # LOG_MODE=trigger면 CSV는 열리지 않지만 flush/캡처 저장은 필요 - 닫는 함수들은 여러 번 불러도 안전
+        csv_was_open = monitor.csv_sink.is_open
+        monitor.stop_csv_logging()
+        if csv_was_open:
             print(f"💾 최종 CSV 저장 완료: {monitor.csv_filename}")
         
         # 시리얼 연결 종료
@@ -212,7 +439,8 @@ async def upload_csv(file: UploadFile = File(...)):
 
         print(f"📁 업로드 요청 파일명: {file.filename}")
         contents = await file.read()
-        csv_data = contents.decode("utf-8")
+        # 압축된 로그 세그먼트(.csv.gz/.csv.zst)도 그대로 업로드 가능
+        csv_data = decompress_bytes(file.filename, contents).decode("utf-8")
         df = pd.read_csv(StringIO(csv_data))
         # 컬럼명을 모두 대문자화(혹시 소문자 업로드 대비) - Time과 event는 제외
         df.columns = [col.upper() if col not in ['Time', 'event'] else col for col in df.columns]
@@ -226,7 +454,7 @@ async def upload_csv(file: UploadFile = File(...)):
         # 파일 저장
         logs_dir = "logs"
         os.makedirs(logs_dir, exist_ok=True)
-        filename = file.filename
+        filename = split_compression(file.filename)[0]
         ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         base, ext = os.path.splitext(filename)
         new_filename = f"{base}_{ts}{ext}"
@@ -235,7 +463,7 @@ async def upload_csv(file: UploadFile = File(...)):
 
         # config에서 정의된 컬럼 순서로 저장 (DBC 신호명 기준)
         result_df = pd.DataFrame(processed)
-        for col in STANDARD_COLUMNS:
+        for col in signal_config.STANDARD_COLUMNS:
             if col not in result_df.columns:
                 result_df[col] = 0
         
@@ -244,7 +472,7 @@ async def upload_csv(file: UploadFile = File(...)):
             result_df['trigger'] = 'none'
         
         # 컬럼 순서: STANDARD_COLUMNS + event + trigger
-        result_df = result_df[STANDARD_COLUMNS + ['event', 'trigger']]
+        result_df = result_df[signal_config.STANDARD_COLUMNS + ['event', 'trigger']]
         result_df.to_csv(temp_path, index=False)
         os.rename(temp_path, final_path)
         print(f"✅ CSV 안전 저장 완료 → {final_path}")
@@ -264,7 +492,15 @@ async def upload_csv(file: UploadFile = File(...)):
             os.remove(temp_path)
         return JSONResponse(content={"success": False, "message": f"처리 중 오류 발생: {str(e)}"})
 
+@app.on_event("shutdown")
+async def flush_on_shutdown():
+    # Ctrl+C/SIGTERM → uvicorn 종료 → 수신 중지, 남은 데이터 저장 (SHUTDOWN_TIMEOUT초 안에서)
+    await shutdown.shutdown("서버 종료")
+
 @app.post("/shutdown")
-async def shutdown(request: Request):
+async def shutdown_server(request: Request):
     print("🛑 브라우저 종료 감지 → 서버 종료 중")
-    os._exit(0)
+    report = await shutdown.shutdown("브라우저 종료")
+    # 데이터 저장을 마친 뒤 uvicorn에 종료 요청 (shutdown 이벤트는 같은 결과를 재사용)
+    asyncio.get_running_loop().call_later(0.1, os.kill, os.getpid(), signal.SIGTERM)
+    return report
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+이벤트 감지 벤치마크 - 정답 구간(라벨)이 있는 주행 데이터를
+decode → StreamEngine(실시간과 같은 처리 경로) → process_data 전체 경로로 재생하여
+감지 지연(틱), precision/recall, 처리량(행/초)을 측정
+
+사용 예:
+  python detection_benchmark.py                                 # 합성 주행 데이터로 측정
+  python detection_benchmark.py --save-baseline logs/detection_baseline.json
+  python detection_benchmark.py --baseline logs/detection_baseline.json   # 회귀 시 종료코드 1
+  python detection_benchmark.py --drive logs/original/a.txt --labels a_labels.csv
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+from config.event_rules import EVENT_PRIORITY
+from event_logic import event_detector
+from parser.can_decoder import encode_line
+from parser.log_buffer import LogBuffer
+from parser.pipeline import StreamEngine
+from parser.tick_source import FrameTick
+
+TICK_DT = 0.1
+# 감지 구간이 라벨 종료 후 이 틱 수 이내에 시작하면 같은 이벤트로 인정
+MATCH_TOLERANCE_TICKS = 10
+
+
+class DriveSynthesizer:
+    """라벨이 붙은 합성 주행 데이터 생성 (0.1초 틱 단위 신호값)"""
+
+    def __init__(self, seed=0):
+        self.random = random.Random(seed)
+        self.ticks = []   # 틱별 신호값 dict
+        self.labels = []  # (event, start_tick, end_tick)
+        self.state = {'a': 0, 'b': 0, 'p': 0, 'v': 40.0, 'ang': 0.0, 'rate': 0}
+
+    def _emit(self, count, **changes):
+        for _ in range(count):
+            for key, value in changes.items():
+                self.state[key] = value(self.state[key]) if callable(value) else value
+            self.ticks.append(dict(self.state))
+
+    def _labelled(self, event, count, **changes):
+        start = len(self.ticks)
+        self._emit(count, **changes)
+        self.labels.append((event, start, len(self.ticks) - 1))
+
+    def cooldown(self):
+        """모든 이벤트가 해제되도록: 약한 브레이크 후 조향 유지 주행 (조향각은 직진으로 복귀)"""
+        self._emit(15, a=0, b=1, p=50, rate=0, ang=0.0)
+        self._emit(10, a=0, b=0, p=0, rate=40)
+
+    def cruise(self, seconds):
+        # 조향 속도 40deg/s 유지 → 졸음운전 조건 불만족
+        self._emit(int(seconds / TICK_DT), a=0, b=0, p=0, rate=40,
+                   ang=lambda x: x + self.random.uniform(-1, 1))
+
+    def pedal_misuse(self):
+        self._labelled('PM', 20, a=1, b=1, p=100, rate=40)
+
+    def sudden_accel(self):
+        # 0.5초간 +6km/h 후 유지 (1초 기준 +8km/h 미만이라 PM 조건에는 걸리지 않음)
+        self._labelled('SA', 5, a=1, b=0, p=0, rate=40, v=lambda v: v + 1.2)
+        self._emit(10, a=1, b=0, rate=40)
+
+    def sudden_brake(self):
+        self._labelled('SB', 20, a=0, b=1, p=400, rate=40, v=lambda v: max(v - 0.8, 10))
+
+    def drowsy(self):
+        # 조향 입력 없이 직진 유지 (0xEA의 조향각이 감지에 반영되므로 각도도 0 부근)
+        self._labelled('DD', 60, a=0, b=0, p=0, rate=0, v=60.0, ang=0.0)
+
+    def sharp_steer(self):
+        self._labelled('SH', 10, a=0, b=0, p=0, rate=152, ang=lambda x: x + 15)
+        self._emit(12, rate=0)
+
+    def build(self, repeats=3):
+        scenarios = [self.pedal_misuse, self.sudden_accel, self.sudden_brake,
+                     self.drowsy, self.sharp_steer]
+        self.cruise(3)
+        for _ in range(repeats):
+            order = scenarios[:]
+            self.random.shuffle(order)
+            for scenario in order:
+                scenario()
+                self.cooldown()
+                self.cruise(self.random.uniform(2, 5))
+                self.state['v'] = 40.0
+        return self.ticks, self.labels
+
+
+def ticks_to_lines(ticks):
+    """틱별 신호값 → CAN FD RX 라인 (0xEA 후 나머지 메시지 순서)"""
+    lines = []
+    counter = 0
+    for tick in ticks:
+        counter = (counter + 1) % 256
+        lines.append(encode_line(0xEA, {'COUNTER': counter, 'STEERING_ANGLE_2': tick['ang'],
+                                        'STEERING_COL_TORQUE': 0}))
+        lines.append(encode_line(0x100, {'COUNTER': counter, 'ACCELERATOR_PEDAL_PRESSED': tick['a'],
+                                         'BRAKE_PRESSED': tick['b']}))
+        lines.append(encode_line(0x60, {'COUNTER': counter, 'BRAKE_PRESSURE': tick['p'],
+                                        'BRAKE_PRESSED': tick['b']}))
+        lines.append(encode_line(0xA0, {'COUNTER': counter, **{f'WHEEL_SPEED_{i}': tick['v'] for i in range(1, 5)}}))
+        lines.append(encode_line(0x125, {'COUNTER': counter, 'STEERING_RATE': tick['rate']}))
+    # 마지막 시간대를 닫기 위한 0xEA
+    lines.append(encode_line(0xEA, {'COUNTER': (counter + 1) % 256}))
+    return lines
+
+
+def load_labels(path):
+    """라벨 CSV (event,start,end - 초 단위) → (event, start_tick, end_tick)"""
+    labels = []
+    with open(path, encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            labels.append((row['event'], round(float(row['start']) / TICK_DT),
+                           round(float(row['end']) / TICK_DT)))
+    return labels
+
+
+def replay(lines):
+    """라인들을 실시간과 같은 처리 경로(StreamEngine.process_line)로 처리하고 틱별 event 리스트 반환"""
+    event_detector.reset_state()
+    # 라벨이 0xEA 틱 단위이므로 TICK_SOURCE 설정과 관계없이 0xEA 기준으로 재생
+    monitor = StreamEngine(FrameTick(0xEA))
+    monitor.log_buffer = LogBuffer(maxlen=None)
+
+    started = time.perf_counter()
+    # 이벤트 알림 출력은 측정에서 제외
+    with contextlib.redirect_stdout(io.StringIO()):
+        for line in lines:
+            monitor.process_line(line)
+    duration = time.perf_counter() - started
+
+    rows = list(monitor.log_buffer.buffer)
+    # Time = (틱 번호 + 1) × 0.1
+    events = {}
+    for row in rows:
+        events[round(row['Time'] / TICK_DT) - 1] = row.get('event', 'none')
+    tick_events = [events.get(i, 'none') for i in range(max(events) + 1 if events else 0)]
+    return tick_events, duration
+
+
+def detected_spans(tick_events):
+    """틱별 event → (event, start_tick, end_tick) 구간"""
+    spans = []
+    current = None
+    for tick, value in enumerate(tick_events + ['none']):
+        code = value[:-3] if value.endswith('_on') else None
+        if current and current[0] != code:
+            spans.append((current[0], current[1], tick - 1))
+            current = None
+        if code and current is None:
+            current = (code, tick)
+    return spans
+
+
+def score(labels, spans):
+    """이벤트별 precision/recall/지연(틱) 계산"""
+    report = {}
+    for event in EVENT_PRIORITY:
+        event_labels = [l for l in labels if l[0] == event]
+        event_spans = [s for s in spans if s[0] == event]
+        matched_spans = set()
+        latencies = []
+        for _, start, end in event_labels:
+            for index, (_, span_start, _) in enumerate(event_spans):
+                if index not in matched_spans and start <= span_start <= end + MATCH_TOLERANCE_TICKS:
+                    matched_spans.add(index)
+                    latencies.append(span_start - start)
+                    break
+        report[event] = {
+            'labels': len(event_labels),
+            'detected': len(event_spans),
+            'true_positive': len(latencies),
+            'precision': round(len(matched_spans) / len(event_spans), 3) if event_spans else None,
+            'recall': round(len(latencies) / len(event_labels), 3) if event_labels else None,
+            'latency_mean_ticks': round(sum(latencies) / len(latencies), 2) if latencies else None,
+            'latency_max_ticks': max(latencies) if latencies else None,
+        }
+    return report
+
+
+def compare_to_baseline(result, baseline, latency_slack=1, metric_slack=0.0):
+    """기준 결과 대비 회귀 항목 리스트"""
+    regressions = []
+    for event, current in result['events'].items():
+        previous = baseline['events'].get(event)
+        if not previous:
+            continue
+        for metric in ('precision', 'recall'):
+            if previous[metric] is not None and (current[metric] or 0) < previous[metric] - metric_slack:
+                regressions.append(f"{event} {metric}: {previous[metric]} → {current[metric]}")
+        if previous['latency_mean_ticks'] is not None and current['latency_mean_ticks'] is not None:
+            if current['latency_mean_ticks'] > previous['latency_mean_ticks'] + latency_slack:
+                regressions.append(f"{event} 지연: {previous['latency_mean_ticks']} → "
+                                   f"{current['latency_mean_ticks']} 틱")
+    return regressions
+
+
+def run_benchmark(lines, labels):
+    tick_events, duration = replay(lines)
+    spans = detected_spans(tick_events)
+    return {
+        'ticks': len(tick_events),
+        'frames': len(lines),
+        'seconds': round(duration, 3),
+        'rows_per_sec': round(len(tick_events) / duration, 1) if duration else None,
+        'frames_per_sec': round(len(lines) / duration, 1) if duration else None,
+        'events': score(labels, spans),
+    }
+
+
+def print_report(result):
+    print(f"{'이벤트':<6}{'라벨':>6}{'감지':>6}{'TP':>5}{'precision':>11}{'recall':>8}{'지연(평균)':>12}{'지연(최대)':>12}")
+    for event, r in result['events'].items():
+        print(f"{event:<6}{r['labels']:>6}{r['detected']:>6}{r['true_positive']:>5}"
+              f"{str(r['precision']):>11}{str(r['recall']):>8}"
+              f"{str(r['latency_mean_ticks']):>12}{str(r['latency_max_ticks']):>12}")
+    print(f"⚡ 처리량: {result['rows_per_sec']} 행/초, {result['frames_per_sec']} 프레임/초 "
+          f"({result['ticks']}틱, {result['frames']}프레임, {result['seconds']}초)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이벤트 감지 지연/정확도/처리량 벤치마크")
+    parser.add_argument('--drive', help="원본 UART 로그 (.txt, 없으면 합성 데이터 사용)")
+    parser.add_argument('--labels', help="--drive의 라벨 CSV (event,start,end 초 단위)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeats', type=int, default=3, help="합성 시나리오 반복 횟수")
+    parser.add_argument('--export', help="합성 데이터를 로그(.txt)/라벨(.csv)로 저장할 경로 접두사")
+    parser.add_argument('--baseline', help="기준 결과 JSON - 회귀가 있으면 종료코드 1")
+    parser.add_argument('--save-baseline', help="이번 결과를 기준 JSON으로 저장")
+    args = parser.parse_args()
+
+    if args.drive:
+        if not args.labels:
+            parser.error("--drive에는 --labels가 필요합니다")
+        with open(args.drive, encoding='utf-8') as f:
+            lines = [line.strip() for line in f]
+        labels = load_labels(args.labels)
+    else:
+        ticks, labels = DriveSynthesizer(args.seed).build(args.repeats)
+        lines = ticks_to_lines(ticks)
+        if args.export:
+            with open(f"{args.export}.txt", 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            with open(f"{args.export}_labels.csv", 'w', encoding='utf-8') as f:
+                f.write('event,start,end\n')
+                for event, start, end in labels:
+                    f.write(f"{event},{start * TICK_DT:.1f},{end * TICK_DT:.1f}\n")
+            print(f"💾 합성 주행 데이터 저장: {args.export}.txt, {args.export}_labels.csv")
+
+    result = run_benchmark(lines, labels)
+    print_report(result)
+
+    os.makedirs("logs", exist_ok=True)
+    output = f"logs/detection_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"📁 결과 저장: {output}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"💾 기준 결과 저장: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(result, baseline)
+        if regressions:
+            print("❌ 감지 성능 회귀:")
+            for item in regressions:
+                print(f"   • {item}")
+            sys.exit(1)
+        print("✅ 기준 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
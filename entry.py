@@ -1,3 +1,4 @@
+import os
 import sys
 import uvicorn
 import webbrowser
@@ -9,12 +10,38 @@ def open_browser():
     time.sleep(1.5)  # 서버가 완전히 실행되기까지 약간의 지연
     webbrowser.open("http://localhost:8000")
 
+async def log_metrics(monitor, interval):
+    """헤드리스 모드: 계측 요약을 주기적으로 출력"""
+    while True:
+        await asyncio.sleep(interval)
+        if monitor.metrics.enabled:
+            print(monitor.metrics.summary_line())
+
 async def run_monitor():
     from parser.monitor_core import MonitorCore
+    from parser.profiler import profiler
+    from parser.shutdown import ShutdownCoordinator
+    from parser import hot_reload
     from serial import Serial
     monitor = MonitorCore()
+    # Ctrl+C/SIGTERM → 수신 중지 후 남은 데이터 저장 (SHUTDOWN_TIMEOUT초 안에서)
+    shutdown = ShutdownCoordinator(monitor)
+    shutdown.install_signal_handlers()
+    # kill -USR1 <pid> 로 프로파일링 시작/종료 (PROFILE_SECONDS 후 자동 종료)
+    profiler.install_signal_toggle()
     serial = Serial("/dev/ttyS0", 115200, timeout=1)  # ttyUSB0 → ttyS0로 변경
-    await monitor.start(serial)
+    interval = float(os.environ.get("METRICS_LOG_INTERVAL", "10"))
+    if interval > 0:
+        asyncio.create_task(log_metrics(monitor, interval))
+    # DBC / config/signals.py 변경 시 재시작 없이 적용 (HOT_RELOAD=0 이면 끔)
+    if hot_reload.enabled():
+        asyncio.create_task(hot_reload.HotReloader(monitor).run())
+    # IPC_SOCKET=<경로> 이면 다른 도구용 Unix 소켓 발행 (ipc_subscriber.py로 구독)
+    await monitor.start_ipc()
+    task = shutdown.track(asyncio.create_task(monitor.start(serial)))
+    await asyncio.wait([task, asyncio.create_task(shutdown.wait())], return_when=asyncio.FIRST_COMPLETED)
+    report = await shutdown.shutdown("모니터 종료")
+    sys.exit(0 if not report['lost_rows'] else 1)
 
 if __name__ == "__main__":
     mode = int(sys.argv[1]) if len(sys.argv) > 1 else 0
@@ -23,6 +50,16 @@ if __name__ == "__main__":
         print("✅ 대시보드 모드 실행 중... (http://localhost:8000)")
         threading.Thread(target=open_browser).start()
         uvicorn.run("dashboard_mode:app", host="0.0.0.0", port=8000)
+    elif mode == 2:
+        # 재생 모드: 녹화 파일(.txt/.cap 원본 캡처 또는 CSV)을 실시간 경로로 재생 (배속 0 = 최대 속도)
+        if len(sys.argv) < 3:
+            print("❗ 재생 모드(2)에서는 파일 경로를 지정하세요")
+            sys.exit(1)
+        os.environ["REPLAY_FILE"] = sys.argv[2]
+        os.environ["REPLAY_SPEED"] = sys.argv[3] if len(sys.argv) > 3 else "1"
+        print(f"✅ 재생 모드 실행 중... ({sys.argv[2]}, 배속 {os.environ['REPLAY_SPEED']}, http://localhost:8000)")
+        threading.Thread(target=open_browser).start()
+        uvicorn.run("dashboard_mode:app", host="0.0.0.0", port=8000)
     else:
         print("✅ 헤드리스 모드 실행 중...")
         asyncio.run(run_monitor())
@@ -1,55 +1,74 @@
 # event_logic/event_detector.py
 
 from event_logic.rules import EventFSM
+from parser.derived_signals import DerivedSignalEngine
 
 fsm = EventFSM()
+# 파생 신호 (SPEED 등) - 입력 신호가 바뀐 경우에만 재계산
+derived = DerivedSignalEngine()
 
-def ensure_signals(row):
-    # DBC 기준 컬럼명 사용 (CSV 파일에 speed 컬럼이 없으므로)
-    signal_mapping = {
-        'SPEED': ['WHEEL_SPEED_1', 'WHEEL_SPEED_2', 'WHEEL_SPEED_3', 'WHEEL_SPEED_4'],
-        'ACCELERATOR_PEDAL_PRESSED': ['ACCELERATOR_PEDAL_PRESSED'],
-        'BRAKE_PRESSED': ['BRAKE_PRESSED'],
-        'BRAKE_PRESSURE': ['BRAKE_PRESSURE'],
-        'STEERING_ANGLE_2': ['STEERING_ANGLE_2'],
-        'STEERING_RATE': ['STEERING_RATE'],
-        'STEERING_COL_TORQUE': ['STEERING_COL_TORQUE']
-    }
+# 이벤트 감지에 사용하는 DBC 신호 (없으면 0으로 채움)
+EVENT_INPUT_SIGNALS = [
+    'ACCELERATOR_PEDAL_PRESSED',
+    'BRAKE_PRESSED',
+    'BRAKE_PRESSURE',
+    'STEERING_ANGLE_2',
+    'STEERING_RATE',
+    'STEERING_COL_TORQUE',
+]
+
+def ensure_signals(row, engine=None):
+    # SPEED 등 파생 신호는 config/signals.py의 DERIVED_SIGNALS 정의로 계산
+    (engine or derived).update(row)
     
-    for target_key, source_keys in signal_mapping.items():
-        if target_key not in row:
-            if target_key == 'SPEED':
-                # SPEED는 WHEEL_SPEED_1~4의 평균으로 계산
-                if all(k in row for k in source_keys):
-                    try:
-                        row[target_key] = sum(float(row[k]) for k in source_keys) / 4
-                    except Exception:
-                        row[target_key] = 0
-                else:
-                    row[target_key] = 0
-            else:
-                # 다른 신호들은 해당 컬럼이 있으면 사용, 없으면 0
-                found = False
-                for source_key in source_keys:
-                    if source_key in row:
-                        row[target_key] = row[source_key]
-                        found = True
-                        break
-                if not found:
-                    row[target_key] = 0
+    for key in EVENT_INPUT_SIGNALS:
+        if key not in row:
+            row[key] = 0
     
     return row
 
-def process_data(row):
-    row = ensure_signals(row)
+def reset_state(rule_set=None):
+    """이벤트 FSM과 파생 신호 상태 초기화 - 새 주행 데이터를 처음부터 처리할 때 사용"""
+    global fsm
+    fsm = EventFSM(rule_set)
+    derived.reset()
+
+def set_required_signals(rule_set):
+    """필수 신호만 바뀐 규칙 집합으로 교체 (핫 리로드) - 타이머/이벤트 상태는 유지"""
+    fsm.detector.rules = rule_set
+
+def detached_state():
+    """실시간 경로와 섞이지 않는 별도 (EventFSM, DerivedSignalEngine) - 업로드 등 다른 주행 데이터 처리용
+    규칙/파생 신호 정의는 지금 사용 중인 것(핫 리로드 반영)을 그대로 사용"""
+    return EventFSM(fsm.detector.rules), DerivedSignalEngine(derived.definitions)
+
+def get_derived_values():
+    """마지막으로 계산된 파생 신호 값 (대시보드 표시용)"""
+    return derived.values()
+
+def tick_dt(times, index, default=0.1):
+    """저장된 주행 데이터의 index번째 시간대 길이 = 다음 행과의 Time 차이 (마지막 행/비정상 값은 default)"""
+    if times is None or index + 1 >= len(times):
+        return default
+    try:
+        dt = float(times[index + 1]) - float(times[index])
+    except (TypeError, ValueError):
+        return default
+    return dt if dt > 0 else default
+
+def process_data(row, dt=0.1, state=None):
+    """row: 시간대 1개의 신호, dt: 해당 시간대의 실제 길이(초) - 규칙 타이머가 dt만큼 진행
+    state: detached_state()의 (EventFSM, DerivedSignalEngine) - None이면 실시간 경로의 전역 상태"""
+    event_fsm, engine = state or (fsm, derived)
+    row = ensure_signals(row, engine)
     
     # FSM에 SPEED가 포함된 데이터 전달하여 trigger 생성
-    triggers = fsm.detect(row)
+    triggers = event_fsm.detect(row, dt)
     
     result = row.copy()
-    # SPEED 컬럼은 저장하지 않음 (계산된 값이므로)
-    if 'SPEED' in result:
-        result.pop('SPEED')
+    # 파생 신호 컬럼은 저장하지 않음 (계산된 값이므로)
+    for name in engine.names:
+        result.pop(name, None)
     
     # trigger 컬럼 추가
     if triggers:
@@ -58,7 +77,7 @@ def process_data(row):
         result['trigger'] = 'none'
     
     # 현재 활성화된 이벤트 상태를 event 컬럼에 설정
-    current_event = fsm.get_current_event()
+    current_event = event_fsm.get_current_event()
     result['event'] = current_event
     
     # 컬럼 순서: 기존 컬럼(단, event, trigger 제외) + trigger + event
@@ -0,0 +1,237 @@
+# event_logic/rule_engine.py
+# config/event_rules.py의 선언형 규칙을 로드 시점에 하나의 파이썬 함수로 컴파일
+# - 파라미터는 상수로 치환, 타이머/지연 상태는 슬롯 인덱스 리스트로 관리
+# - 실시간 경로(EventDetector)와 배치 경로(스윕 등)가 같은 컴파일 결과를 사용
+
+import ast
+import os
+from collections import deque
+
+# 규칙 식에서 사용할 수 있는 내장 함수
+RULE_BUILTINS = {'abs', 'min', 'max', 'len'}
+
+
+class _ParamInliner(ast.NodeTransformer):
+    """식 안의 파라미터 이름을 상수로 치환하고 허용되지 않은 이름을 검사"""
+
+    def __init__(self, params, allowed, where):
+        self.params = params
+        self.allowed = allowed
+        self.where = where
+
+    def visit_Name(self, node):
+        if node.id in self.params:
+            return ast.copy_location(ast.Constant(self.params[node.id]), node)
+        if node.id not in self.allowed and node.id not in RULE_BUILTINS:
+            raise ValueError(f"{self.where}: 알 수 없는 이름 '{node.id}'")
+        return node
+
+
+class _WindowRenamer(ast.NodeTransformer):
+    """윈도우 검사식의 신호 별칭을 구간 값 리스트 변수로 치환"""
+
+    def __init__(self, names):
+        self.names = set(names)
+
+    def visit_Name(self, node):
+        if node.id in self.names:
+            return ast.copy_location(ast.Name(f'{node.id}_w', ast.Load()), node)
+        return node
+
+
+def _expr(source, params, allowed, where):
+    """식 문자열 → 파라미터가 치환된 파이썬 식 문자열"""
+    if not isinstance(source, str):
+        return repr(source)
+    tree = ast.parse(source, mode='eval')
+    tree = _ParamInliner(params, allowed, where).visit(tree)
+    return ast.unparse(ast.fix_missing_locations(tree))
+
+
+def _value(value, params, where):
+    """hold/after/seconds 등 숫자 항목: 숫자 또는 파라미터 이름"""
+    if isinstance(value, str):
+        if value not in params:
+            raise ValueError(f"{where}: 알 수 없는 파라미터 '{value}'")
+        return params[value]
+    return value
+
+
+class CompiledRuleSet:
+    """컴파일된 규칙 집합 - evaluate(row, dt, now, timers, delays, history) → trigger 리스트"""
+
+    def __init__(self, rules, params, priority, signals, required):
+        self.rules = rules
+        self.required = list(required)
+        self.params = dict(params)
+        self.events = list(rules)
+        self.priority = list(priority)
+        self.signals = dict(signals)
+        self.timer_count = 0
+        self.delta_count = 0
+        self.max_window = 0.0
+        self.source = self._generate(rules, required)
+        namespace = {'deque': deque}
+        exec(compile(self.source, '<event_rules>', 'exec'), namespace)
+        self.evaluate = namespace['evaluate']
+
+    def with_required(self, required):
+        """같은 규칙/파라미터를 필수 신호만 바꿔 다시 컴파일 (타이머/지연 슬롯 배치는 그대로)"""
+        return CompiledRuleSet(self.rules, self.params, self.priority, self.signals, required)
+
+    def _generate(self, rules, required):
+        aliases = list(self.signals)
+        lines = ['def evaluate(row, dt, now, T, D, H):']
+        emit = lambda depth, text: lines.append('    ' * depth + text)
+
+        # 신호 읽기 (필수 신호가 없으면 판단하지 않음)
+        emit(1, 'try:')
+        for alias in aliases:
+            if self.signals[alias] in required:
+                emit(2, f'{alias} = row[{self.signals[alias]!r}]')
+        emit(1, 'except KeyError:')
+        emit(2, 'return []')
+        for alias in aliases:
+            if self.signals[alias] not in required:
+                emit(1, f'{alias} = row.get({self.signals[alias]!r}, 0)')
+        emit(1, f'H.append((now, {", ".join(aliases)}))')
+        history_line = len(lines)
+        emit(1, 'out = []')
+
+        # 동일한 조건식은 한 번만 계산
+        conditions = {}
+
+        def condition(source, where):
+            expr = _expr(source, self.params, aliases, where)
+            if expr not in conditions:
+                conditions[expr] = f'c{len(conditions)}'
+            return conditions[expr]
+
+        body = []
+        for event, spec in rules.items():
+            for phase in ('on', 'off'):
+                for index, clause in enumerate(spec.get(phase, [])):
+                    where = f'{event}.{phase}[{index}]'
+                    trigger = f'{event}_{phase}'
+                    body.append((0, f'# {where}'))
+                    kind = clause.get('type', 'hold')
+                    if kind == 'hold':
+                        self._emit_hold(body, clause, trigger, where, condition, aliases)
+                    elif kind == 'delta':
+                        self._emit_delta(body, clause, trigger, where, condition, aliases)
+                    else:
+                        raise ValueError(f"{where}: 알 수 없는 type '{kind}'")
+
+        for expr, name in conditions.items():
+            emit(1, f'{name} = {expr}')
+        for depth, text in body:
+            emit(depth + 1, text)
+        emit(1, 'return out')
+
+        if self.max_window > 0:
+            lines.insert(history_line, f'    while H[0][0] < now - {self.max_window!r}:')
+            lines.insert(history_line + 1, '        H.popleft()')
+        else:
+            lines.insert(history_line, '    H.clear()')
+        return '\n'.join(lines) + '\n'
+
+    def _emit_window(self, body, depth, window, where, aliases):
+        seconds = _value(window['seconds'], self.params, where)
+        min_samples = _value(window.get('min_samples', 1), self.params, where)
+        self.max_window = max(self.max_window, seconds)
+        check = ast.parse(_expr(window['check'], self.params, aliases, where), mode='eval')
+        used = [a for a in aliases if any(isinstance(n, ast.Name) and n.id == a for n in ast.walk(check))]
+
+        body.append((depth, f'w = [h for h in H if h[0] >= now - {seconds!r}]'))
+        body.append((depth, f'if len(w) >= {min_samples!r}:'))
+        for alias in used:
+            body.append((depth + 1, f'{alias}_w = [h[{aliases.index(alias) + 1}] for h in w]'))
+        expr = ast.unparse(_WindowRenamer(used).visit(check))
+        body.append((depth + 1, f'if {expr}:'))
+        return depth + 2
+
+    def _emit_hold(self, body, clause, trigger, where, condition, aliases):
+        hold = _value(clause.get('hold', 0), self.params, where)
+        depth = 0
+        if 'gate' in clause:
+            body.append((depth, f'if {condition(clause["gate"], where)}:'))
+            depth += 1
+        when = condition(clause['when'], where)
+
+        if hold <= 0:
+            # 유지 시간이 없으면 타이머 없이 즉시 판단
+            body.append((depth, f'if {when}:'))
+            fire_depth = depth + 1
+            if 'window' in clause:
+                fire_depth = self._emit_window(body, fire_depth, clause["window"], where, aliases)
+            body.append((fire_depth, f'out.append({trigger!r})'))
+            return
+
+        slot = self.timer_count
+        self.timer_count += 1
+        body.append((depth, f'if {when}:'))
+        body.append((depth + 1, f'T[{slot}] += dt'))
+        body.append((depth + 1, f'if T[{slot}] >= {hold!r}:'))
+        fire_depth = depth + 2
+        if 'window' in clause:
+            fire_depth = self._emit_window(body, fire_depth, clause["window"], where, aliases)
+        body.append((fire_depth, f'out.append({trigger!r})'))
+        if clause.get('rearm', False):
+            body.append((fire_depth, f'T[{slot}] = 0'))
+        if clause.get('reset', True):
+            body.append((depth, 'else:'))
+            body.append((depth + 1, f'T[{slot}] = 0'))
+
+    def _emit_delta(self, body, clause, trigger, where, condition, aliases):
+        after = _value(clause['after'], self.params, where)
+        signal = clause['signal']
+        if signal not in aliases:
+            raise ValueError(f"{where}: 알 수 없는 신호 별칭 '{signal}'")
+        check = _expr(clause['check'], self.params, {'start', 'delta'}, where)
+
+        slot = self.delta_count
+        self.delta_count += 1
+        depth = 0
+        if 'gate' in clause:
+            body.append((depth, f'if {condition(clause["gate"], where)}:'))
+            depth += 1
+        body.append((depth, f'if {condition(clause["when"], where)}:'))
+        body.append((depth + 1, f'd = D[{slot}]'))
+        body.append((depth + 1, 'if d is None:'))
+        body.append((depth + 2, f'd = D[{slot}] = [{signal}, 0]'))
+        body.append((depth + 1, 'd[1] += dt'))
+        body.append((depth + 1, f'if d[1] >= {after!r}:'))
+        body.append((depth + 2, 'start = d[0]'))
+        body.append((depth + 2, f'delta = {signal} - start'))
+        body.append((depth + 2, f'if {check}:'))
+        body.append((depth + 3, f'out.append({trigger!r})'))
+        body.append((depth + 2, f'D[{slot}] = None'))
+        body.append((depth, 'else:'))
+        body.append((depth + 1, f'D[{slot}] = None'))
+
+
+def resolve_params(profile=None, overrides=None):
+    """기본값 + 차종 프로파일 + 개별 덮어쓰기를 합친 파라미터 반환"""
+    from config.event_rules import DEFAULT_PARAMS, VEHICLE_PROFILES
+
+    profile = profile or os.environ.get('VEHICLE_PROFILE', 'default')
+    if profile not in VEHICLE_PROFILES:
+        raise ValueError(f"알 수 없는 차종 프로파일: {profile}")
+
+    params = dict(DEFAULT_PARAMS)
+    for source in (VEHICLE_PROFILES[profile], overrides or {}):
+        unknown = set(source) - set(DEFAULT_PARAMS)
+        if unknown:
+            raise ValueError(f"알 수 없는 파라미터: {sorted(unknown)}")
+        params.update(source)
+    return params
+
+
+def load_rule_set(profile=None, overrides=None, rules=None):
+    """config/event_rules.py의 규칙을 컴파일하여 CompiledRuleSet 반환"""
+    from config.event_rules import EVENT_RULES, EVENT_PRIORITY, RULE_SIGNALS
+    from config.signals import REQUIRED_SIGNALS
+
+    params = resolve_params(profile, overrides)
+    return CompiledRuleSet(rules or EVENT_RULES, params, EVENT_PRIORITY,
+                           RULE_SIGNALS, REQUIRED_SIGNALS)
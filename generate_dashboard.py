@@ -1,14 +1,346 @@
 # generate_dashboard.py
 # config/signals.py의 VISUALIZATION_SIGNALS를 기반으로 대시보드 HTML을 자동으로 생성
 
+import argparse
+import datetime
+import gzip
+import json
 import os
-from config.signals import VISUALIZATION_SIGNALS, SIGNAL_COLORS, SIGNAL_SCALES, SIGNAL_SCALE_SUFFIXES
+import re
+import urllib.request
+from config.signals import (VISUALIZATION_SIGNALS, SIGNAL_COLORS, SIGNAL_SCALES, SIGNAL_SCALE_SUFFIXES,
+                            DASHBOARD_RENDERER)
+from parser.dashboard_bundle import DIST_DIR, ENCODINGS, INDEX_NAME, MANIFEST_NAME, SOURCE_INDEX, content_hash
 
-def generate_dashboard_html():
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 대시보드 렌더러 → Plotly 트레이스 종류 (webgl: 신호가 많거나 주기가 빠를 때)
+RENDERER_TRACE_TYPES = {'svg': 'scatter', 'webgl': 'scattergl'}
+# 벤치마크 페이지에서 끊김 없이 보이는 기준 (초당 렌더링 프레임)
+MIN_SMOOTH_FPS = 30
+
+# 신호별 링 버퍼 + extendTraces 증분 렌더링 (대시보드와 렌더링 벤치마크 페이지가 함께 사용)
+# 사용하는 쪽에서 maxWindow, maxPoints, initialized, traceType, seriesSignals(저장할 신호 목록), scaleMap,
+# signalColors, scaleSuffix, manualViewMode, manualViewRange를 정의해야 함
+SERIES_JS = '''    // 신호별 시계열 저장소 - 시간/값을 Float64Array 링 버퍼에 보관 (최대 maxPoints 포인트)
+    // 그래프에는 새로 들어온 포인트만 Plotly.extendTraces로 추가하고 maxWindow 밖의 포인트는 잘라냄
+    // → 기록이 길어져도 한 번 갱신하는 비용은 그 사이 들어온 포인트 수에만 비례
+    const series = {
+      time: new Float64Array(maxPoints),
+      values: {},      // 신호 → Float64Array (스케일 적용 전 값)
+      min: {},         // 신호 → maxWindow 안 포인트의 최솟값/최댓값 (y축 범위, 스케일 적용 전)
+      max: {},
+      stale: {},       // 신호 → 최솟값/최댓값 포인트가 창에서 빠져 다시 계산해야 함
+      total: 0,        // 지금까지 추가된 포인트 수 (링 위치 = 번호 % maxPoints)
+      rendered: 0,     // 그래프에 반영된 포인트 수
+      windowStart: 0,  // maxWindow 안에 드는 첫 포인트 번호
+      latest: null     // 마지막 포인트 (상태 표시용)
+    };
+    let plotKey = null;      // 현재 그래프 구성 (뷰 모드 + 신호 목록) - 바뀌면 전체 다시 그림
+    let plotSignals = [];    // 트레이스 순서대로의 신호명
+    let shownLayout = {};    // 그래프에 마지막으로 반영한 layout 항목 ("xaxis.range" 등 → JSON)
+
+    function seriesLength() {
+      return Math.min(series.total, maxPoints);
+    }
+
+    function seriesValues(sig) {
+      if (!series.values[sig]) {
+        series.values[sig] = new Float64Array(maxPoints);
+        series.min[sig] = Infinity;
+        series.max[sig] = -Infinity;
+      }
+      return series.values[sig];
+    }
+
+    // 창에서 빠지는 포인트 - 그 값이 최솟값/최댓값이었으면 해당 신호의 범위를 다음에 다시 계산
+    function evictPoint(index) {
+      const slot = index % maxPoints;
+      for (const sig in series.values) {
+        const value = series.values[sig][slot];
+        if (value <= series.min[sig] || value >= series.max[sig]) series.stale[sig] = true;
+      }
+    }
+
+    function pushPoint(data) {
+      // 링이 가득 차면 덮어쓸 포인트를 먼저 창에서 제외
+      if (series.total >= maxPoints && series.windowStart <= series.total - maxPoints) {
+        evictPoint(series.windowStart);
+        series.windowStart = series.total - maxPoints + 1;
+      }
+      const slot = series.total % maxPoints;
+      series.time[slot] = data.Time;
+      for (const sig of seriesSignals) {
+        const value = Number(data[sig] ?? NaN);  // 받지 않은 신호(구독 밖)는 끊긴 구간으로 표시
+        seriesValues(sig)[slot] = value;
+        if (value < series.min[sig]) series.min[sig] = value;
+        if (value > series.max[sig]) series.max[sig] = value;
+      }
+      series.total += 1;
+      series.latest = data;
+
+      // maxWindow를 벗어난 포인트는 창에서 제외
+      while (series.windowStart < series.total - 1 &&
+             series.time[series.windowStart % maxPoints] < data.Time - maxWindow) {
+        evictPoint(series.windowStart);
+        series.windowStart += 1;
+      }
+    }
+
+    // 창 [windowStart, total) 안의 최솟값/최댓값 다시 계산 (최솟값/최댓값 포인트가 빠졌을 때만)
+    function windowRange(sig) {
+      const values = series.values[sig];
+      let low = Infinity, high = -Infinity;
+      for (let i = series.windowStart; i < series.total; i++) {
+        const value = values[i % maxPoints];
+        if (value < low) low = value;
+        if (value > high) high = value;
+      }
+      series.min[sig] = low;
+      series.max[sig] = high;
+      delete series.stale[sig];
+    }
+
+    function resetSeries() {
+      series.values = {};
+      series.min = {};
+      series.max = {};
+      series.stale = {};
+      series.total = 0;
+      series.rendered = 0;
+      series.windowStart = 0;
+      series.latest = null;
+      plotKey = null;
+    }
+
+    // 포인트 번호 [from, to) 구간을 새 Float64Array로 복사 (링 끝을 넘으면 두 번에 나눠 복사)
+    function sliceRing(ring, from, to, scale = 1) {
+      const out = new Float64Array(to - from);
+      const start = from % maxPoints;
+      const first = Math.min(out.length, maxPoints - start);
+      out.set(ring.subarray(start, start + first));
+      if (first < out.length) out.set(ring.subarray(0, out.length - first), first);
+      if (scale !== 1) {
+        for (let i = 0; i < out.length; i++) out[i] *= scale;
+      }
+      return out;
+    }
+
+    // 시간 t 이상인 첫 포인트 번호 (시간은 증가 순서로 들어온다고 가정)
+    function seriesIndexAt(t) {
+      let lo = series.total - seriesLength(), hi = series.total;
+      while (lo < hi) {
+        const mid = Math.floor((lo + hi) / 2);
+        if (series.time[mid % maxPoints] < t) lo = mid + 1;
+        else hi = mid;
+      }
+      return lo;
+    }
+
+    function yRange(sigs) {
+      let yMin = 0, yMax = 1;
+      sigs.forEach(sig => {
+        if (series.stale[sig]) windowRange(sig);
+        if (!(series.min[sig] <= series.max[sig])) return;
+        const scale = scaleMap[sig] || 1;
+        const low = Math.min(series.min[sig] * scale, series.max[sig] * scale);
+        const high = Math.max(series.min[sig] * scale, series.max[sig] * scale);
+        if (low < yMin) yMin = low - 1;
+        if (high > yMax) yMax = high + 1;
+      });
+      return [yMin, yMax];
+    }
+
+    // 전체 다시 그림 - 실시간 뷰는 maxWindow 구간, 수동 뷰는 보고 있는 구간만 링에서 복사
+    function redrawPlot(sigs, layout) {
+      let from = series.windowStart, to = series.total;
+      if (manualViewMode && manualViewRange) {
+        from = seriesIndexAt(manualViewRange[0]);
+        to = Math.min(series.total, seriesIndexAt(manualViewRange[1]) + 1);
+      }
+      const traces = sigs.map(sig => ({
+        x: sliceRing(series.time, from, to),
+        y: sliceRing(seriesValues(sig), from, to, scaleMap[sig] || 1),
+        name: sig + (scaleSuffix[sig] || ""),
+        type: traceType,
+        mode: 'lines',
+        line: { color: signalColors[sig] || '#000000' }
+      }));
+
+      if (!initialized) {
+        Plotly.newPlot("plot", traces, layout);
+        initialized = true;
+      } else {
+        Plotly.react("plot", traces, layout);
+      }
+      plotSignals = sigs;
+      series.rendered = series.total;
+      shownLayout = {};
+      changedLayout(layout);
+    }
+
+    // layout에서 마지막으로 반영한 것과 달라진 항목만 ("xaxis.range" 단위로 펼침)
+    function changedLayout(layout) {
+      const update = {};
+      for (const [key, value] of Object.entries(layout)) {
+        const entries = value && typeof value === "object" && !Array.isArray(value)
+          ? Object.entries(value).map(([sub, subValue]) => [key + "." + sub, subValue])
+          : [[key, value]];
+        for (const [path, item] of entries) {
+          const text = JSON.stringify(item);
+          if (shownLayout[path] === text) continue;
+          shownLayout[path] = text;
+          update[path] = item;
+        }
+      }
+      return update;
+    }
+
+    // 마지막 갱신 이후 들어온 포인트만 추가 (maxWindow 밖의 앞부분은 extendTraces가 잘라냄)
+    function appendPoints(layout) {
+      const from = Math.max(series.rendered, series.windowStart);
+      const to = series.total;
+      if (from < to && plotSignals.length > 0) {
+        const update = { x: [], y: [] };
+        plotSignals.forEach(sig => {
+          update.x.push(sliceRing(series.time, from, to));
+          update.y.push(sliceRing(seriesValues(sig), from, to, scaleMap[sig] || 1));
+        });
+        Plotly.extendTraces("plot", update, plotSignals.map((_, i) => i), series.total - series.windowStart);
+      }
+      series.rendered = to;
+      // 바뀐 항목만 relayout (실시간 뷰에서는 보통 x축 범위만 - 도형/주석/y축은 바뀔 때만 다시 배치)
+      const update = changedLayout(layout);
+      if (Object.keys(update).length > 0) Plotly.relayout("plot", update);
+    }'''
+
+# 이벤트 구간 저장/그리기 (서버 span 메시지 또는 파일 재생 행의 event 값) - 대시보드 페이지용
+# 사용하는 쪽에서 activeEvents, updateEventTitle, eventColors, eventNames를 정의해야 함
+SPANS_JS = '''    // 이벤트 구간 - 서버의 span open/close 메시지(실시간/서버 재생) 또는 행의 event 값(브라우저 파일 재생)으로 생성
+    // 시작 시간 순으로 보관하고 구간끼리 겹치지 않으므로, 그릴 때는 화면에 보이는 구간만 뒤에서부터 확인
+    const eventSpans = [];   // {id, code, start, end(null: 진행 중), peaks}
+    const spanIndex = {};    // id → 구간
+    let rowEvent = "none";   // 행 기반 구간: 마지막 행의 event
+    let rowSpanId = 0;
+
+    function openSpan(span) {
+      if (spanIndex[span.id]) return;
+      const record = { id: span.id, code: span.code, start: span.start, end: null, peaks: null };
+      eventSpans.push(record);
+      spanIndex[span.id] = record;
+      activeEvents.add(span.code);
+      updateEventTitle();
+    }
+
+    function closeSpan(span) {
+      let record = spanIndex[span.id];
+      if (!record) {
+        // 접속 전에 시작된 구간 (조회 결과보다 메시지가 먼저 온 경우)
+        openSpan(span);
+        record = spanIndex[span.id];
+      }
+      record.end = span.end;
+      record.peaks = span.peaks || null;
+      activeEvents.delete(span.code);
+      updateEventTitle();
+    }
+
+    function resetSpans() {
+      eventSpans.length = 0;
+      Object.keys(spanIndex).forEach(id => delete spanIndex[id]);
+      activeEvents.clear();
+      rowEvent = "none";
+      updateEventTitle();
+    }
+
+    function applySpanMessage(message) {
+      if (message.action === "reset") resetSpans();
+      else if (message.action === "open") openSpan(message.span);
+      else if (message.action === "close") closeSpan(message.span);
+    }
+
+    // 접속 시 이전 구간 조회 (/events/spans) - 이미 받은 구간은 유지
+    function loadSpans() {
+      fetch("/events/spans?limit=200")
+        .then(response => response.json())
+        .then(result => {
+          result.spans.forEach(span => {
+            if (span.end === null) openSpan(span);
+            else closeSpan(span);
+          });
+          eventSpans.sort((a, b) => a.start - b.start);
+        })
+        .catch(error => console.error("이벤트 구간 조회 실패:", error));
+    }
+
+    // 브라우저 파일 재생 - 행의 event 값이 바뀔 때 구간을 닫고 엶 (서버 구간과 같은 규칙)
+    function trackRowEvent(data) {
+      const event = data.event || "none";
+      if (event === rowEvent) return;
+      if (rowEvent !== "none") {
+        closeSpan({ id: "row-" + rowSpanId, code: rowEvent.split("_")[0], end: data.Time });
+      }
+      rowEvent = event;
+      if (event !== "none") {
+        rowSpanId += 1;
+        openSpan({ id: "row-" + rowSpanId, code: event.split("_")[0], start: data.Time });
+      }
+    }
+
+    function spanPeaksText(span) {
+      if (!span.peaks) return "";
+      return Object.entries(span.peaks).map(([sig, value]) => `${sig} ${(+value).toFixed(1)}`).join(", ");
+    }
+
+    // [xMin, xMax]에 보이는 구간 → Plotly 도형/라벨 (진행 중인 구간은 currentTime까지)
+    function spanLayout(xMin, xMax, currentTime, visibleEvents) {
+      const spanShapes = [];
+      const spanAnnotations = [];
+      for (let i = eventSpans.length - 1; i >= 0; i--) {
+        const span = eventSpans[i];
+        const end = span.end === null ? currentTime : span.end;
+        if (end < xMin) break;
+        if (span.start > xMax || !visibleEvents.has(span.code)) continue;
+        spanShapes.push({
+          type: "rect",
+          xref: "x",
+          yref: "paper",
+          x0: span.start,
+          x1: end,
+          y0: 0,
+          y1: 1,
+          fillcolor: eventColors[span.code] || "gray",
+          opacity: span.end === null ? 0.15 : 0.2,
+          line: { width: 0 }
+        });
+        spanAnnotations.push({
+          x: span.start + 0.1,
+          y: 1,
+          xref: "x",
+          yref: "paper",
+          text: eventNames[span.code] || span.code,
+          hovertext: spanPeaksText(span) || undefined,
+          showarrow: false,
+          font: {
+            size: 14,
+            color: eventColors[span.code] || "black"
+          },
+          align: "left",
+          yanchor: "bottom"
+        });
+      }
+      return { shapes: spanShapes, annotations: spanAnnotations };
+    }'''
+
+def generate_dashboard_html(renderer=DASHBOARD_RENDERER):
     """config/signals.py의 VISUALIZATION_SIGNALS를 기반으로 대시보드 HTML을 자동 생성"""
     
     print("🔧 대시보드 HTML 자동 생성 중...")
     print(f"📊 config/signals.py에서 정의된 시각화 신호: {len(VISUALIZATION_SIGNALS)}개")
+    print(f"🖼️ 렌더러: {renderer} ({RENDERER_TRACE_TYPES[renderer]})")
     
     # VISUALIZATION_SIGNALS 사용
     signals = VISUALIZATION_SIGNALS
@@ -21,7 +353,7 @@ def generate_dashboard_html():
         print(f"   • {signal}{suffix} (색상: {color}, 스케일: {scale})")
     
     # HTML 템플릿 생성
-    html_content = generate_html_template(signals)
+    html_content = generate_html_template(signals, renderer)
     
     # 파일 저장
     output_path = "static/index.html"
@@ -33,8 +365,10 @@ def generate_dashboard_html():
     print(f"✅ 대시보드 HTML 생성 완료: {output_path}")
     print(f"📈 추가된 신호: {len(signals)}개")
 
-def generate_html_template(signals):
-    """HTML 템플릿 생성"""
+def generate_html_template(signals, renderer=DASHBOARD_RENDERER):
+    """HTML 템플릿 생성 (renderer: 'svg' 또는 'webgl')"""
+    
+    trace_type = RENDERER_TRACE_TYPES[renderer]
     
     # 신호 체크박스 HTML 생성
     signal_checkboxes = []
@@ -66,6 +400,7 @@ def generate_html_template(signals):
     signal_colors_js_str = ',\n'.join(signal_colors_js)
     scale_map_js_str = ',\n'.join(scale_map_js)
     scale_suffix_js_str = ',\n'.join(scale_suffix_js)
+    series_signals_js = json.dumps(list(signals))
     
     html_template = f'''<!DOCTYPE html>
 <html>
@@ -143,15 +478,16 @@ def generate_html_template(signals):
   <!-- ✅ 오른쪽 상단 버튼 -->
   <div class="top-right">
     <form id="upload-form" enctype="multipart/form-data" style="display:inline;">
-      <input type="file" name="file" accept=".csv" required>
+      <input type="file" name="file" accept=".csv,.txt,.cap" required>
       <button type="submit">📤 업로드</button>
+      <button type="button" onclick="startServerReplay()">📡 서버 재생</button>
     </form>
     <button onclick="toggleLogging(true)">🔴 로깅 시작</button>
     <button onclick="toggleLogging(false)">⏹️ 로깅 종료</button>
   </div>
 
   <!-- ✅ 신호 체크박스 -->
-  <div class="checkbox-group">
+  <div class="checkbox-group" id="signal-checkboxes">
     <strong>📈 Signals:</strong>
     {signal_checkboxes_html}
   </div>
@@ -187,6 +523,7 @@ def generate_html_template(signals):
     <button onclick="setPlaybackSpeed(2)" class="speed-btn" data-speed="2">2x</button>
     <button onclick="setPlaybackSpeed(5)" class="speed-btn" data-speed="5">5x</button>
     <button onclick="setPlaybackSpeed(10)" class="speed-btn" data-speed="10">10x</button>
+    <button onclick="setPlaybackSpeed(0)" class="speed-btn" data-speed="0">최대</button>
     <button onclick="togglePlayback()" id="play-pause-btn">⏸️ 일시정지</button>
   </div>
 
@@ -204,14 +541,11 @@ def generate_html_template(signals):
 
   <script>
     let socket = null;
-    const buffer = [];
     const maxWindow = 30;  // 30초 윈도우
     const maxPoints = 36000;
     const sampleInterval = 0.1;  // 0.1초 간격으로 업데이트
     let initialized = false;
-    const shapes = [];
-    const annotations = [];
-    const eventRanges = {{}};
+    let traceType = "{trace_type}";  // Plotly 트레이스 종류 (scatter: SVG, scattergl: WebGL)
     let activeEvents = new Set();
     let updateTimer = null;  // 업데이트 타이머
     let lastUpdateTime = 0;  // 마지막 업데이트 시간
@@ -226,6 +560,7 @@ def generate_html_template(signals):
     let fileData = [];  // 업로드된 파일 데이터
     let currentFileIndex = 0;  // 현재 재생 중인 데이터 인덱스
     let filePlaybackTimer = null;  // 파일 재생 타이머
+    let isServerReplay = false;  // 서버 측 재생 모드 (websocket으로 수신, 속도/일시정지는 서버에 요청)
 
     // WebSocket 연결 함수
     function connectWebSocket() {{
@@ -238,6 +573,8 @@ def generate_html_template(signals):
         socket.onopen = function(event) {{
             console.log("✅ WebSocket 연결됨");
             document.getElementById("status-indicator").style.color = "#2ca02c";
+            sendSubscription();
+            loadSpans();
         }};
         
         socket.onclose = function(event) {{
@@ -253,10 +590,33 @@ def generate_html_template(signals):
         
         socket.onmessage = function(event) {{
             const data = JSON.parse(event.data);
+            if (data.type === "config") {{
+              applySignalConfig(data);
+              return;
+            }}
+            if (data.type === "span") {{
+              if (!isFileMode) applySpanMessage(data);  // 브라우저 파일 재생 중에는 행 기반 구간 사용
+              return;
+            }}
+            if (data.type === "subscribed" || data.type === "error") {{
+              console.log(data.type === "error" ? "⚠️ " + data.message : "📡 구독 신호: " + (data.signals || ["전체"]).join(", "));
+              return;
+            }}
             processData(data);
         }};
     }}
 
+    // 구독 갱신 - 체크된 신호만 서버에서 받음 (새로 체크한 신호는 그 시점부터 그려짐)
+    function sendSubscription() {{
+      if (!socket || socket.readyState !== WebSocket.OPEN) return;
+      const signals = Array.from(document.querySelectorAll(".sig:checked")).map(cb => cb.value);
+      socket.send(JSON.stringify({{ type: "subscribe", signals: signals, spans: true }}));
+    }}
+
+    document.addEventListener("change", event => {{
+      if (event.target.classList && event.target.classList.contains("sig")) sendSubscription();
+    }});
+
     // 페이지 로드 시 WebSocket 연결
     connectWebSocket();
 
@@ -282,6 +642,11 @@ def generate_html_template(signals):
 {scale_suffix_js_str}
     }};
 
+    // 저장/표시할 신호 (스케일이 없는 신호는 1배) - 신호 설정이 바뀌면 applySignalConfig가 교체
+    let seriesSignals = {series_signals_js};
+
+{SPANS_JS}
+
     function updateEventTitle() {{
       const el = document.querySelector("#event-title h2");
       if (activeEvents.size === 0) {{
@@ -300,14 +665,14 @@ def generate_html_template(signals):
       const loggingTimeEl = document.getElementById("logging-time");
       const viewModeEl = document.getElementById("view-mode");
       
-      if (buffer.length > 0) {{
-        const latestTime = buffer[buffer.length - 1].Time;
+      if (series.total > 0) {{
+        const latestTime = series.latest.Time;
         currentTimeEl.textContent = `시간: ${{latestTime.toFixed(1)}}초`;
       }} else {{
         currentTimeEl.textContent = "시간: --";
       }}
       
-      dataPointsEl.textContent = `데이터 포인트: ${{buffer.length}}`;
+      dataPointsEl.textContent = `데이터 포인트: ${{seriesLength()}}`;
 
       // 로깅 시간 표시
       const startTime = localStorage.getItem("loggingStartTime");
@@ -325,66 +690,52 @@ def generate_html_template(signals):
         viewModeEl.textContent = "뷰: 실시간";
       }}
       
-      // 재생 속도 표시 (파일 모드일 때만)
-      if (isFileMode) {{
+      // 재생 속도 표시 (파일/서버 재생 모드일 때만)
+      if (isFileMode || isServerReplay) {{
         const speedEl = document.getElementById("update-interval");
-        speedEl.textContent = `재생: ${{playbackSpeed}}x`;
+        speedEl.textContent = playbackSpeed > 0 ? `재생: ${{playbackSpeed}}x` : "재생: 최대";
       }}
     }}
 
-    function updatePlot() {{
-      if (buffer.length === 0) return;
-
-      const visibleSigs = Array.from(document.querySelectorAll(".sig:checked")).map(cb => cb.value);
-      const visibleEvents = Array.from(document.querySelectorAll(".evt:checked")).map(cb => cb.value);
-      const currentTime = buffer[buffer.length - 1].Time;
+    // 신호 설정 적용 (서버가 config/signals.py를 다시 읽었을 때) - 기존 신호의 체크 상태는 유지
+    function applySignalConfig(config) {{
+      const group = document.getElementById("signal-checkboxes");
+      const known = new Set(Array.from(group.querySelectorAll(".sig")).map(cb => cb.value));
+      const checked = new Set(Array.from(group.querySelectorAll(".sig:checked")).map(cb => cb.value));
+      Object.assign(signalColors, config.colors);
+      Object.assign(scaleMap, config.scales);
+      Object.assign(scaleSuffix, config.suffixes);
+      seriesSignals = config.signals.slice();
+      if (config.renderer) traceType = config.renderer === "webgl" ? "scattergl" : "scatter";
 
-      const ongoingShapes = Object.entries(eventRanges).map(([code, range]) => {{
-        if (!visibleEvents.includes(code)) return null;
-        return {{
-          type: "rect",
-          xref: "x",
-          yref: "paper",
-          x0: range.start,
-          x1: currentTime,
-          y0: 0,
-          y1: 1,
-          fillcolor: eventColors[code] || "gray",
-          opacity: 0.15,
-          line: {{ width: 0 }}
-        }};
-      }}).filter(Boolean);
-
-      const filteredShapes = shapes.filter(s =>
-        visibleEvents.includes(Object.keys(eventColors).find(code => s.fillcolor === eventColors[code]))
-      );
+      group.querySelectorAll("label").forEach(label => label.remove());
+      config.signals.forEach(sig => {{
+        const label = document.createElement("label");
+        const isChecked = checked.has(sig) || !known.has(sig);
+        label.innerHTML = `<input type="checkbox" class="sig" value="${{sig}}"${{isChecked ? " checked" : ""}}> ${{sig}}${{scaleSuffix[sig] || ""}}`;
+        label.querySelector("input").addEventListener("change", updatePlot);
+        group.appendChild(label);
+      }});
+      console.log(`🔄 신호 설정 갱신 (v${{config.version}})`);
+      plotKey = null;  // 이름/색이 바뀌었을 수 있으므로 전체 다시 그림
+      sendSubscription();
+      updatePlot();
+    }}
 
-      const filteredAnnotations = annotations.filter(a =>
-        visibleEvents.includes(Object.keys(eventNames).find(code => a.text === eventNames[code]))
-      );
+{SERIES_JS}
+    function updatePlot() {{
+      if (series.total === 0) return;
 
-      let yMin = 0, yMax = 1;
-      const traces = visibleSigs.map(sig => {{
-        const scale = scaleMap[sig] || 1;
-        const y = buffer.map(p => (p[sig] ?? 0) * scale);
-        const minY = Math.min(...y);
-        const maxY = Math.max(...y);
-        if (minY < yMin) yMin = minY - 1;
-        if (maxY > yMax) yMax = maxY + 1;
-        return {{
-          x: buffer.map(p => p.Time),
-          y,
-          name: sig + (scaleSuffix[sig] || ""),
-          type: 'scatter',
-          mode: 'lines',
-          line: {{ color: signalColors[sig] || '#000000' }}
-        }};
-      }});
+      const visibleSigs = Array.from(document.querySelectorAll(".sig:checked")).map(cb => cb.value);
+      const visibleEvents = new Set(Array.from(document.querySelectorAll(".evt:checked")).map(cb => cb.value));
+      const currentTime = series.latest.Time;
+      const xRange = manualViewMode && manualViewRange ? manualViewRange : [currentTime - maxWindow, currentTime];
+      const spans = spanLayout(xRange[0], xRange[1], currentTime, visibleEvents);
 
       const layout = {{
-        yaxis: {{ range: [yMin, yMax] }},
-        shapes: filteredShapes.concat(ongoingShapes),
-        annotations: filteredAnnotations
+        yaxis: {{ range: yRange(visibleSigs) }},
+        shapes: spans.shapes,
+        annotations: spans.annotations
       }};
 
       // 수동 뷰 모드가 아닐 때만 x축 범위를 실시간으로 업데이트
@@ -394,11 +745,16 @@ def generate_html_template(signals):
         layout.xaxis = {{ range: manualViewRange }};
       }}
 
-      if (!initialized) {{
-        Plotly.newPlot("plot", traces, layout);
-        initialized = true;
+      // 신호 선택/신호 설정/뷰 범위가 바뀌었을 때만 전체 다시 그림, 나머지는 새 포인트만 추가
+      const view = manualViewMode && manualViewRange ? manualViewRange.join("~") : "live";
+      const key = view + "|" + visibleSigs.join(",");
+      if (!initialized || key !== plotKey) {{
+        redrawPlot(visibleSigs, layout);
+        plotKey = key;
+      }} else if (manualViewMode) {{
+        Plotly.relayout("plot", layout);
       }} else {{
-        Plotly.react("plot", traces, layout);
+        appendPoints(layout);
       }}
 
       // 상태 표시기 업데이트
@@ -440,7 +796,7 @@ def generate_html_template(signals):
 
     // 그래프 뷰 이동 함수
     function moveGraph(seconds) {{
-      if (buffer.length === 0) return;
+      if (series.total === 0) return;
       
       let newXRange;
       
@@ -450,7 +806,7 @@ def generate_html_template(signals):
         newXRange = [center - maxWindow/2, center + maxWindow/2];
       }} else {{
         // 실시간 모드일 때는 현재 시간을 기준으로 이동하되 30초 범위 유지
-        const currentTime = buffer[buffer.length - 1].Time;
+        const currentTime = series.latest.Time;
         const center = currentTime + seconds;
         newXRange = [center - maxWindow/2, center + maxWindow/2];
       }}
@@ -484,6 +840,11 @@ def generate_html_template(signals):
       // 선택된 버튼에 active 클래스 추가
       document.querySelector(`[data-speed="${{speed}}"]`).classList.add('active');
       
+      if (isServerReplay) {{
+        // 서버 재생 배속 변경 요청
+        fetch(`/replay/speed?speed=${{speed}}`, {{ method: 'POST' }});
+      }}
+      
       if (isFileMode) {{
         // 파일 재생 속도 업데이트
         updateFilePlayback();
@@ -492,11 +853,18 @@ def generate_html_template(signals):
 
     // 재생/일시정지 토글
     function togglePlayback() {{
-      if (!isFileMode) return;
+      if (!isFileMode && !isServerReplay) return;
       
       isPlaybackPaused = !isPlaybackPaused;
       const btn = document.getElementById('play-pause-btn');
       
+      if (isServerReplay) {{
+        fetch(isPlaybackPaused ? '/replay/pause' : '/replay/resume', {{ method: 'POST' }});
+        btn.textContent = isPlaybackPaused ? '▶️ 재생' : '⏸️ 일시정지';
+        btn.classList.toggle('paused', isPlaybackPaused);
+        return;
+      }}
+      
       if (isPlaybackPaused) {{
         btn.textContent = '▶️ 재생';
         btn.classList.add('paused');
@@ -521,7 +889,7 @@ def generate_html_template(signals):
       
       filePlaybackTimer = setTimeout(() => {{
         if (currentFileIndex < fileData.length) {{
-          processData(fileData[currentFileIndex]);
+          processData(fileData[currentFileIndex], true);
           currentFileIndex++;
           updateFilePlayback();
         }} else {{
@@ -531,11 +899,11 @@ def generate_html_template(signals):
           document.getElementById('status-indicator').style.color = '#2ca02c';
           connectWebSocket();  // WebSocket 재연결
         }}
-      }}, (sampleInterval * 1000) / playbackSpeed);
+      }}, playbackSpeed > 0 ? (sampleInterval * 1000) / playbackSpeed : 0);  // 최대: 대기 없음
     }}
 
     // 데이터 처리 함수
-    function processData(data) {{
+    function processData(data, rowEvents = false) {{
       if (!data || typeof data.Time === 'undefined') return;
       
       // SPEED 계산
@@ -548,51 +916,11 @@ def generate_html_template(signals):
         }}
       }}
       
-      buffer.push(data);
-      
-      // 최대 포인트 수 제한
-      if (buffer.length > maxPoints) {{
-        buffer.shift();
-      }}
+      pushPoint(data);
       
-      // 이벤트 처리
-      if (data.event && data.event !== 'none') {{
-        const [eventCode, eventState] = data.event.split('_');
-        
-        if (eventState === 'on') {{
-          activeEvents.add(eventCode);
-          eventRanges[eventCode] = {{ start: data.Time }};
-          
-          // 이벤트 시작 주석 추가
-          annotations.push({{
-            x: data.Time,
-            y: 1,
-            text: eventNames[eventCode] || eventCode,
-            showarrow: true,
-            arrowhead: 2,
-            arrowsize: 1,
-            arrowwidth: 2,
-            arrowcolor: eventColors[eventCode] || 'gray',
-            bgcolor: eventColors[eventCode] || 'gray',
-            bordercolor: 'white',
-            borderwidth: 1,
-            font: {{ color: 'white', size: 12 }}
-          }});
-        }} else if (eventState === 'off') {{
-          activeEvents.delete(eventCode);
-          if (eventRanges[eventCode]) {{
-            eventRanges[eventCode].end = data.Time;
-            delete eventRanges[eventCode];
-          }}
-        }}
-      }}
-      
-      updateEventTitle();
-      
-      // 실시간 모드일 때만 자동 업데이트
-      if (!manualViewMode) {{
-        updatePlot();
-      }}
+      // 브라우저 파일 재생은 서버 구간이 없으므로 행의 event 값으로 구간 생성
+      if (rowEvents) trackRowEvent(data);
+      // 그래프는 scheduleUpdate 주기(sampleInterval)마다 그 사이 들어온 포인트를 한꺼번에 추가
     }}
 
     // 로깅 토글 함수
@@ -616,6 +944,54 @@ def generate_html_template(signals):
       }}
     }}
 
+    // 서버 측 재생 - 선택한 파일(원본 캡처 .txt/.cap 또는 CSV)을 서버가 실시간 경로로 재생, 결과는 websocket으로 수신
+    async function startServerReplay() {{
+      const input = document.querySelector('#upload-form input[name="file"]');
+      if (!input.files.length) {{
+        alert('파일을 선택해주세요.');
+        return;
+      }}
+      const formData = new FormData();
+      formData.append('file', input.files[0]);
+      
+      try {{
+        const response = await fetch(`/replay/start?speed=${{playbackSpeed}}`, {{
+          method: 'POST',
+          body: formData
+        }});
+        const result = await response.json();
+        
+        if (result.success) {{
+          // 클라이언트 측 파일 재생 중지, websocket 수신으로 전환
+          isFileMode = false;
+          if (filePlaybackTimer) {{
+            clearTimeout(filePlaybackTimer);
+            filePlaybackTimer = null;
+          }}
+          isServerReplay = true;
+          if (!socket || socket.readyState !== WebSocket.OPEN) {{
+            connectWebSocket();
+          }}
+          
+          // 버퍼 초기화
+          resetSeries();
+          resetSpans();
+          initialized = false;
+          
+          isPlaybackPaused = false;
+          document.getElementById('play-pause-btn').textContent = '⏸️ 일시정지';
+          document.getElementById('play-pause-btn').classList.remove('paused');
+          document.getElementById('playback-controls').style.display = 'block';
+          updateStatusIndicator();
+        }} else {{
+          alert('서버 재생 실패: ' + result.message);
+        }}
+      }} catch (error) {{
+        console.error('서버 재생 오류:', error);
+        alert('서버 재생 중 오류가 발생했습니다.');
+      }}
+    }}
+
     // 파일 업로드 처리
     document.getElementById('upload-form').addEventListener('submit', async function(e) {{
       e.preventDefault();
@@ -639,7 +1015,11 @@ def generate_html_template(signals):
         if (result.success) {{
           console.log('업로드 성공:', result.message);
           
-          // 파일 모드로 전환
+          // 파일 모드로 전환 (서버 재생 중이면 중지)
+          if (isServerReplay) {{
+            fetch('/replay/stop', {{ method: 'POST' }});
+            isServerReplay = false;
+          }}
           isFileMode = true;
           fileData = result.data;
           currentFileIndex = 0;
@@ -654,11 +1034,8 @@ def generate_html_template(signals):
           document.getElementById('status-indicator').style.color = '#ff7f0e';
           
           // 버퍼 초기화
-          buffer.length = 0;
-          shapes.length = 0;
-          annotations.length = 0;
-          activeEvents.clear();
-          Object.keys(eventRanges).forEach(key => delete eventRanges[key]);
+          resetSeries();
+          resetSpans();
           
           // 그래프 초기화
           initialized = false;
@@ -687,15 +1064,335 @@ def generate_html_template(signals):
     
     return html_template
 
+# 렌더링 벤치마크 조합 (수신 주기 Hz × 표시 신호 수)
+BENCHMARK_RATES = [10, 50, 100]
+BENCHMARK_SIGNAL_COUNTS = [7, 30]
+BENCHMARK_OUTPUT = "static/benchmark.html"
+
+def generate_benchmark_html(duration=10):
+    """렌더링 벤치마크 페이지 생성 (대시보드 실행 중 /static/benchmark.html 에서 열기)"""
+    html_content = generate_benchmark_template(duration)
+    os.makedirs(os.path.dirname(BENCHMARK_OUTPUT), exist_ok=True)
+    with open(BENCHMARK_OUTPUT, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    print(f"✅ 렌더링 벤치마크 페이지 생성 완료: {BENCHMARK_OUTPUT}")
+
+def generate_benchmark_template(duration=10):
+    """렌더러(svg/webgl) × 수신 주기 × 신호 수 조합별로 초당 렌더링 프레임 수를 측정하는 페이지
+    대시보드와 같은 SERIES_JS(링 버퍼 + extendTraces)로 합성 신호를 그림"""
+    
+    renderer_options = ''.join(f'<option value="{name}">{name}</option>' for name in RENDERER_TRACE_TYPES)
+    
+    return f'''<!DOCTYPE html>
+<html>
+<head>
+  <title>대시보드 렌더링 벤치마크</title>
+  <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+  <style>
+    body {{ font-family: sans-serif; margin: 20px; }}
+    table {{ border-collapse: collapse; margin: 10px 0; }}
+    th, td {{ border: 1px solid #ccc; padding: 4px 10px; text-align: right; }}
+    .slow {{ color: #d62728; font-weight: bold; }}
+  </style>
+</head>
+<body>
+  <h1>📊 대시보드 렌더링 벤치마크</h1>
+  <p>합성 신호를 수신 주기마다 추가하면서 대시보드와 같은 방식(링 버퍼 + extendTraces)으로 그릴 때의 초당 렌더링 프레임 수를 측정합니다.<br>
+  조합마다 30초 창(maxWindow)을 미리 채운 뒤 측정하며, {MIN_SMOOTH_FPS} FPS 미만은 빨간색으로 표시합니다.</p>
+  <div>
+    <label>렌더러: <select id="renderer"><option value="all">전체</option>{renderer_options}</select></label>
+    <label>조합별 측정 시간(초): <input id="duration" type="number" value="{duration}" min="1" style="width:4em"></label>
+    <button id="run-btn" onclick="runAll()">▶️ 측정 시작</button>
+    <span id="progress"></span>
+  </div>
+  <table id="results">
+    <thead><tr><th>렌더러</th><th>수신 주기(Hz)</th><th>신호 수</th><th>FPS</th><th>렌더 평균(ms)</th><th>렌더 p95(ms)</th><th>창 포인트</th></tr></thead>
+    <tbody></tbody>
+  </table>
+  <div id="plot" style="width:100%; height:500px;"></div>
+
+  <script>
+    const maxWindow = 30;
+    const maxPoints = 36000;
+    const rendererTraceTypes = {json.dumps(RENDERER_TRACE_TYPES)};
+    const rates = {json.dumps(BENCHMARK_RATES)};
+    const signalCounts = {json.dumps(BENCHMARK_SIGNAL_COUNTS)};
+    let initialized = false;
+    let traceType = "scatter";
+    let manualViewMode = false;
+    let manualViewRange = null;
+    const scaleMap = {{}};
+    const signalColors = {{}};
+    const scaleSuffix = {{}};
+    let seriesSignals = [];
+    const benchmarkResults = [];  // 콘솔에서 확인용 (console.table(benchmarkResults))
+
+{SERIES_JS}
+
+    // 합성 신호 count개 (SIG_01 ...) - 신호마다 주파수가 다른 사인파
+    function setupSignals(count) {{
+      Object.keys(scaleMap).forEach(sig => {{
+        delete scaleMap[sig];
+        delete signalColors[sig];
+      }});
+      const names = [];
+      for (let i = 0; i < count; i++) {{
+        const sig = "SIG_" + String(i + 1).padStart(2, "0");
+        scaleMap[sig] = 1;
+        signalColors[sig] = `hsl(${{Math.round(i * 360 / count)}}, 70%, 45%)`;
+        names.push(sig);
+      }}
+      seriesSignals = names;
+      return names;
+    }}
+
+    function makePoint(names, t) {{
+      const point = {{ Time: t }};
+      names.forEach((sig, i) => {{
+        point[sig] = 50 + 40 * Math.sin(t * (0.5 + i * 0.1) + i);
+      }});
+      return point;
+    }}
+
+    function nextFrame() {{
+      return new Promise(resolve => requestAnimationFrame(resolve));
+    }}
+
+    function liveLayout(names) {{
+      const currentTime = series.latest.Time;
+      return {{
+        xaxis: {{ range: [currentTime - maxWindow, currentTime] }},
+        yaxis: {{ range: yRange(names) }},
+        showlegend: names.length <= 10
+      }};
+    }}
+
+    // 조합 1개 측정: 애니메이션 프레임마다 그 사이 도착했어야 할 포인트를 추가하고 appendPoints로 그림
+    async function runCase(renderer, rate, count, duration) {{
+      traceType = rendererTraceTypes[renderer];
+      const names = setupSignals(count);
+      Plotly.purge("plot");
+      initialized = false;
+      resetSeries();
+
+      const prefill = maxWindow * rate;
+      for (let i = 0; i < prefill; i++) pushPoint(makePoint(names, i / rate));
+      redrawPlot(names, liveLayout(names));
+      await nextFrame();
+
+      const renderTimes = [];
+      let generated = prefill;
+      const started = performance.now();
+      while (performance.now() - started < duration * 1000) {{
+        await nextFrame();
+        const due = prefill + Math.floor((performance.now() - started) / 1000 * rate);
+        for (; generated < due; generated++) pushPoint(makePoint(names, generated / rate));
+        const renderStarted = performance.now();
+        appendPoints(liveLayout(names));
+        renderTimes.push(performance.now() - renderStarted);
+      }}
+      const elapsed = (performance.now() - started) / 1000;
+
+      renderTimes.sort((a, b) => a - b);
+      const mean = renderTimes.reduce((sum, t) => sum + t, 0) / renderTimes.length;
+      return {{
+        renderer: renderer,
+        rate: rate,
+        signals: count,
+        fps: +(renderTimes.length / elapsed).toFixed(1),
+        render_mean_ms: +mean.toFixed(2),
+        render_p95_ms: +renderTimes[Math.min(renderTimes.length - 1, Math.floor(renderTimes.length * 0.95))].toFixed(2),
+        window_points: series.total - series.windowStart
+      }};
+    }}
+
+    function addResultRow(result) {{
+      const row = document.createElement("tr");
+      const slow = result.fps < {MIN_SMOOTH_FPS} ? ' class="slow"' : "";
+      row.innerHTML = `<td>${{result.renderer}}</td><td>${{result.rate}}</td><td>${{result.signals}}</td>` +
+        `<td${{slow}}>${{result.fps}}</td><td>${{result.render_mean_ms}}</td><td>${{result.render_p95_ms}}</td>` +
+        `<td>${{result.window_points}}</td>`;
+      document.querySelector("#results tbody").appendChild(row);
+    }}
+
+    async function runAll() {{
+      const selected = document.getElementById("renderer").value;
+      const renderers = selected === "all" ? Object.keys(rendererTraceTypes) : [selected];
+      const duration = parseFloat(document.getElementById("duration").value) || {duration};
+      const progress = document.getElementById("progress");
+      const button = document.getElementById("run-btn");
+      button.disabled = true;
+      document.querySelector("#results tbody").innerHTML = "";
+      benchmarkResults.length = 0;
+
+      const total = renderers.length * rates.length * signalCounts.length;
+      for (const renderer of renderers) {{
+        for (const rate of rates) {{
+          for (const count of signalCounts) {{
+            progress.textContent = `⏳ ${{benchmarkResults.length + 1}}/${{total}}: ${{renderer}}, ${{rate}}Hz, 신호 ${{count}}개`;
+            const result = await runCase(renderer, rate, count, duration);
+            benchmarkResults.push(result);
+            addResultRow(result);
+          }}
+        }}
+      }}
+      progress.textContent = "✅ 측정 완료";
+      button.disabled = false;
+      console.table(benchmarkResults);
+    }}
+  </script>
+</body>
+</html>'''
+
+# 오프라인 번들 (--bundle) - static/index.html을 축소하고 Plotly를 로컬 파일로 바꿔 static/dist/에 저장
+PLOTLY_CDN_TAG = '<script src="https://cdn.plot.ly/plotly-latest.min.js"></script>'
+PLOTLY_VERSION = "1.58.5"  # plotly-latest.min.js가 가리키는 버전 (v1 마지막)
+PLOTLY_DOWNLOAD_URL = f"https://cdn.plot.ly/plotly-{PLOTLY_VERSION}.min.js"
+VENDOR_PLOTLY = "static/vendor/plotly.min.js"
+
+def find_plotly(path=None):
+    """로컬 Plotly 찾기: 지정 경로 → static/vendor/ → plotly 파이썬 패키지 → 인터넷이 되면 받아서 static/vendor/에 저장
+    (출처, 내용) 반환, 찾지 못하면 (None, None)"""
+    if path and not os.path.exists(path):
+        raise FileNotFoundError(path)
+    candidates = [path, VENDOR_PLOTLY]
+    try:
+        import plotly
+        candidates.append(os.path.join(os.path.dirname(plotly.__file__), 'package_data', 'plotly.min.js'))
+    except ImportError:
+        pass
+    for candidate in candidates:
+        if candidate and os.path.exists(candidate):
+            with open(candidate, 'rb') as f:
+                return candidate, f.read()
+
+    try:
+        with urllib.request.urlopen(PLOTLY_DOWNLOAD_URL, timeout=15) as response:
+            data = response.read()
+    except OSError as e:
+        print(f"⚠️ 로컬 Plotly 없음, 다운로드 실패 ({e}) - CDN 참조를 유지합니다")
+        print(f"   {PLOTLY_DOWNLOAD_URL} 을 {VENDOR_PLOTLY} 로 복사한 뒤 다시 실행하세요.")
+        return None, None
+    os.makedirs(os.path.dirname(VENDOR_PLOTLY), exist_ok=True)
+    with open(VENDOR_PLOTLY, 'wb') as f:
+        f.write(data)
+    return PLOTLY_DOWNLOAD_URL, data
+
+def plotly_version(data):
+    """plotly.min.js 머리 주석의 버전 (예: 'plotly.js v1.58.5')"""
+    match = re.search(rb"plotly\.js v(\d+\.\d+\.\d+)", data[:500])
+    return match.group(1).decode() if match else "unknown"
+
+def minify_html(html):
+    """줄 단위 축소 - 줄 앞뒤 공백, 빈 줄, 한 줄짜리 주석(<!-- -->, //, /* */)만 제거
+    (줄바꿈은 유지하므로 세미콜론 생략/문자열 안의 // 에 영향 없음)"""
+    lines = []
+    for line in html.splitlines():
+        line = line.strip()
+        if (not line or line.startswith('//') or (line.startswith('<!--') and line.endswith('-->'))
+                or (line.startswith('/*') and line.endswith('*/'))):
+            continue
+        lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+def compress_variants(data):
+    """압축 방식 → 압축 본문 (brotli 모듈이 있을 때만 br)"""
+    variants = {'gzip': gzip.compress(data, 9, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(data, quality=11)
+    return variants
+
+def build_bundle(source=SOURCE_INDEX, plotly_path=None, dist_dir=DIST_DIR):
+    """static/index.html → static/dist/ (축소 HTML, 해시가 붙은 로컬 Plotly, .gz/.br, manifest.json)
+    대시보드는 manifest.json이 바뀌면 다음 요청 때 새 번들을 메모리에 올림"""
+    with open(source, 'rb') as f:
+        source_data = f.read()
+    html = source_data.decode('utf-8')
+
+    files = {}
+    plotly_source, plotly_js = find_plotly(plotly_path)
+    version = None
+    if plotly_js:
+        version = plotly_version(plotly_js)
+        name = f"plotly-{version}.{content_hash(plotly_js)[:8]}.min.js"
+        files[name] = plotly_js
+        if PLOTLY_CDN_TAG in html:
+            html = html.replace(PLOTLY_CDN_TAG, f'<script src="/assets/{name}"></script>')
+        else:
+            print(f"⚠️ {source}에서 Plotly CDN 태그를 찾지 못함 - 페이지의 Plotly 참조를 확인하세요")
+    files[INDEX_NAME] = minify_html(html).encode('utf-8')
+
+    # 이전 번들 파일 정리 (manifest.json은 마지막에 교체 - 실행 중인 대시보드는 이미 메모리에 올린 자산 사용)
+    os.makedirs(dist_dir, exist_ok=True)
+    for old in os.listdir(dist_dir):
+        if old != MANIFEST_NAME:
+            os.remove(os.path.join(dist_dir, old))
+
+    manifest_files = {}
+    for name, data in files.items():
+        variants = compress_variants(data)
+        with open(os.path.join(dist_dir, name), 'wb') as f:
+            f.write(data)
+        for encoding, compressed in variants.items():
+            with open(os.path.join(dist_dir, name + ENCODINGS[encoding]), 'wb') as f:
+                f.write(compressed)
+        manifest_files[name] = {
+            'sha': content_hash(data),
+            'size': len(data),
+            'encodings': [encoding for encoding in ENCODINGS if encoding in variants],
+            'compressed': {encoding: len(compressed) for encoding, compressed in variants.items()},
+        }
+
+    manifest = {
+        'version': content_hash(''.join(info['sha'] for _, info in sorted(manifest_files.items())).encode()),
+        'built': datetime.datetime.now().isoformat(timespec='seconds'),
+        'source': source,
+        'source_sha': content_hash(source_data),  # 대시보드는 원본이 이 해시와 다르면 번들 대신 원본 제공
+        'plotly': {'version': version, 'source': plotly_source} if plotly_js else None,
+        'files': manifest_files,
+    }
+    temp_path = os.path.join(dist_dir, MANIFEST_NAME + ".tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, os.path.join(dist_dir, MANIFEST_NAME))
+
+    print(f"📦 대시보드 번들 생성 완료: {dist_dir} (v{manifest['version']})")
+    for name, info in manifest_files.items():
+        compressed = ", ".join(f"{encoding} {size / 1024:.1f}KB" for encoding, size in info['compressed'].items())
+        print(f"   • {name}: {info['size'] / 1024:.1f}KB → {compressed}")
+    if brotli is None:
+        print("💡 brotli 모듈이 없어 gzip만 생성했습니다 (pip install brotli)")
+    return manifest
+
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="대시보드 HTML 자동 생성기")
+    parser.add_argument('--renderer', choices=list(RENDERER_TRACE_TYPES), default=DASHBOARD_RENDERER,
+                        help="그래프 렌더러 (기본: config/signals.py의 DASHBOARD_RENDERER)")
+    parser.add_argument('--benchmark', action='store_true',
+                        help=f"대시보드 대신 렌더링 벤치마크 페이지({BENCHMARK_OUTPUT})만 생성")
+    parser.add_argument('--duration', type=float, default=10, help="벤치마크 조합별 기본 측정 시간 (초)")
+    parser.add_argument('--bundle', action='store_true',
+                        help=f"static/index.html로 오프라인 번들({DIST_DIR}) 생성 (Plotly 로컬 포함, gzip/br)")
+    parser.add_argument('--plotly', help=f"번들에 넣을 plotly.min.js 경로 (기본: {VENDOR_PLOTLY})")
+    args = parser.parse_args()
+
+    if args.bundle:
+        build_bundle(plotly_path=args.plotly)
+        return
+
+    if args.benchmark:
+        generate_benchmark_html(args.duration)
+        print("💡 대시보드 실행 후 브라우저에서 /static/benchmark.html 을 열어 측정하세요.")
+        return
+
     print("🚀 대시보드 HTML 자동 생성기")
     print("=" * 50)
     print("📋 config/signals.py의 VISUALIZATION_SIGNALS를 기반으로 대시보드를 생성합니다.")
     print()
     
     try:
-        generate_dashboard_html()
+        generate_dashboard_html(args.renderer)
         print("\n✅ 대시보드 HTML 생성이 완료되었습니다!")
         print("💡 이제 dashboard_mode.py를 실행하여 대시보드를 확인하세요.")
         print("💡 새로운 신호를 추가하려면 config/signals.py의 VISUALIZATION_SIGNALS를 수정하고")
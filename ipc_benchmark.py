@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+IPC 발행 벤치마크 - IpcPublisher가 최대 속도로 발행할 때의 처리량과 발행 호출 지연,
+구독자별 수신/누락 수 측정 (느린 구독자가 있어도 발행 쪽이 멈추지 않는지 확인)
+
+사용 예:
+  python ipc_benchmark.py                                  # 행 토픽, 빠른 구독자 2 + 느린 구독자 1
+  python ipc_benchmark.py --topic frame --duration 10
+  python ipc_benchmark.py --slow 0 --subscribers 4
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+from config import signals as signal_config
+from parser.ipc_bus import IpcPublisher, IpcSubscriber, MAX_BUFFER
+
+BATCH = 100  # 이 수만큼 발행할 때마다 이벤트 루프에 양보 (소켓 송신 기회)
+
+
+def subscribe(path, topic, delay, limit, results, name):
+    """구독자 프로세스 - 발행 쪽이 소켓을 닫을 때까지 (limit초가 있으면 그때까지만) 수신"""
+    subscriber = IpcSubscriber(path, [topic])
+    received = 0
+    started = time.perf_counter()
+    for _ in subscriber:
+        received += 1
+        if delay:
+            time.sleep(delay)
+            if limit and time.perf_counter() - started > limit:
+                break  # 느린 구독자는 송신 버퍼에 남은 메시지를 다 읽지 않고 끝냄
+    elapsed = time.perf_counter() - started
+    subscriber.close()
+    results.put({'name': name, 'received': received, 'dropped': subscriber.dropped,
+                 'rate': round(received / elapsed, 1) if elapsed else 0})
+
+
+def sample_row(index):
+    row = {name: float(index % 100) for name in signal_config.STANDARD_COLUMNS}
+    row.update({'Time': round(index * 0.1, 3), 'event': 'none', 'trigger': 'none'})
+    return row
+
+
+async def publish(publisher, topic, duration):
+    """duration초 동안 최대 속도로 발행 → 발행 호출 시간(초) 목록"""
+    samples = []
+    data = bytes(range(64))
+    index = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        for _ in range(BATCH):
+            started = time.perf_counter()
+            if topic == 'frame':
+                publisher.write_frame(0xEA, data, index * 0.001)
+            else:
+                publisher.write(sample_row(index))
+            samples.append(time.perf_counter() - started)
+            index += 1
+        await asyncio.sleep(0)
+    return samples
+
+
+async def run(args):
+    path = os.path.join(tempfile.mkdtemp(), "ipc_benchmark.sock")
+    publisher = IpcPublisher(path, max_buffer=args.max_buffer)
+    await publisher.start()
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    workers = [context.Process(target=subscribe, args=(path, args.topic, 0, None, results, f"빠른 구독자 {i + 1}"))
+               for i in range(args.subscribers)]
+    workers += [context.Process(target=subscribe, args=(path, args.topic, args.slow_delay, args.duration + 2,
+                                                        results, f"느린 구독자 {i + 1}"))
+                for i in range(args.slow)]
+    for worker in workers:
+        worker.start()
+    # 모든 구독자가 연결해 구독할 때까지 대기
+    while sum(publisher.subscribed.values()) < len(workers):
+        await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    samples = await publish(publisher, args.topic, args.duration)
+    elapsed = time.perf_counter() - started
+    dropped = sum(connection.dropped for connection in publisher.connections)
+    # 닫아도 송신 버퍼에 남은 메시지(구독자별 한도 이내)는 보낸 뒤 연결 종료 → 구독자가 결과 보고
+    publisher.close()
+    loop = asyncio.get_running_loop()
+    reports = [await loop.run_in_executor(None, results.get, True, 60) for _ in workers]
+    for worker in workers:
+        worker.join()
+    os.rmdir(os.path.dirname(path))
+
+    samples.sort()
+    print(f"📡 토픽 {args.topic}: {len(samples)}개 발행, {len(samples) / elapsed:,.0f}개/초 "
+          f"(구독자 {len(workers)}명, 송신 버퍼 한도 {args.max_buffer // 1024}KB)")
+    print(f"   발행 호출: 평균 {statistics.mean(samples) * 1e6:.1f}us, "
+          f"p99 {samples[int(len(samples) * 0.99)] * 1e6:.1f}us, 최대 {samples[-1] * 1e6:.1f}us, "
+          f"버린 메시지 {dropped}개")
+    for report in sorted(reports, key=lambda report: report['name']):
+        print(f"   {report['name']}: 수신 {report['received']}개 ({report['rate']:,.0f}개/초), "
+              f"누락 알림 {report['dropped']}개")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IPC 발행 벤치마크")
+    parser.add_argument('--topic', choices=['row', 'frame'], default='row', help="발행할 토픽")
+    parser.add_argument('--duration', type=float, default=5, help="발행 시간 (초)")
+    parser.add_argument('--subscribers', type=int, default=2, help="빠른 구독자 수")
+    parser.add_argument('--slow', type=int, default=1, help="느린 구독자 수")
+    parser.add_argument('--slow-delay', type=float, default=0.005, help="느린 구독자의 메시지당 처리 시간 (초)")
+    parser.add_argument('--max-buffer', type=int, default=MAX_BUFFER, help="구독자별 송신 버퍼 한도 (바이트)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+IPC 구독 클라이언트 - 모니터(IPC_SOCKET=<경로>)가 Unix 소켓으로 발행하는 스트림 출력 (parser/ipc_bus.py)
+
+사용 예:
+  IPC_SOCKET=/tmp/can_monitor.sock python entry.py 0      # 모니터 (발행)
+  python ipc_subscriber.py                                 # 행 + 이벤트 구간
+  python ipc_subscriber.py --topics event                  # 이벤트 구간 open/close만
+  python ipc_subscriber.py --topics frame --count 100      # 원본 프레임 100개
+"""
+
+import argparse
+import os
+
+from parser.ipc_bus import DEFAULT_PATH, IpcSubscriber
+
+
+def describe(topic, message, signals):
+    if topic == 'frame':
+        timestamp, can_id, data = message
+        stamp = "-" if timestamp is None else f"{timestamp:.6f}"
+        return f"📦 {stamp} 0x{can_id:X} [{len(data)}] {data.hex(' ')}"
+    if topic == 'event':
+        span = message.get('span')
+        if span is None:
+            return f"🚨 {message['action']}"
+        end = "진행 중" if span['end'] is None else f"{span['end']}s"
+        return f"🚨 {message['action']} {span['code']} #{span['id']}: {span['start']}s ~ {end} {span['peaks']}"
+    values = ", ".join(f"{name}={message[name]}" for name in signals if name in message)
+    return f"📈 {message.get('Time')}s {message.get('event')} {values}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IPC 구독 클라이언트")
+    parser.add_argument('--path', default=os.environ.get("IPC_SOCKET", DEFAULT_PATH), help="발행 소켓 경로")
+    parser.add_argument('--topics', default='row,event', help="구독할 토픽 (frame,row,event 중 쉼표 구분)")
+    parser.add_argument('--signals', default='SPEED,BRAKE_PRESSURE,STEERING_RATE', help="행에서 출력할 신호")
+    parser.add_argument('--count', type=int, default=0, help="이 수만큼 받고 종료 (0이면 계속)")
+    args = parser.parse_args()
+
+    subscriber = IpcSubscriber(args.path, [topic for topic in args.topics.split(',') if topic])
+    signals = [name for name in args.signals.split(',') if name]
+    received = 0
+    try:
+        for topic, message in subscriber:
+            print(describe(topic, message, signals))
+            received += 1
+            if args.count and received >= args.count:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        subscriber.close()
+    print(f"🛑 {received}개 수신" + (f", 놓친 메시지 {subscriber.dropped}개" if subscriber.dropped else ""))
+
+
+if __name__ == "__main__":
+    main()
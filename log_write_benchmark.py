@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+로그 기록 경로 벤치마크 - CsvLogSink.write(저널 추가 기록)의 행당 지연과 처리량을
+fsync 주기(LOG_FSYNC_INTERVAL)별로 측정 (내구성 설정이 기록 경로를 얼마나 늦추는지 확인)
+
+사용 예:
+  python log_write_benchmark.py                               # fsync 주기 0(행마다), 0.1, 1초, 없음
+  python log_write_benchmark.py --rows 50000 --intervals 1,none
+  python log_write_benchmark.py --directory /mnt/sdcard/bench  # 실제 로그 디스크에서 측정 (/tmp는 tmpfs일 수 있음)
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from config import signals as signal_config
+from parser.pipeline import CsvLogSink
+
+
+def sample_row(index):
+    row = {'Time': round(index * 0.1, 3)}
+    row.update({name: float(index % 100) + 0.25 for name in signal_config.STANDARD_COLUMNS})
+    row.update({name: 0.5 for name in signal_config.DERIVED_SIGNALS})
+    row['event'] = 'SB_on' if index % 50 == 0 else 'none'
+    row['trigger'] = 'SB_on, PM_off' if index % 50 == 0 else 'none'
+    return row
+
+
+def measure(interval, rows, directory, segment_bytes):
+    """fsync 주기 1개 → 행당 write() 시간 목록, 걸린 시간, fsync 횟수"""
+    sink = CsvLogSink(directory=directory, max_bytes=segment_bytes, max_seconds=0, compression='')
+    sink.fsync_interval = interval  # None이면 세그먼트를 닫을 때만 fsync
+    samples = []
+    sink.open()
+    started = time.perf_counter()
+    for index in range(rows):
+        row = sample_row(index)
+        before = time.perf_counter()
+        sink.write(row)
+        samples.append(time.perf_counter() - before)
+    elapsed = time.perf_counter() - started
+    syncs = sink.journal.syncs
+    sink.close()
+    return samples, elapsed, syncs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로그 기록 경로 벤치마크")
+    parser.add_argument('--rows', type=int, default=20000, help="fsync 주기별 기록할 행 수")
+    parser.add_argument('--intervals', default='0,0.1,1,none', help="fsync 주기 목록 (초, none은 세그먼트 닫을 때만)")
+    parser.add_argument('--directory', help="로그 디렉터리 (기본: 임시 디렉터리, 측정 후 삭제)")
+    parser.add_argument('--segment-bytes', type=int, default=64 * 1024 * 1024, help="세그먼트 크기 한도")
+    args = parser.parse_args()
+
+    root = args.directory or tempfile.mkdtemp(prefix="log_write_benchmark_")
+    for text in args.intervals.split(','):
+        interval = None if text == 'none' else float(text)
+        label = "닫을 때만" if interval is None else ("행마다" if interval == 0 else f"{interval}초마다")
+        directory = os.path.join(root, f"interval_{text}")
+        samples, elapsed, syncs = measure(interval, args.rows, directory, args.segment_bytes)
+        samples.sort()
+        print(f"💾 fsync {label}: {len(samples) / elapsed:,.0f}행/초, fsync {syncs}회")
+        print(f"   write(): 평균 {statistics.mean(samples) * 1e6:.1f}us, p50 {samples[len(samples) // 2] * 1e6:.1f}us, "
+              f"p99 {samples[int(len(samples) * 0.99)] * 1e6:.1f}us, 최대 {samples[-1] * 1e6:.1f}us")
+    if not args.directory:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,200 @@
 # parser/can_decoder.py
-import cantools
+# DBC는 처음 디코딩/인코딩할 때 로드 (import만으로는 cantools도 불러오지 않음)
+# 파싱 결과는 DBC 파일 해시별 pickle로 캐시 → 이후 프로세스/워커는 파싱 없이 로드
+# 여러 버스(config/buses.py): 프레임 키 = (채널 << 29) | CAN ID → 모든 버스의 메시지를 dict 하나로 조회
+import hashlib
 import os
+import pickle
 
-dbc_path = "dbc/openDBC_현대기아.dbc"
-dbc = cantools.database.load_file(dbc_path)
+from config.buses import BUSES
 
-def decode_line(line):
+BUS_SHIFT = 29  # CAN ID(최대 29비트) 위에 채널 번호
+MAX_BUS = 7
+CAN_ID_MASK = (1 << BUS_SHIFT) - 1
+dbc_path = BUSES[0]['dbc']  # 채널 0 (태그 없는 라인)의 DBC
+DBC_CACHE_DIR = os.path.join("dbc", ".cache")
+_databases = {}  # 채널 → cantools Database
+_frames = {}  # 프레임 키 → (메시지, 신호명 prefix) - 모든 버스 통합 조회 테이블
+_bus_by_name = {str(bus): bus for bus in BUSES}
+_bus_by_name.update({spec['name']: bus for bus, spec in BUSES.items() if spec.get('name')})
+# 메시지별 기본 신호값 (raw 0에 해당하는 물리값) - encode_line용 캐시
+_encode_defaults = {}
+
+def frame_key(bus, can_id):
+    """(채널, CAN ID) → 프레임 키 (채널 0이면 CAN ID 그대로)"""
+    return (bus << BUS_SHIFT) | can_id
+
+def split_key(key):
+    """프레임 키 → (채널, CAN ID)"""
+    return key >> BUS_SHIFT, key & CAN_ID_MASK
+
+def bus_channel(tag):
+    """BUS= 태그(채널 번호 또는 이름) → 채널 번호, 알 수 없으면 None"""
+    return _bus_by_name.get(tag.strip())
+
+def _cache_path(path):
+    import cantools
+
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(path))[0]
+    # cantools 버전이 바뀌면 객체 구조가 달라질 수 있으므로 버전도 키에 포함
+    return os.path.join(DBC_CACHE_DIR, f"{name}.{digest}.cantools-{cantools.__version__}.pickle")
+
+def load_dbc(path=dbc_path):
+    """DBC 로드 - 같은 내용의 캐시가 있으면 pickle에서, 없으면 파싱 후 캐시 저장"""
+    import cantools
+
+    cache = _cache_path(path)
+    try:
+        with open(cache, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"⚠️ DBC 캐시를 읽지 못해 다시 파싱합니다: {e}")
+
+    db = cantools.database.load_file(path)
+    try:
+        os.makedirs(DBC_CACHE_DIR, exist_ok=True)
+        temp = f"{cache}.{os.getpid()}.tmp"
+        with open(temp, 'wb') as f:
+            pickle.dump(db, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, cache)  # 여러 프로세스가 동시에 만들어도 완성된 파일만 보이도록
+    except OSError as e:
+        print(f"⚠️ DBC 캐시 저장 실패: {e}")
+    return db
+
+def _build_frames(databases):
+    frames = {}
+    for bus, db in databases.items():
+        prefix = BUSES.get(bus, {}).get('prefix', '')
+        for msg in db.messages:
+            frames[frame_key(bus, msg.frame_id)] = (msg, prefix)
+    return frames
+
+def load_buses():
+    """config/buses.py의 모든 버스 DBC 로드 후 조회 테이블 구성 (처음 디코딩할 때 자동 호출)"""
+    global _frames
+    for bus, spec in BUSES.items():
+        if not 0 <= bus <= MAX_BUS:
+            raise ValueError(f"버스 채널은 0~{MAX_BUS}만 사용할 수 있습니다: {bus}")
+        if bus not in _databases:
+            _databases[bus] = load_dbc(spec['dbc'])
+    _frames = _build_frames(_databases)
+    return _frames
+
+def get_dbc(bus=0):
+    """버스의 DBC (처음 호출 시 로드)"""
+    if bus not in _databases:
+        load_buses()
+    return _databases[bus]
+
+def bus_dbc_paths():
+    """채널 → DBC 경로 (핫 리로드 감시 대상)"""
+    return {bus: spec['dbc'] for bus, spec in BUSES.items()}
+
+def swap_dbc(db, bus=0):
+    """실행 중 DBC 교체 (핫 리로드) - 새 조회 테이블을 만든 뒤 참조 1개만 바꾸므로
+    디코딩 중인 프레임은 이전/새 DBC 중 하나로 처리됨"""
+    global _frames
+    databases = {**_databases, bus: db}
+    frames = _build_frames(databases)
+    _databases[bus] = db
+    _frames = frames
+    _encode_defaults.clear()
+
+def __getattr__(name):
+    # 기존 코드 호환: from parser.can_decoder import dbc → 이 시점에 로드
+    if name == 'dbc':
+        return get_dbc()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# 게이트웨이가 수신 시각을 붙여 보내는 경우: "..., Data=11 22 33, TS=123456789" (마이크로초)
+TIMESTAMP_FIELD = ', TS='
+# 여러 버스를 하나의 시리얼로 보내는 게이트웨이: "ID=0x1A0, BUS=1, ..." (config/buses.py)
+BUS_FIELD = ', BUS='
+
+def split_line(line):
     """
-    "CAN FD RX: ID=0x123, DLC=24, Data=11 22 33 44 55 66 77 88" 형식의 문자열 → 신호 dict 변환
+    "CAN FD RX: ID=0x123, DLC=24, Data=11 22 33 ..." → (프레임 키, 데이터 bytes)
+    BUS= 태그가 있으면 프레임 키에 채널 포함 (config/buses.py), 없으면 CAN ID 그대로
+    ID를 해석할 수 없으면 (None, None), 데이터만 잘못되었으면 (키, None)
     """
+    # CAN FD RX: 접두사 제거
+    if line.startswith("CAN FD RX: "):
+        line = line[11:]  # "CAN FD RX: " 제거
+    
+    # ID 부분 추출 ("ID=0xEA, ..." - 첫 번째 쉼표까지)
+    try:
+        msg_id = int(line.partition(',')[0].partition('=')[2], 16)
+    except ValueError:
+        return None, None
+
+    # 버스 태그 (다중 버스 게이트웨이) - 태그 없는 라인은 검사 1번으로 끝남
+    if BUS_FIELD in line:
+        bus = bus_channel(line.partition(BUS_FIELD)[2].partition(',')[0])
+        if bus is None:
+            return None, None
+        msg_id = frame_key(bus, msg_id)
+    
+    # Data 부분 추출 ("7E 41 BB 00 01 ..." - 다음 쉼표 또는 끝까지)
+    _, found, data_part = line.partition('Data=')
+    if not found:
+        return msg_id, None
+    try:
+        return msg_id, bytes.fromhex(data_part.partition(',')[0])
+    except ValueError:
+        return msg_id, None
+
+def decode_frame(msg_id, data_bytes):
+    """프레임 키(CAN ID) + 데이터 bytes → 신호 dict (DBC에 없는 ID/잘못된 데이터는 빈 dict)"""
+    entry = (_frames or load_buses()).get(msg_id)  # DBC 로드 실패는 프레임 오류가 아니므로 그대로 전달
+    if entry is None:
+        return {}
+    msg, prefix = entry
     try:
-        # CAN FD RX: 접두사 제거
-        if line.startswith("CAN FD RX: "):
-            line = line[11:]  # "CAN FD RX: " 제거
-        
-        # ID 부분 추출
-        id_part = line.split(',')[0]  # "ID=0xEA"
-        msg_id = int(id_part.split('=')[1], 16)
-        
-        # Data 부분 추출
-        data_part = line.split('Data=')[1]  # "7E 41 BB 00 01 41 00 00 01 08 00 10 00 00 00 00 AC FF 00 00 00 00 00 00"
-        data_bytes = bytes(int(b, 16) for b in data_part.split())
-        
-        # DBC에서 메시지 찾기 및 디코딩
-        msg = dbc.get_message_by_frame_id(msg_id)
+        # DBC 신호명을 그대로 반환 (매핑 없음), 다른 버스와 겹치면 prefix
         decoded = msg.decode(data_bytes)
-        
-        # DBC 신호명을 그대로 반환 (매핑 없음)
-        return decoded
-    except Exception as e:
-        # 디버깅을 위한 에러 출력 (선택사항)
-        # print(f"Decode error for line: {line.strip()}, Error: {e}")
+    except Exception:
         return {}
+    if prefix:
+        return {prefix + name: value for name, value in decoded.items()}
+    return decoded
+
+def decode_line(line):
+    """
+    "CAN FD RX: ID=0x123, DLC=24, Data=11 22 33 44 55 66 77 88" 형식의 문자열 → 신호 dict 변환
+    """
+    msg_id, data_bytes = split_line(line)
+    if data_bytes is None:
+        return {}
+    return decode_frame(msg_id, data_bytes)
+
+def parse_timestamp(line):
+    """라인의 게이트웨이 하드웨어 타임스탬프(TS=마이크로초) → 초, 없으면 None"""
+    index = line.rfind(TIMESTAMP_FIELD)
+    if index < 0:
+        return None
+    try:
+        return int(line[index + len(TIMESTAMP_FIELD):].strip()) / 1_000_000
+    except ValueError:
+        return None
+
+def encode_line(msg_id, signals):
+    """
+    신호 dict → "CAN FD RX: ID=0xEA, DLC=24, Data=..." 형식의 문자열 (decode_line의 역변환)
+    msg_id가 다른 버스의 프레임 키면 BUS= 태그 포함, signals는 prefix 없는 DBC 신호명
+    signals에 없는 신호는 raw 0 값으로 채움 (시뮬레이션/벤치마크용)
+    """
+    bus, can_id = split_key(msg_id)
+    msg = get_dbc(bus).get_message_by_frame_id(can_id)
+    defaults = _encode_defaults.get(msg_id)
+    if defaults is None:
+        defaults = {sig.name: sig.offset for sig in msg.signals}
+        _encode_defaults[msg_id] = defaults
+    
+    data_bytes = msg.encode({**defaults, **signals}, strict=False)
+    data_part = ' '.join(f"{b:02X}" for b in data_bytes)
+    bus_part = f", BUS={bus}" if bus else ""
+    return f"CAN FD RX: ID=0x{can_id:X}{bus_part}, DLC={len(data_bytes)}, Data={data_part}"
@@ -0,0 +1,184 @@
+# parser/dashboard_bundle.py
+# 대시보드 페이지/정적 자산을 메모리에서 제공 - 요청마다 디스크를 읽지 않음
+#   generate_dashboard.py --bundle 로 만든 static/dist/ (manifest.json + 축소 HTML + 로컬 Plotly + .gz/.br)
+#   가 있으면 그것을, 없으면 static/index.html을 읽어 gzip만 메모리에서 만들어 제공
+#   번들을 만든 뒤 static/index.html이 바뀌었으면(manifest의 source_sha와 다르면) 경고 후 static/index.html 제공
+# ETag(내용 해시)로 재검증(304), Accept-Encoding에 따라 미리 압축된 br/gzip 본문 선택
+# 해시가 붙은 자산(/assets/...)은 내용이 바뀌면 이름도 바뀌므로 1년 캐시(immutable)
+
+import gzip
+import hashlib
+import json
+import os
+
+DIST_DIR = os.path.join("static", "dist")
+MANIFEST_NAME = "manifest.json"
+INDEX_NAME = "index.html"
+SOURCE_INDEX = os.path.join("static", "index.html")
+
+# 압축 방식 → 미리 압축한 파일 확장자 (선호 순서)
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+CONTENT_TYPES = {
+    '.html': "text/html; charset=utf-8",
+    '.js': "application/javascript; charset=utf-8",
+    '.css': "text/css; charset=utf-8",
+    '.json': "application/json",
+}
+INDEX_CACHE = "no-cache"  # 페이지는 항상 재검증 (ETag가 같으면 304)
+ASSET_CACHE = "public, max-age=31536000, immutable"
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def accepted_encodings(header):
+    """Accept-Encoding 헤더 → 허용된 압축 방식 집합 (q=0은 제외)"""
+    accepted = set()
+    for part in (header or "").split(','):
+        token, _, params = part.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if token.strip() and quality > 0:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+class Asset:
+    """메모리에 올린 파일 하나 (원본 + 압축 본문)"""
+
+    def __init__(self, name, data, cache_control, variants=None):
+        self.name = name
+        self.data = data
+        self.cache_control = cache_control
+        self.variants = variants or {}  # 압축 방식 → bytes
+        self.etag = content_hash(data)
+        self.content_type = CONTENT_TYPES.get(os.path.splitext(name)[1], "application/octet-stream")
+
+    def respond(self, accept_encoding=None, if_none_match=None):
+        """요청 헤더 → (상태 코드, 응답 헤더, 본문)"""
+        accepted = accepted_encodings(accept_encoding)
+        encoding = next((enc for enc in ENCODINGS if enc in self.variants and enc in accepted), None)
+        body = self.variants[encoding] if encoding else self.data
+        # 압축 방식별로 본문이 다르므로 ETag도 구분
+        etag = f'"{self.etag}-{encoding}"' if encoding else f'"{self.etag}"'
+        headers = {'ETag': etag, 'Cache-Control': self.cache_control,
+                   'Vary': 'Accept-Encoding', 'Content-Type': self.content_type}
+        if if_none_match and (if_none_match.strip() == '*' or
+                              etag in [tag.strip() for tag in if_none_match.split(',')]):
+            return 304, headers, b""
+        if encoding:
+            headers['Content-Encoding'] = encoding
+        return 200, headers, body
+
+
+class DashboardBundle:
+    """대시보드 자산 저장소 - 파일이 바뀌면(mtime) 다음 요청 때 다시 읽음"""
+
+    def __init__(self, dist_dir=DIST_DIR, source_index=SOURCE_INDEX):
+        self.dist_dir = dist_dir
+        self.source_index = source_index
+        self.manifest = None
+        self.assets = {}
+        self._stamp = None
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.dist_dir, MANIFEST_NAME)
+
+    def _current_stamp(self):
+        return (_mtime(self.manifest_path), _mtime(self.source_index))
+
+    def refresh(self):
+        """번들(또는 static/index.html)이 바뀌었으면 다시 읽음 - 요청당 stat 두 번
+        읽기에 실패하면 이전 자산을 유지하고 다음 요청 때 다시 시도"""
+        stamp = self._current_stamp()
+        if stamp == self._stamp:
+            return
+        loaded = False
+        try:
+            manifest = self._read_manifest() if stamp[0] is not None else None
+            if manifest is not None and self._matches_source(manifest):
+                self._load_dist(manifest)
+                loaded = True
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ 대시보드 번들 로드 실패 ({self.dist_dir}): {e} - {self.source_index} 사용")
+        try:
+            if not loaded:
+                self._load_source()
+        except OSError as e:
+            print(f"⚠️ 대시보드 페이지 로드 실패 ({self.source_index}): {e}")
+            if INDEX_NAME not in self.assets:
+                raise
+            return
+        self._stamp = stamp
+
+    def _read_manifest(self):
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _matches_source(self, manifest):
+        """번들이 현재 static/index.html로 만든 것인지 (원본이 없으면 번들 사용)"""
+        try:
+            with open(self.source_index, 'rb') as f:
+                source_sha = content_hash(f.read())
+        except OSError:
+            return True
+        if manifest.get('source_sha') == source_sha:
+            return True
+        print(f"⚠️ {self.source_index}가 번들({self.dist_dir}) 생성 이후 바뀌었습니다 - 번들 대신 원본 페이지 제공 "
+              f"(python generate_dashboard.py --bundle 로 다시 만드세요)")
+        return False
+
+    def _load_dist(self, manifest):
+        assets = {}
+        for name, info in manifest['files'].items():
+            path = os.path.join(self.dist_dir, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            variants = {}
+            for encoding in info.get('encodings', []):
+                with open(path + ENCODINGS[encoding], 'rb') as f:
+                    variants[encoding] = f.read()
+            cache_control = INDEX_CACHE if name == INDEX_NAME else ASSET_CACHE
+            assets[name] = Asset(name, data, cache_control, variants)
+        self.manifest, self.assets = manifest, assets
+        print(f"📦 대시보드 번들 로드: v{manifest['version']} ({len(assets)}개 파일)")
+
+    def _load_source(self):
+        with open(self.source_index, 'rb') as f:
+            data = f.read()
+        self.manifest = None
+        self.assets = {INDEX_NAME: Asset(INDEX_NAME, data, INDEX_CACHE,
+                                         {'gzip': gzip.compress(data, 9, mtime=0)})}
+
+    def index(self):
+        self.refresh()
+        return self.assets[INDEX_NAME]
+
+    def asset(self, name):
+        """해시가 붙은 자산 (index.html 제외) - 없으면 None"""
+        self.refresh()
+        if name == INDEX_NAME:
+            return None
+        return self.assets.get(name)
+
+    def status(self):
+        self.refresh()
+        if self.manifest is None:
+            return {'bundled': False, 'source': self.source_index}
+        return {'bundled': True, 'version': self.manifest['version'], 'built': self.manifest.get('built'),
+                'plotly': self.manifest.get('plotly'), 'files': sorted(self.assets)}
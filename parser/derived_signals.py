@@ -0,0 +1,175 @@
+# parser/derived_signals.py
+# config/signals.py의 DERIVED_SIGNALS를 의존성 그래프로 컴파일하여
+# 입력 신호가 실제로 바뀐 경우에만 파생 신호를 재계산
+
+from collections import deque
+
+# formula 식에서 사용할 수 있는 함수들
+FORMULA_HELPERS = {
+    'mean': lambda *values: sum(values) / len(values),
+    'abs': abs,
+    'min': min,
+    'max': max,
+}
+
+
+class FormulaNode:
+    """입력 신호들로 즉시 계산되는 파생 신호"""
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.inputs = list(spec['inputs'])
+        self.default = spec.get('default', 0)
+        self.code = compile(spec['formula'], f'<derived:{name}>', 'eval')
+        unknown = set(self.code.co_names) - set(self.inputs) - set(FORMULA_HELPERS)
+        if unknown:
+            raise ValueError(f"파생 신호 {name}: inputs에 없는 이름 사용 {sorted(unknown)}")
+        self.last_inputs = None
+        self.value = self.default
+
+    def needs_tick(self, t):
+        return False
+
+    def compute(self, values, t):
+        namespace = dict(zip(self.inputs, values))
+        return eval(self.code, FORMULA_HELPERS, namespace)
+
+
+class DerivativeNode:
+    """input 신호의 window(초) 구간 변화율 - 입력이 멈춘 뒤 window가 지나면 재계산 중단"""
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.inputs = [spec['input']]
+        self.default = spec.get('default', 0)
+        self.window = float(spec['window'])
+        self.scale = spec.get('scale', 1)
+        self.history = deque()
+        self.settle_time = None  # 이 시간 이후에는 변화율이 0으로 고정
+        self.last_inputs = None
+        self.value = self.default
+
+    def needs_tick(self, t):
+        # 입력이 변하지 않아도 window 동안은 변화율이 줄어들므로 계속 계산
+        return self.settle_time is not None
+
+    def compute(self, values, t):
+        if t is None:
+            return self.default
+        value = values[0]
+
+        if self.settle_time is None and self.history:
+            # 정지 상태에서 재개: 직전 window 동안 값이 일정했던 것으로 복원
+            self.history = deque([(t - self.window, self.history[-1][1])])
+        if not self.history or value != self.history[-1][1]:
+            self.settle_time = t + self.window
+
+        self.history.append((t, value))
+        cutoff = t - self.window
+        while len(self.history) >= 2 and self.history[1][0] <= cutoff:
+            self.history.popleft()
+
+        if t >= self.settle_time:
+            # window 전체가 같은 값 → 변화율 0, 입력이 바뀔 때까지 계산 생략
+            self.settle_time = None
+            return 0
+
+        t0, v0 = self.history[0]
+        if t <= t0:
+            return 0
+        return (value - v0) / (t - t0) * self.scale
+
+
+NODE_KINDS = {
+    'formula': FormulaNode,
+    'derivative': DerivativeNode,
+}
+
+
+def compile_graph(definitions):
+    """파생 신호 정의를 노드로 만들고 의존성 순서(위상 정렬)로 반환"""
+    nodes = {}
+    for name, spec in definitions.items():
+        kind = spec.get('kind', 'formula')
+        if kind not in NODE_KINDS:
+            raise ValueError(f"파생 신호 {name}: 알 수 없는 kind '{kind}'")
+        nodes[name] = NODE_KINDS[kind](name, spec)
+
+    ordered = []
+    state = {}  # name -> 'visiting' | 'done'
+
+    def visit(name, path):
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"파생 신호 순환 의존: {' -> '.join(path + [name])}")
+        state[name] = 'visiting'
+        for dep in nodes[name].inputs:
+            if dep in nodes:
+                visit(dep, path + [name])
+        state[name] = 'done'
+        ordered.append(nodes[name])
+
+    for name in nodes:
+        visit(name, [])
+    return ordered
+
+
+class DerivedSignalEngine:
+    """행(row)에 파생 신호를 채워 넣는 엔진 - 입력이 바뀐 노드만 재계산"""
+
+    def __init__(self, definitions=None):
+        if definitions is None:
+            from config.signals import DERIVED_SIGNALS
+            definitions = DERIVED_SIGNALS
+        self.definitions = dict(definitions)
+        self.nodes = compile_graph(definitions)
+        self.names = [node.name for node in self.nodes]
+
+    def reconfigure(self, definitions):
+        """실행 중 정의 교체 (핫 리로드) - 정의가 그대로인 노드는 누적 상태(변화율 히스토리)를 유지
+        잘못된 정의면 ValueError를 내고 기존 정의를 그대로 사용"""
+        compiled = compile_graph(definitions)
+        current = {node.name: node for node in self.nodes}
+        nodes = [current[node.name] if self.definitions.get(node.name) == definitions[node.name] else node
+                 for node in compiled]
+        self.definitions = dict(definitions)
+        self.nodes = nodes
+        self.names = [node.name for node in nodes]
+
+    def reset(self):
+        """누적 상태(변화율 히스토리 등) 초기화 - 새 주행 데이터를 처리할 때 사용"""
+        for node in self.nodes:
+            node.last_inputs = None
+            node.value = node.default
+            if isinstance(node, DerivativeNode):
+                node.history.clear()
+                node.settle_time = None
+
+    def update(self, row, t=None):
+        """row에 파생 신호 값을 채워서 반환 (row를 직접 수정)"""
+        if t is None:
+            t = row.get('Time')
+
+        for node in self.nodes:
+            try:
+                raw = tuple(row[key] for key in node.inputs)
+            except KeyError:
+                # 입력이 없으면 행에 이미 있는 값(예: 외부 CSV)을 쓰고, 없으면 기본값
+                if node.name not in row:
+                    row[node.name] = node.default
+                continue
+
+            if raw != node.last_inputs or node.needs_tick(t):
+                node.last_inputs = raw
+                try:
+                    node.value = node.compute(tuple(float(v) for v in raw), t)
+                except (ValueError, TypeError, ZeroDivisionError):
+                    node.value = node.default
+            row[node.name] = node.value
+
+        return row
+
+    def values(self):
+        """마지막으로 계산된 파생 신호 값들"""
+        return {node.name: node.value for node in self.nodes}
@@ -0,0 +1,141 @@
+# parser/event_spans.py
+# 이벤트 구간(span) - 시간대 행의 event 값이 바뀔 때 구간을 열고 닫아 서버에서 누적
+#   대시보드는 행을 훑지 않고 span open/close 메시지와 /events/spans 조회 결과로 구간을 그림
+#   구간마다 종류/시작/끝과 구간 중 신호 최댓값(절댓값 기준, config/signals.py의 EVENT_SPAN_PEAK_SIGNALS)을 보관
+# 행의 event는 활성 이벤트 중 우선순위가 가장 높은 것 하나("PM_on" 등) 또는 "none"이므로 구간은 서로 겹치지 않음
+
+import threading
+from collections import deque
+
+from config import signals as signal_config  # 핫 리로드로 교체되므로 모듈 속성으로 참조
+from event_logic.event_detector import derived
+
+
+def event_code(event):
+    """행의 event 값 → 이벤트 코드 ("PM_on" → "PM", "none" → None)"""
+    if isinstance(event, str) and event.endswith('_on'):
+        return event[:-3]
+    return None
+
+
+class EventSpanSink:
+    """이벤트 구간 누적 싱크 - 시작 시간 순으로 보관하고 변경 내역을 일련번호가 붙은 메시지로 남김"""
+
+    def __init__(self, history=5000, message_history=1000):
+        self.history = history
+        self.spans = []  # 시작 시간 순 (닫힌 구간들 + 마지막에 진행 중인 구간)
+        self.current = None  # 진행 중인 구간
+        self.messages = deque(maxlen=message_history)
+        self.sequence = 0  # 지금까지 남긴 메시지 수
+        self.next_id = 1
+        self.last_time = None
+        self.lock = threading.Lock()
+
+    def write(self, row):
+        time = row.get('Time')
+        code = event_code(row.get('event'))
+        with self.lock:
+            if self.last_time is not None and time is not None and time < self.last_time:
+                # 시간이 되돌아감 = 새 주행 데이터 (reset 없이 재생을 다시 시작한 경우)
+                self._reset()
+            self.last_time = time
+            if self.current is not None and code != self.current['code']:
+                self._close(time)
+            if code is not None and self.current is None:
+                self._open(code, time)
+            if self.current is not None:
+                self._update_peaks(row)
+
+    def _open(self, code, time):
+        self.current = {'id': self.next_id, 'code': code, 'start': time, 'end': None, 'peaks': {},
+                        'peak_signals': tuple(getattr(signal_config, 'EVENT_SPAN_PEAK_SIGNALS', ()))}
+        self.next_id += 1
+        self.spans.append(self.current)
+        if len(self.spans) > self.history:
+            del self.spans[:len(self.spans) - self.history]
+        self._emit('open', self.current)
+
+    def _close(self, time):
+        span, self.current = self.current, None
+        span['end'] = time
+        self._emit('close', span)
+
+    def _update_peaks(self, row):
+        span = self.current
+        peaks = span['peaks']
+        derived_values = None
+        for name in span['peak_signals']:
+            value = row.get(name)
+            if value is None:
+                # 파생 신호(SPEED, LONG_ACCEL 등)는 저장 행에서 빠지므로 마지막 계산 값 사용
+                if derived_values is None:
+                    derived_values = derived.values()
+                value = derived_values.get(name)
+            if not isinstance(value, (int, float)) or value != value:
+                continue
+            peak = peaks.get(name)
+            if peak is None or abs(value) > abs(peak):
+                peaks[name] = value
+
+    def _emit(self, action, span=None):
+        message = {'type': 'span', 'action': action}
+        if span is not None:
+            message['span'] = self._public(span)
+        self.sequence += 1
+        self.messages.append(message)
+
+    @staticmethod
+    def _public(span):
+        end = span['end']
+        return {'id': span['id'], 'code': span['code'], 'start': span['start'], 'end': end,
+                'duration': None if end is None or span['start'] is None else round(end - span['start'], 3),
+                'peaks': dict(span['peaks'])}
+
+    def _reset(self):
+        self.spans = []
+        self.current = None
+        self.last_time = None
+        self._emit('reset')
+
+    def reset(self):
+        """새 주행 데이터를 처음부터 처리할 때 - 구간 모두 삭제, 대시보드에는 reset 메시지"""
+        with self.lock:
+            self._reset()
+
+    def messages_since(self, sequence):
+        """sequence 이후 메시지들 → (현재 일련번호, 메시지 리스트) - 보관 범위를 넘은 메시지는 생략"""
+        with self.lock:
+            missed = min(self.sequence - sequence, len(self.messages))
+            if missed <= 0:
+                return self.sequence, []
+            return self.sequence, list(self.messages)[-missed:]
+
+    def query(self, start=None, end=None, code=None, limit=None):
+        """[start, end] 시간 범위와 겹치는 구간 목록 (진행 중인 구간은 end가 None)"""
+        with self.lock:
+            spans = self.spans
+            first = 0
+            if start is not None:
+                # 구간이 겹치지 않으므로 끝 시간도 시작 시간 순 - 끝이 start 이상인 첫 구간을 이진 탐색
+                low, high = 0, len(spans)
+                while low < high:
+                    middle = (low + high) // 2
+                    span_end = spans[middle]['end']
+                    if span_end is not None and span_end < start:
+                        low = middle + 1
+                    else:
+                        high = middle
+                first = low
+            result = []
+            for span in spans[first:]:
+                if end is not None and span['start'] is not None and span['start'] > end:
+                    break
+                if code is None or span['code'] == code:
+                    result.append(self._public(span))
+            sequence = self.sequence
+        if limit is not None:
+            result = result[-limit:] if limit > 0 else []
+        return sequence, result
+
+    def close(self):
+        pass
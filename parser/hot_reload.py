@@ -0,0 +1,143 @@
+# parser/hot_reload.py
+# DBC / config/signals.py 핫 리로드 - 재시작 없이 실행 중인 엔진에 새 설정 적용
+#   파일 변경 감시(mtime 폴링) → 백그라운드 스레드에서 다시 컴파일 → 다음 시간대 경계에서 교체
+# 컴파일 중에도 수신/디코딩은 이전 설정으로 계속되므로 프레임을 버리지 않음
+# 새 설정에 오류가 있으면 이전 설정을 유지하고 오류만 기록
+# 환경변수 HOT_RELOAD=0 이면 비활성화, HOT_RELOAD_INTERVAL로 확인 주기(초) 설정
+# 시간대 경계가 SWAP_TIMEOUT초 넘게 오지 않으면(프레임이 없는 실시간 연결 등) 경계를 기다리지 않고 교체
+
+import asyncio
+import importlib.util
+import os
+import time
+
+import config.signals
+from parser import can_decoder
+from event_logic import event_detector
+from event_logic.event_detector import derived
+
+DEFAULT_INTERVAL = float(os.environ.get("HOT_RELOAD_INTERVAL", "1"))
+SWAP_TIMEOUT = 2.0  # 시간대 경계를 기다리는 최대 시간 (초)
+SIGNALS_PATH = os.path.join("config", "signals.py")
+# config/signals.py에서 교체할 설정 (대문자 이름)
+SIGNAL_SETTINGS = ('STANDARD_COLUMNS', 'REQUIRED_SIGNALS', 'VISUALIZATION_SIGNALS', 'SIGNAL_COLORS',
+                   'SIGNAL_SCALES', 'SIGNAL_SCALE_SUFFIXES', 'DERIVED_SIGNALS', 'DASHBOARD_RENDERER',
+                   'EVENT_SPAN_PEAK_SIGNALS')
+
+
+def enabled():
+    return os.environ.get("HOT_RELOAD", "1") != "0"
+
+
+def _file_state(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_signal_settings(path=SIGNALS_PATH):
+    """config/signals.py를 새 모듈로 실행해 설정 dict 반환 (실행 중인 config.signals는 건드리지 않음)"""
+    spec = importlib.util.spec_from_file_location("_signals_reload", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return {name: getattr(module, name) for name in SIGNAL_SETTINGS if hasattr(module, name)}
+
+
+def visualization_config():
+    """대시보드 신호 표시 설정 (현재 config.signals 기준) - 스케일/접미사가 없는 신호는 1배, 접미사 없음"""
+    signals = list(config.signals.VISUALIZATION_SIGNALS)
+    scales = config.signals.SIGNAL_SCALES
+    suffixes = config.signals.SIGNAL_SCALE_SUFFIXES
+    return {
+        'signals': signals,
+        'colors': dict(config.signals.SIGNAL_COLORS),
+        'scales': {**scales, **{signal: scales.get(signal, 1) for signal in signals}},
+        'suffixes': {**suffixes, **{signal: suffixes.get(signal, "") for signal in signals}},
+        'renderer': getattr(config.signals, 'DASHBOARD_RENDERER', 'svg'),
+    }
+
+
+class HotReloader:
+    """엔진 하나에 대한 DBC/신호 설정 감시자 - run()을 이벤트 루프 작업으로 실행"""
+
+    def __init__(self, engine, dbc_paths=None, signals_path=SIGNALS_PATH, interval=DEFAULT_INTERVAL):
+        """dbc_paths: 채널 → DBC 경로 (None이면 config/buses.py의 모든 버스)"""
+        self.engine = engine
+        self.dbc_paths = dbc_paths or can_decoder.bus_dbc_paths()
+        self.signals_path = signals_path
+        self.interval = interval
+        self.version = 0  # 교체가 적용될 때마다 증가 (대시보드가 설정 변경을 알아채는 용도)
+        self.history = []  # 최근 리로드 결과
+        # 경로 → (백그라운드 컴파일 함수, 시간대 경계에서 교체하는 함수)
+        self.watches = {path: (can_decoder.load_dbc, self._dbc_applier(bus))
+                        for bus, path in self.dbc_paths.items()}
+        self.watches[signals_path] = (load_signal_settings, self._apply_signals)
+        self._states = {path: _file_state(path) for path in self.watches}
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.engine.run_overdue_between_ticks(SWAP_TIMEOUT):
+                print(f"⏱️ {SWAP_TIMEOUT:g}초 동안 시간대 경계가 없어 설정을 바로 교체했습니다")
+            for path, (compile_func, apply_func) in self.watches.items():
+                state = _file_state(path)
+                if state is None or state == self._states[path]:
+                    continue
+                self._states[path] = state
+                await self._reload(loop, path, compile_func, apply_func)
+
+    async def _reload(self, loop, path, compile_func, apply_func):
+        started = time.perf_counter()
+        try:
+            # 파싱/컴파일은 이벤트 루프 밖에서 (그동안 수신은 이전 설정으로 계속)
+            compiled = await loop.run_in_executor(None, compile_func, path)
+            if compile_func is load_signal_settings and 'DERIVED_SIGNALS' in compiled:
+                # 교체 전에 파생 신호 정의를 미리 검증 (오류면 이전 설정 유지)
+                from parser.derived_signals import compile_graph
+                compile_graph(compiled['DERIVED_SIGNALS'])
+        except Exception as e:
+            self._record(path, False, f"{type(e).__name__}: {e}", started)
+            print(f"⚠️ 설정 다시 읽기 실패 ({path}) - 이전 설정 유지: {e}")
+            return
+        self.engine.call_between_ticks(lambda: self._swap(path, apply_func, compiled, started))
+
+    def _swap(self, path, apply_func, compiled, started):
+        try:
+            apply_func(compiled)
+        except Exception as e:
+            self._record(path, False, f"{type(e).__name__}: {e}", started)
+            print(f"⚠️ 설정 교체 실패 ({path}) - 이전 설정 유지: {e}")
+            return
+        self.version += 1
+        self._record(path, True, None, started)
+        print(f"🔄 설정 다시 읽음: {path} ({(time.perf_counter() - started) * 1000:.0f}ms)")
+
+    def _dbc_applier(self, bus):
+        return lambda db: can_decoder.swap_dbc(db, bus)
+
+    def _apply_signals(self, settings):
+        # 이벤트 규칙은 컴파일할 때 REQUIRED_SIGNALS를 넣어 두므로 바뀌었으면 다시 컴파일 (실패하면 아무것도 바꾸지 않음)
+        rule_set = None
+        required = settings.get('REQUIRED_SIGNALS')
+        current = event_detector.fsm.detector.rules
+        if required is not None and list(required) != current.required:
+            rule_set = current.with_required(required)
+        if 'DERIVED_SIGNALS' in settings:
+            derived.reconfigure(settings['DERIVED_SIGNALS'])
+        if rule_set is not None:
+            event_detector.set_required_signals(rule_set)
+        for name, value in settings.items():
+            setattr(config.signals, name, value)
+
+    def _record(self, path, ok, error, started):
+        self.history.append({'path': path, 'ok': ok, 'error': error, 'at': time.time(),
+                             'seconds': round(time.perf_counter() - started, 3)})
+        del self.history[:-20]
+
+    def status(self):
+        return {'version': self.version, 'interval': self.interval,
+                'watching': list(self.watches), 'history': self.history,
+                'pending': len(self.engine.between_ticks)}  # 시간대 경계를 기다리는 교체 수
@@ -0,0 +1,314 @@
+# parser/ipc_bus.py
+# 로컬 IPC pub/sub - 디코딩된 스트림을 Unix 도메인 소켓으로 다른 도구에 전달 (브라우저 websocket 외의 출구)
+#   발행: 환경변수 IPC_SOCKET=<소켓 경로> 로 MonitorCore를 실행하면 IpcPublisher가 붙음
+#   구독: IpcSubscriber(경로, topics) 또는 ipc_subscriber.py
+# 메시지 형식: [길이(uint32 LE, 토픽 바이트 포함)][토픽(uint8)][본문]
+#   TOPIC_CONTROL(0): JSON - 구독 요청/응답, 놓친 메시지 수 {"type": "dropped", "count": N}
+#   TOPIC_FRAME(1):   원본 프레임 - 바이너리 캡처 레코드와 같은 [타임스탬프 us(없으면 -1), 프레임 키, 길이] + 데이터
+#   TOPIC_ROW(2):     시간대 행 JSON (파생 신호 포함, 대시보드 websocket 행과 같은 필드)
+#   TOPIC_EVENT(3):   이벤트 구간 open/close/reset JSON (parser/event_spans.py 메시지)
+# 구독자는 연결 후 {"type": "subscribe", "topics": [...]} 제어 메시지를 보내야 그 토픽을 받음
+# 느린 구독자: 송신 버퍼가 IPC_MAX_BUFFER 바이트를 넘으면 그 구독자에게 보낼 메시지는 버림 (파이프라인은 대기하지 않음)
+#   버린 수는 다음으로 보내는 메시지 앞에 dropped 제어 메시지로 알려줌
+
+import asyncio
+import json
+import os
+import socket
+import stat
+import struct
+import threading
+
+from parser.pipeline import CAPTURE_RECORD
+from parser.subscriptions import dumps
+from event_logic.event_detector import derived
+
+HEADER = struct.Struct('<IB')
+TOPIC_CONTROL, TOPIC_FRAME, TOPIC_ROW, TOPIC_EVENT = 0, 1, 2, 3
+TOPICS = {'frame': TOPIC_FRAME, 'row': TOPIC_ROW, 'event': TOPIC_EVENT}
+TOPIC_NAMES = {number: name for name, number in TOPICS.items()}
+DEFAULT_PATH = "/tmp/can_monitor.sock"  # 구독 도구의 기본 소켓 경로 (IPC_SOCKET이 없을 때)
+MAX_BUFFER = int(os.environ.get("IPC_MAX_BUFFER", str(1024 * 1024)))  # 구독자별 송신 버퍼 한도 (바이트)
+MAX_MESSAGE = 16 * 1024 * 1024
+
+
+def encode(topic, payload):
+    return HEADER.pack(len(payload) + 1, topic) + payload
+
+
+def encode_json(topic, data):
+    return encode(topic, dumps(data).encode('utf-8'))
+
+
+def encode_frame(can_id, data_bytes, timestamp=None):
+    timestamp_us = -1 if timestamp is None else int(timestamp * 1_000_000)
+    return encode(TOPIC_FRAME, CAPTURE_RECORD.pack(timestamp_us, can_id, len(data_bytes)) + bytes(data_bytes))
+
+
+def decode(topic, payload):
+    """본문 → 프레임이면 (타임스탬프 초 또는 None, 프레임 키, 데이터 bytes), 그 외 dict"""
+    if topic == TOPIC_FRAME:
+        timestamp_us, can_id, length = CAPTURE_RECORD.unpack_from(payload)
+        data = payload[CAPTURE_RECORD.size:CAPTURE_RECORD.size + length]
+        return (None if timestamp_us < 0 else timestamp_us / 1_000_000, can_id, data)
+    return json.loads(payload)
+
+
+def parse_topics(names):
+    """토픽 이름 목록 → 토픽 번호 집합 (알 수 없는 이름이면 ValueError)"""
+    if not isinstance(names, list):
+        raise ValueError("topics는 토픽 이름 목록이어야 합니다")
+    unknown = [name for name in names if name not in TOPICS]
+    if unknown:
+        raise ValueError(f"알 수 없는 토픽: {unknown} (사용 가능: {list(TOPICS)})")
+    return {TOPICS[name] for name in names}
+
+
+class _Connection(asyncio.Protocol):
+    """구독자 연결 하나 - 제어 메시지 수신, 송신 버퍼 한도를 넘으면 버림"""
+
+    def __init__(self, publisher):
+        self.publisher = publisher
+        self.transport = None
+        self.topics = set()
+        self.received = b""
+        self.sent = 0
+        self.dropped = 0  # 지금까지 버린 메시지 수
+        self.unreported = 0  # 아직 알리지 않은 버린 메시지 수
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.publisher.connections.add(self)
+
+    def connection_lost(self, exc):
+        self.publisher.connections.discard(self)
+        self.publisher.count_topics()
+
+    def data_received(self, data):
+        self.received += data
+        while len(self.received) >= HEADER.size:
+            length, topic = HEADER.unpack_from(self.received)
+            if length < 1 or length > MAX_MESSAGE:
+                self.transport.close()
+                return
+            end = HEADER.size - 1 + length
+            if len(self.received) < end:
+                return
+            payload, self.received = self.received[HEADER.size:end], self.received[end:]
+            if topic == TOPIC_CONTROL:
+                self._control(payload)
+
+    def _control(self, payload):
+        try:
+            message = json.loads(payload)
+            if not isinstance(message, dict) or message.get('type') != 'subscribe':
+                return
+            self.topics = parse_topics(message.get('topics', list(TOPICS)))
+        except (ValueError, TypeError) as e:
+            self.transport.write(encode_json(TOPIC_CONTROL, {'type': 'error', 'message': f"구독 설정 오류: {e}"}))
+            return
+        self.publisher.count_topics()
+        self.transport.write(encode_json(TOPIC_CONTROL, {
+            'type': 'subscribed', 'topics': sorted(TOPIC_NAMES[topic] for topic in self.topics)}))
+
+    def send(self, message):
+        transport = self.transport
+        if transport.is_closing() or transport.get_write_buffer_size() + len(message) > self.publisher.max_buffer:
+            self.dropped += 1
+            self.unreported += 1
+            return False
+        if self.unreported:
+            transport.write(encode_json(TOPIC_CONTROL, {'type': 'dropped', 'count': self.unreported}))
+            self.unreported = 0
+        transport.write(message)
+        self.sent += 1
+        return True
+
+
+def _socket_in_use(path):
+    """path에 연결을 받는 프로세스가 있으면 True (연결이 거부되면 이전 실행이 남긴 소켓 파일)"""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return False
+    if not stat.S_ISSOCK(mode):
+        raise RuntimeError(f"IPC 소켓 경로에 소켓이 아닌 파일이 있습니다: {path}")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    probe.settimeout(1.0)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        return False
+    finally:
+        probe.close()
+    return True
+
+
+class IpcPublisher:
+    """MonitorCore의 행 싱크 + 프레임 싱크 - 토픽별로 한 번만 직렬화해 구독자 모두에게 전송
+    전송은 이벤트 루프 스레드에서만 (다른 스레드의 호출은 call_soon_threadsafe로 넘김)"""
+
+    def __init__(self, path, spans=None, metrics=None, max_buffer=MAX_BUFFER):
+        """spans: 이벤트 구간 메시지를 가져올 EventSpanSink (행 싱크 목록에서 이 싱크보다 앞에 있어야 함)"""
+        self.path = path
+        self.spans = spans
+        self.metrics = metrics
+        self.max_buffer = max_buffer
+        self.connections = set()
+        self.subscribed = {topic: 0 for topic in TOPIC_NAMES}  # 토픽 → 구독자 수
+        self.span_sequence = spans.sequence if spans else 0
+        self.server = None
+        self._loop = None
+        self._loop_thread = None
+
+    async def start(self):
+        """소켓 열기 - 이전 실행이 남긴 소켓 파일은 삭제, 다른 발행 프로세스가 쓰는 중이면 거부"""
+        if self.server is not None:
+            return
+        if _socket_in_use(self.path):
+            raise RuntimeError(f"IPC 소켓 {self.path}을(를) 다른 발행 프로세스가 사용 중입니다 "
+                               f"- 그 프로세스를 끝내거나 다른 IPC_SOCKET 경로를 사용하세요")
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self.server = await self._loop.create_unix_server(lambda: _Connection(self), self.path)
+        print(f"📡 IPC 발행 시작: {self.path} (토픽: {', '.join(TOPICS)})")
+
+    def count_topics(self):
+        counts = {topic: 0 for topic in TOPIC_NAMES}
+        for connection in self.connections:
+            for topic in connection.topics:
+                counts[topic] += 1
+        self.subscribed = counts
+
+    def _publish(self, topic, message):
+        if threading.get_ident() != self._loop_thread:
+            # 종료 처리 스레드 등에서 온 마지막 행 - 이벤트 루프가 이미 닫혔으면 보낼 곳이 없음
+            self._call_in_loop(self._publish, topic, message)
+            return
+        sent = dropped = 0
+        for connection in list(self.connections):
+            if topic in connection.topics:
+                if connection.send(message):
+                    sent += 1
+                else:
+                    dropped += 1
+        if self.metrics is not None:
+            self.metrics.inc('ipc_messages_total', sent)
+            if dropped:
+                self.metrics.inc('ipc_messages_dropped_total', dropped)
+
+    def write_frame(self, can_id, data_bytes, timestamp=None):
+        """프레임 싱크 - 디코딩 전 원본 프레임 (구독자가 없으면 직렬화하지 않음)"""
+        if self.server is None:
+            return
+        if self.subscribed[TOPIC_FRAME]:
+            self._publish(TOPIC_FRAME, encode_frame(can_id, data_bytes, timestamp))
+
+    def write(self, row):
+        """행 싱크 - 시간대 행과 그 사이 생긴 이벤트 구간 메시지"""
+        if self.server is None:
+            return
+        if self.spans is not None:
+            self.span_sequence, messages = self.spans.messages_since(self.span_sequence)
+            if self.subscribed[TOPIC_EVENT]:
+                for message in messages:
+                    self._publish(TOPIC_EVENT, encode_json(TOPIC_EVENT, message))
+        if self.subscribed[TOPIC_ROW]:
+            published = row.copy()
+            published.update(derived.values())
+            self._publish(TOPIC_ROW, encode(TOPIC_ROW, json.dumps(
+                published, separators=(",", ":"), ensure_ascii=False, default=str).encode('utf-8')))
+
+    def status(self):
+        return {'path': self.path, 'subscribers': [
+            {'topics': sorted(TOPIC_NAMES[topic] for topic in connection.topics),
+             'sent': connection.sent, 'dropped': connection.dropped,
+             'buffered': connection.transport.get_write_buffer_size()}
+            for connection in self.connections]}
+
+    def close(self):
+        """소켓 닫기 - 구독자 연결 종료 후 소켓 파일 삭제"""
+        if self.server is None:
+            return
+        server, self.server = self.server, None
+        if threading.get_ident() != self._loop_thread:
+            if not self._call_in_loop(self._close_server, server) and os.path.exists(self.path):
+                os.unlink(self.path)  # 루프가 닫혀 연결은 이미 끊김 - 소켓 파일만 정리
+        else:
+            self._close_server(server)
+
+    def _call_in_loop(self, callback, *args):
+        """다른 스레드에서 이벤트 루프로 넘김 → 루프가 이미 닫혔으면 False"""
+        if self._loop.is_closed():
+            return False
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:  # 확인한 직후 루프가 닫힘
+            return False
+        return True
+
+    def _close_server(self, server):
+        server.close()
+        for connection in list(self.connections):
+            if connection.unreported and not connection.transport.is_closing():
+                # 마지막으로 버린 수는 한도와 관계없이 알림
+                connection.transport.write(encode_json(TOPIC_CONTROL, {'type': 'dropped',
+                                                                       'count': connection.unreported}))
+                connection.unreported = 0
+            connection.transport.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        print(f"📡 IPC 발행 종료: {self.path}")
+
+
+class IpcSubscriber:
+    """IPC 구독 클라이언트 (블로킹 소켓) - for topic, message in subscriber: ...
+    message: 프레임이면 (타임스탬프, 프레임 키, 데이터), 그 외 dict. dropped 제어 메시지는 self.dropped에 누적"""
+
+    def __init__(self, path, topics=('row', 'event')):
+        self.path = path
+        self.topics = list(topics)
+        parse_topics(self.topics)
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self.file = self.socket.makefile('rb')
+        self.dropped = 0
+        self.socket.sendall(encode_json(TOPIC_CONTROL, {'type': 'subscribe', 'topics': self.topics}))
+
+    def read(self):
+        """다음 메시지 (topic, payload bytes) - 연결이 끊기면 None"""
+        header = self.file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return None
+        length, topic = HEADER.unpack(header)
+        payload = self.file.read(length - 1)
+        if len(payload) < length - 1:
+            return None
+        return topic, payload
+
+    def __iter__(self):
+        while True:
+            message = self.read()
+            if message is None:
+                return
+            topic, payload = message
+            decoded = decode(topic, payload)
+            if topic == TOPIC_CONTROL:
+                if decoded.get('type') == 'dropped':
+                    self.dropped += decoded['count']
+                elif decoded.get('type') == 'error':
+                    raise ValueError(decoded.get('message'))
+                continue
+            yield TOPIC_NAMES[topic], decoded
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+
+def publisher_from_env(spans=None, metrics=None):
+    """IPC_SOCKET=<소켓 경로> 이면 발행자 (없으면 None)"""
+    path = os.environ.get("IPC_SOCKET")
+    return IpcPublisher(path, spans, metrics) if path else None
@@ -0,0 +1,418 @@
+# parser/log_segments.py
+# 연속 CSV 로그 세그먼트 - 크기/시간 한도로 나눈 파일, 닫힌 세그먼트의 백그라운드 압축, 목록(manifest), 보존 정책
+#   기록 중인 세그먼트는 추가 전용 저널(<세그먼트>.csv.journal)에만 기록 - 행마다 OS까지 write,
+#   fsync는 LOG_FSYNC_INTERVAL초마다 (정전 시 유실은 그 구간 이내, 프로세스 강제 종료 시 유실 없음)
+#   헤더가 바뀌면 파일을 다시 쓰지 않고 "#" 헤더 레코드를 추가
+#   CsvLogSink가 세그먼트를 닫으면 SegmentStore.close_segment() → 작업 스레드가 저널을 CSV로 마감
+#   (임시 파일 → fsync → 교체, 모든 신호 컬럼을 한 헤더로) → .gz/.zst로 압축 후 원본 삭제
+#   → 보존 한도(총 크기/보관 일수)를 넘으면 오래된 세그먼트부터 삭제
+# 복구: SegmentStore.start() 가 이전 실행(정전/강제 종료)이 남긴 저널을 마감 (잘린 마지막 줄은 버림)
+# 목록: <디렉터리>/<prefix>_manifest.json (세그먼트마다 파일명, 행 수, 첫/마지막 Time, 압축 방식, 크기)
+# 읽기: open_log()는 확장자(.gz/.zst)를 보고 투명하게 압축을 풀어 읽음 (재생/업로드에서 사용)
+# 설정: config/capture.py (LOG_SEGMENT_*, LOG_COMPRESSION, LOG_RETENTION_*)
+
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+import queue
+import threading
+import time
+
+from config import capture as capture_config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 압축 방식 → 확장자
+COMPRESSED_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+FINISH_TIMEOUT = 3.0  # 종료 시 마지막 세그먼트 마감/압축을 기다리는 최대 시간 (초) - 못 끝내면 다음 실행 때
+JOURNAL_EXTENSION = '.journal'
+HEADER_MARK = '#'  # 저널의 헤더 레코드 (데이터 행은 Time 숫자로 시작)
+
+
+def split_compression(path):
+    """경로 → (압축 확장자를 뗀 경로, 압축 방식 또는 None)"""
+    for compression, extension in COMPRESSED_EXTENSIONS.items():
+        if path.lower().endswith(extension):
+            return path[:-len(extension)], compression
+    return path, None
+
+
+def open_log(path, mode='rt'):
+    """로그/캡처 파일 열기 - .gz/.zst는 압축을 풀며 읽음 (mode: 'rt' 또는 'rb')"""
+    _, compression = split_compression(path)
+    if compression == 'gzip':
+        return gzip.open(path, mode, encoding='utf-8', errors='ignore') if 't' in mode else gzip.open(path, mode)
+    if compression == 'zstd':
+        if zstandard is None:
+            raise RuntimeError(f"zstandard 모듈이 없어 읽을 수 없습니다: {path} (pip install zstandard)")
+        stream = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+        return io.TextIOWrapper(stream, encoding='utf-8', errors='ignore') if 't' in mode else stream
+    if 't' in mode:
+        return open(path, mode, encoding='utf-8', errors='ignore')
+    return open(path, mode)
+
+
+def decompress_bytes(name, data):
+    """업로드된 파일 내용 - 파일명이 .gz/.zst면 압축을 푼 내용"""
+    _, compression = split_compression(name)
+    if compression == 'gzip':
+        return gzip.decompress(data)
+    if compression == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstandard 모듈이 없어 .zst 파일을 읽을 수 없습니다 (pip install zstandard)")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+def resolve_compression(compression):
+    """설정된 압축 방식 → 실제로 사용할 방식 (zstandard 모듈이 없으면 gzip)"""
+    if compression == 'zstd' and zstandard is None:
+        print("💡 zstandard 모듈이 없어 gzip으로 압축합니다 (pip install zstandard)")
+        return 'gzip'
+    if compression not in (None, 'gzip', 'zstd'):
+        raise ValueError(f"알 수 없는 LOG_COMPRESSION: {compression} (gzip/zstd/None)")
+    return compression
+
+
+def fsync_directory(path):
+    """디렉터리 항목(새 파일, 이름 교체)까지 디스크에 기록"""
+    fd = os.open(path or '.', os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class SegmentJournal:
+    """기록 중인 세그먼트 1개의 추가 전용 저널 - append()는 OS까지 write, sync()는 fsync (다른 스레드에서 호출 가능)"""
+
+    def __init__(self, path, fsync_interval):
+        self.path = path
+        self.fsync_interval = fsync_interval  # 0이면 행마다 fsync
+        self.file = open(path, 'a', encoding='utf-8')
+        self.lock = threading.Lock()
+        self.unsynced = 0  # 아직 fsync하지 않은 레코드 수 (정전 시 유실될 수 있는 양)
+        self.synced_at = time.monotonic()
+        self.syncs = 0
+
+    def append(self, record):
+        with self.lock:
+            self.file.write(record + '\n')
+            self.file.flush()
+            self.unsynced += 1
+        if self.fsync_interval == 0:
+            self.sync()
+
+    def append_header(self, header):
+        """헤더 레코드 추가 → 기록한 바이트 수"""
+        record = HEADER_MARK + ','.join(header)
+        self.append(record)
+        return len(record) + 1
+
+    def sync(self):
+        """지금까지 추가한 레코드를 디스크까지 기록 - fsync 동안 append()를 막지 않도록 복제한 fd 사용"""
+        with self.lock:
+            if self.file is None or not self.unsynced:
+                self.synced_at = time.monotonic()
+                return
+            fd = os.dup(self.file.fileno())
+            count = self.unsynced
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        with self.lock:
+            self.unsynced -= count
+            self.synced_at = time.monotonic()
+            self.syncs += 1
+
+    def close(self):
+        with self.lock:
+            if self.file is None:
+                return
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.file.close()
+            self.file = None
+            self.unsynced = 0
+            self.syncs += 1
+
+    def status(self):
+        with self.lock:
+            return {'path': self.path, 'fsync_interval': self.fsync_interval, 'unsynced_records': self.unsynced,
+                    'seconds_since_fsync': round(time.monotonic() - self.synced_at, 3), 'fsyncs': self.syncs}
+
+
+def _journal_records(path):
+    """저널 → ('header', 컬럼 목록) 또는 ('row', 값 목록) - 끝이 잘린 마지막 줄(기록 중 정전)은 버림"""
+    header = None
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            if not line.endswith('\n'):
+                return
+            line = line[:-1]
+            if line.startswith(HEADER_MARK):
+                header = line[len(HEADER_MARK):].split(',')
+                yield 'header', header
+                continue
+            parts = line.split(',')
+            if header is None or len(parts) < len(header):
+                continue  # 헤더 없는 행/잘린 행
+            # trigger("SB_on, PM_off")에 쉼표가 있으면 나머지를 마지막 컬럼으로 합침
+            yield 'row', dict(zip(header, parts[:len(header) - 1] + [','.join(parts[len(header) - 1:])]))
+
+
+def finalize_journal(journal_path, target_path):
+    """저널 → CSV (모든 신호 컬럼을 처음 나타난 순서로 한 헤더에) - 임시 파일 → fsync → 교체 후 저널 삭제
+    → (행 수, 첫 Time, 마지막 Time)"""
+    columns = {}
+    for kind, values in _journal_records(journal_path):
+        if kind == 'header':
+            columns.update(dict.fromkeys(values[1:-2]))
+    header = ['Time'] + list(columns) + ['event', 'trigger']
+
+    rows, first_time, last_time = 0, None, None
+    temp = target_path + ".tmp"
+    with open(temp, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(header)
+        for kind, row in _journal_records(journal_path):
+            if kind != 'row':
+                continue
+            writer.writerow([row.get(key, '') for key in header])
+            rows += 1
+            if first_time is None:
+                first_time = float(row['Time'])
+            last_time = float(row['Time'])
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, target_path)
+    fsync_directory(os.path.dirname(target_path))
+    os.remove(journal_path)
+    return rows, first_time, last_time
+
+
+def _compress_file(source, target, compression):
+    temp = target + ".tmp"
+    with open(source, 'rb') as src, open(temp, 'wb') as dst:
+        if compression == 'zstd':
+            with zstandard.ZstdCompressor(level=6).stream_writer(dst, closefd=False) as writer:
+                while chunk := src.read(1024 * 1024):
+                    writer.write(chunk)
+        else:
+            with gzip.GzipFile(fileobj=dst, mode='wb', compresslevel=6) as writer:
+                while chunk := src.read(1024 * 1024):
+                    writer.write(chunk)
+        dst.flush()
+        os.fsync(dst.fileno())
+    os.replace(temp, target)
+
+
+class SegmentStore:
+    """한 prefix(예: realtime_log)의 세그먼트 목록 + 마감/압축 스레드 + 보존 정책"""
+
+    def __init__(self, directory, prefix, compression=None, max_bytes=None, max_days=None):
+        self.directory = directory
+        self.prefix = prefix
+        self.compression = resolve_compression(
+            capture_config.LOG_COMPRESSION if compression is None else compression or None)
+        self.max_bytes = capture_config.LOG_RETENTION_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_days = capture_config.LOG_RETENTION_MAX_DAYS if max_days is None else max_days
+        self.manifest_path = os.path.join(directory, f"{prefix}_manifest.json")
+        self.lock = threading.Lock()
+        self.tasks = queue.Queue()
+        self.worker = None
+        self.current = None  # 지금 기록 중인 세그먼트 파일명 (복구 대상에서 제외)
+        self.segments = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.manifest_path):
+            return []
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f).get('segments', [])
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 세그먼트 목록을 읽지 못했습니다 ({self.manifest_path}): {e}")
+            return []
+
+    def _save(self):
+        """목록 저장 (임시 파일 → 교체, lock 안에서 호출)"""
+        os.makedirs(self.directory, exist_ok=True)
+        temp = self.manifest_path + ".tmp"
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump({'prefix': self.prefix, 'compression': self.compression, 'segments': self.segments},
+                      f, ensure_ascii=False, indent=1)
+        os.replace(temp, self.manifest_path)
+
+    def start(self):
+        """작업 스레드 시작 + 복구 - 이전 실행(정전/강제 종료 포함)이 남긴 저널 마감, 압축하지 못한 세그먼트 압축
+        (새 세그먼트를 열기 전에 호출)"""
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = threading.Thread(target=self._run, name="log-segments", daemon=True)
+            self.worker.start()
+        with self.lock:
+            self._adopt_orphan_journals()
+            recovered = 0
+            for segment in self.segments:
+                if segment['file'] == self.current:
+                    continue  # 이 실행이 기록 중인 세그먼트 - 저널을 마감하면 이후 행이 유실됨
+                if segment.get('closed_at') is None:
+                    # 이전 실행이 닫지 못한 세그먼트
+                    segment['closed_at'] = (segment.get('opened_at') or
+                                            datetime.datetime.now().isoformat(timespec='seconds'))
+                if os.path.exists(self._path(segment) + JOURNAL_EXTENSION):
+                    recovered += 1
+                    self.tasks.put(segment['file'])
+                elif self.compression and not segment.get('compression') and os.path.exists(self._path(segment)):
+                    self.tasks.put(segment['file'])
+            if self.segments:
+                self._save()
+        if recovered:
+            print(f"♻️ 이전 실행이 남긴 로그 저널 {recovered}개 복구 중 ({self.directory})")
+
+    def _adopt_orphan_journals(self):
+        """목록에 없는 저널(목록 저장 전에 중단) → 목록에 추가 (lock 안에서 호출)"""
+        if not os.path.isdir(self.directory):
+            return
+        known = {segment['file'] for segment in self.segments}
+        for name in sorted(os.listdir(self.directory)):
+            if not (name.startswith(self.prefix + '_') and name.endswith('.csv' + JOURNAL_EXTENSION)):
+                continue
+            name = name[:-len(JOURNAL_EXTENSION)]
+            if name not in known:
+                self.segments.append({'file': name, 'session': None, 'index': None, 'opened_at': None,
+                                      'closed_at': None, 'rows': 0, 'first_time': None, 'last_time': None,
+                                      'bytes': 0, 'compression': None})
+
+    def _path(self, segment):
+        return os.path.join(self.directory, segment['file'])
+
+    def journal_path(self, path):
+        """세그먼트 CSV 경로 → 기록 중에 쓰는 저널 경로"""
+        return path + JOURNAL_EXTENSION
+
+    def _find(self, name):
+        return next((segment for segment in self.segments if segment['file'] == name), None)
+
+    def open_segment(self, path, session, index):
+        with self.lock:
+            self.current = os.path.basename(path)
+            self.segments.append({'file': os.path.basename(path), 'session': session, 'index': index,
+                                  'opened_at': datetime.datetime.now().isoformat(timespec='seconds'),
+                                  'closed_at': None, 'rows': 0, 'first_time': None, 'last_time': None,
+                                  'bytes': 0, 'compression': None})
+            self._save()
+
+    def close_segment(self, path, rows, first_time, last_time):
+        """세그먼트 닫힘(저널 fsync 완료) → 목록 갱신, 마감/압축을 작업 스레드에 맡김 (호출한 쪽은 기다리지 않음)"""
+        name = os.path.basename(path)
+        with self.lock:
+            if self.current == name:
+                self.current = None
+            segment = self._find(name)
+            if segment is None:
+                return
+            segment.update({'closed_at': datetime.datetime.now().isoformat(timespec='seconds'),
+                            'rows': rows, 'first_time': first_time, 'last_time': last_time,
+                            'bytes': os.path.getsize(self.journal_path(path))
+                            if os.path.exists(self.journal_path(path)) else 0})
+            self._save()
+        self.tasks.put(name)
+
+    def finish(self, timeout=FINISH_TIMEOUT):
+        """남은 마감/압축 작업을 timeout초까지 기다림 → 못 끝낸 작업 수 (다음 실행 때 이어서 처리)"""
+        deadline = time.monotonic() + timeout
+        while self.tasks.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.tasks.unfinished_tasks
+
+    def _run(self):
+        while True:
+            name = self.tasks.get()
+            try:
+                self._finalize(name)
+                self._compress(name)
+                self._apply_retention()
+            except Exception as e:
+                print(f"⚠️ 로그 세그먼트 처리 실패 ({name}): {e}")
+            finally:
+                self.tasks.task_done()
+
+    def _finalize(self, name):
+        """닫힌 세그먼트의 저널 → CSV (마감 전에 중단되면 저널이 남아 다음 start()에서 다시 마감)"""
+        path = os.path.join(self.directory, name)
+        journal = self.journal_path(path)
+        with self.lock:
+            segment = self._find(name)
+            if segment is None or segment.get('closed_at') is None or not os.path.exists(journal):
+                return
+        rows, first_time, last_time = finalize_journal(journal, path)
+        with self.lock:
+            segment.update({'rows': rows, 'first_time': first_time, 'last_time': last_time,
+                            'bytes': os.path.getsize(path)})
+            self._save()
+
+    def _compress(self, name):
+        with self.lock:
+            segment = self._find(name)
+            if (not self.compression or segment is None or segment.get('compression')
+                    or segment.get('closed_at') is None):
+                return
+        source = os.path.join(self.directory, name)
+        if not os.path.exists(source):
+            return
+        compression = self.compression
+        target = source + COMPRESSED_EXTENSIONS[compression]
+        started = time.perf_counter()
+        _compress_file(source, target, compression)
+        original = os.path.getsize(source)
+        os.remove(source)
+        with self.lock:
+            segment.update({'file': os.path.basename(target), 'compression': compression,
+                            'original_bytes': original, 'bytes': os.path.getsize(target)})
+            self._save()
+        print(f"🗜️ 로그 세그먼트 압축: {os.path.basename(target)} ({original / 1024:.0f}KB → "
+              f"{segment['bytes'] / 1024:.0f}KB, {time.perf_counter() - started:.2f}초)")
+
+    def _apply_retention(self):
+        """보존 한도를 넘으면 닫힌 세그먼트를 오래된 것부터 삭제 (열려 있는 세그먼트는 제외)"""
+        if not self.max_bytes and not self.max_days:
+            return
+        with self.lock:
+            closed = [segment for segment in self.segments if segment.get('closed_at')]
+            total = sum(segment.get('bytes', 0) for segment in self.segments)
+            oldest_allowed = None
+            if self.max_days:
+                oldest_allowed = (datetime.datetime.now() -
+                                  datetime.timedelta(days=self.max_days)).isoformat(timespec='seconds')
+            removed = []
+            for segment in closed:  # 목록은 연 순서 = 오래된 순
+                too_big = self.max_bytes and total > self.max_bytes
+                too_old = oldest_allowed and segment['closed_at'] < oldest_allowed
+                if not too_big and not too_old:
+                    continue
+                path = self._path(segment)
+                for leftover in (path, self.journal_path(path)):
+                    if os.path.exists(leftover):
+                        os.remove(leftover)
+                total -= segment.get('bytes', 0)
+                removed.append(segment)
+            if removed:
+                self.segments = [segment for segment in self.segments if segment not in removed]
+                self._save()
+        for segment in removed:
+            print(f"🧹 보존 한도 초과로 로그 세그먼트 삭제: {segment['file']}")
+
+    def status(self):
+        with self.lock:
+            return {'manifest': self.manifest_path, 'compression': self.compression,
+                    'retention': {'max_bytes': self.max_bytes, 'max_days': self.max_days},
+                    'total_bytes': sum(segment.get('bytes', 0) for segment in self.segments),
+                    'pending_compression': self.tasks.unfinished_tasks,
+                    'segments': [dict(segment) for segment in self.segments]}
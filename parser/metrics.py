@@ -0,0 +1,174 @@
+# parser/metrics.py
+# 실시간 경로 계측 - 카운터/히스토그램/게이지를 Prometheus 텍스트 형식으로 노출
+# 환경변수 MONITOR_METRICS=0 이면 비활성화 (set_enabled로 실행 중 전환 가능)
+
+import bisect
+import os
+import time
+from collections import defaultdict
+
+from parser.can_decoder import split_key
+
+# 단계별 처리 시간 버킷 (초)
+STAGE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+                 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+# 0xEA 틱 간격 버킷 (초) - 정상은 0.1초 부근
+TICK_INTERVAL_BUCKETS = (0.02, 0.05, 0.08, 0.09, 0.095, 0.1, 0.105, 0.11,
+                         0.12, 0.15, 0.2, 0.5, 1.0)
+
+COUNTER_HELP = {
+    'can_frames_read_total': "수신한 CAN FD RX 라인 수",
+    'can_frames_unparsed_total': "ID를 해석하지 못한 라인 수",
+    'can_frames_decoded_total': "DBC 디코딩 성공 프레임 수",
+    'can_frames_failed_total': "DBC 디코딩 실패 프레임 수",
+    'can_frames_deduplicated_total': "직전과 같아서 무시된 프레임 수",
+    'monitor_ticks_total': "처리된 시간대(틱) 수",
+    'monitor_tick_gaps_total': "간격이 너무 길어 잘라낸 틱 수 (프레임 누락/수신 중단)",
+    'monitor_errors_total': "모니터 루프에서 발생한 예외 수",
+    'websocket_messages_total': "대시보드 websocket으로 보낸 행 메시지 수",
+    'websocket_bytes_total': "대시보드 websocket으로 보낸 행 메시지 바이트 수 (UTF-8)",
+    'ipc_messages_total': "IPC 구독자에게 보낸 메시지 수 (구독자별)",
+    'ipc_messages_dropped_total': "송신 버퍼가 가득 차 버린 IPC 메시지 수 (느린 구독자)",
+}
+
+
+def id_labels(key):
+    """프레임 키 → Prometheus 라벨 (채널 0이 아니면 bus 라벨 추가)"""
+    bus, can_id = split_key(key)
+    if bus:
+        return f'bus="{bus}",can_id="0x{can_id:X}"'
+    return f'can_id="0x{can_id:X}"'
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (관측 1회 = bisect 1회)"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def render(self, name, labels=''):
+        lines = []
+        cumulative = 0
+        sep = ',' if labels else ''
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        suffix = f'{{{labels}}}' if labels else ''
+        lines.append(f'{name}_sum{suffix} {self.sum}')
+        lines.append(f'{name}_count{suffix} {self.count}')
+        return lines
+
+
+class Metrics:
+    """MonitorCore 계측 값 모음"""
+
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = os.environ.get('MONITOR_METRICS', '1') != '0'
+        self.enabled = enabled
+        self.gauges = {}  # 이름 → 값을 반환하는 함수 (수집 시점에 호출)
+        self.reset()
+
+    def reset(self):
+        self.counters = defaultdict(int)
+        self.labeled = defaultdict(lambda: defaultdict(int))  # 이름 → CAN ID → 값
+        self.stages = {}
+        self.tick_interval = Histogram(TICK_INTERVAL_BUCKETS)
+        self.tick_jitter_max = 0.0
+        self.last_tick_at = None
+        self.started_at = time.time()
+
+    def set_enabled(self, enabled):
+        self.enabled = bool(enabled)
+
+    def inc(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] += amount
+
+    def inc_id(self, name, can_id):
+        if self.enabled:
+            self.labeled[name][can_id] += 1
+
+    def observe_stage(self, stage, seconds):
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = Histogram(STAGE_BUCKETS)
+        histogram.observe(seconds)
+
+    def observe_tick(self, timestamp=None, expected_interval=0.1):
+        """시간 기준 프레임(0xEA) 수신 간격과 기대 간격의 차이(지터) 기록
+        timestamp: 프레임 수신 시각 (없으면 처리 시점의 시각 사용)"""
+        if not self.enabled:
+            return
+        now = time.perf_counter() if timestamp is None else timestamp
+        if self.last_tick_at is not None:
+            interval = now - self.last_tick_at
+            self.tick_interval.observe(interval)
+            jitter = abs(interval - expected_interval)
+            if jitter > self.tick_jitter_max:
+                self.tick_jitter_max = jitter
+        self.last_tick_at = now
+
+    def register_gauge(self, name, func):
+        self.gauges[name] = func
+
+    def render_prometheus(self):
+        """Prometheus 텍스트 형식 (/metrics 응답)"""
+        lines = [f'monitor_metrics_enabled {int(self.enabled)}']
+        for name, help_text in COUNTER_HELP.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            if name in self.labeled:
+                for can_id, value in sorted(self.labeled[name].items()):
+                    lines.append(f'{name}{{{id_labels(can_id)}}} {value}')
+            else:
+                lines.append(f'{name} {self.counters.get(name, 0)}')
+
+        lines.append('# TYPE monitor_stage_seconds histogram')
+        for stage, histogram in self.stages.items():
+            lines.extend(histogram.render('monitor_stage_seconds', f'stage="{stage}"'))
+        lines.append('# TYPE monitor_tick_interval_seconds histogram')
+        lines.extend(self.tick_interval.render('monitor_tick_interval_seconds'))
+        lines.append('# TYPE monitor_tick_jitter_max_seconds gauge')
+        lines.append(f'monitor_tick_jitter_max_seconds {self.tick_jitter_max}')
+
+        for name, func in self.gauges.items():
+            try:
+                value = func()
+            except Exception:
+                continue
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def summary_line(self):
+        """헤드리스 모드 주기 로그용 한 줄 요약"""
+        read = self.counters.get('can_frames_read_total', 0)
+        decoded = sum(self.labeled['can_frames_decoded_total'].values())
+        failed = sum(self.labeled['can_frames_failed_total'].values())
+        dedup = sum(self.labeled['can_frames_deduplicated_total'].values())
+        ticks = self.counters.get('monitor_ticks_total', 0)
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        parts = [f"read={read} ({read / elapsed:.0f}/s)", f"decoded={decoded}", f"failed={failed}",
+                 f"dedup={dedup}", f"ticks={ticks}", f"jitter_max={self.tick_jitter_max * 1000:.1f}ms"]
+        for stage, histogram in self.stages.items():
+            if histogram.count:
+                parts.append(f"{stage}={histogram.sum / histogram.count * 1e6:.0f}us")
+        for name, func in self.gauges.items():
+            try:
+                parts.append(f"{name}={func()}")
+            except Exception:
+                pass
+        return "📊 " + ' '.join(parts)
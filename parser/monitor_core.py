@@ -1,220 +1,70 @@
 # parser/monitor_core.py
 
-import asyncio
-import signal
-import sys
-import os
-import datetime
-import threading
 import time
-from collections import defaultdict
-from parser.can_decoder import decode_line
-from parser.log_buffer import LogBuffer
-from event_logic.event_detector import process_data
-
-class MonitorCore:
-    def __init__(self):
-        self.log_buffer = LogBuffer()
-        self.running = False
-        self.time_counter = 0  # 시간 카운터 추가
-        self.current_time_data = {}
-        self.last_seen_ids = {}  # 각 ID별로 마지막에 본 데이터를 저장
-        self.last_ea_data = None  # 마지막 0xEA 데이터 저장 (연속 체크용)
-        
-        # CSV 저장 관련 변수들
-        self.csv_save_timer = None  # CSV 저장 타이머
-        self.csv_filename = None  # CSV 파일명
-        self.csv_data_buffer = []  # CSV 데이터 버퍼
-        self.csv_save_lock = threading.Lock()  # CSV 저장용 락
-        self.logging_start_time = None  # 로깅 시작 시간
-        
-        # 실시간 그래프용 메모리 저장
-        self.latest_data_for_dashboard = None  # 대시보드용 최신 데이터
-        self.dashboard_data_lock = threading.Lock()  # 대시보드 데이터용 락
-        
-        # 시그널 핸들러 설정
-        signal.signal(signal.SIGINT, self.signal_handler)
-        signal.signal(signal.SIGTERM, self.signal_handler)
-
-    def signal_handler(self, signum, frame):
-        """시그널 핸들러 - 안전한 종료"""
-        print(f"\n🛑 종료 신호 수신 (시그널: {signum})")
-        print("📊 데이터 저장 중...")
-        self.running = False
-        
-        # CSV 최종 저장
-        if self.csv_data_buffer:
-            self.stop_csv_logging() # 기존 함수 사용
-            print(f"💾 최종 CSV 저장 완료: {self.csv_filename}")
-        
-        print("✅ 프로그램 안전 종료 완료")
-        sys.exit(0)
-
-    def extract_can_id(self, line):
-        """CAN 라인에서 ID를 추출"""
-        try:
-            if line.startswith("CAN FD RX: "):
-                line = line[11:]  # "CAN FD RX: " 제거
-            
-            # ID 부분 추출
-            id_part = line.split(',')[0]  # "ID=0xEA"
-            msg_id = int(id_part.split('=')[1], 16)
-            return msg_id
-        except:
-            return None
-
-    def process_ea_signal(self, decoded_data):
-        """0xEA 신호 처리 - 시간 증가 및 이벤트 감지"""
-        # 연속된 0xEA 신호 체크
-        current_ea_data = str(decoded_data)
-        if self.last_ea_data == current_ea_data:
-            return False  # 연속된 신호는 무시
-        
-        self.last_ea_data = current_ea_data
-        
-        # 이전 시간대 데이터가 있으면 처리
-        if self.current_time_data:
-            # 이벤트 감지
-            processed = process_data(self.current_time_data)
-            self.log_buffer.add(processed)
-            
-            # 대시보드용 메모리에 최신 데이터 저장 (빠른 접근용)
-            with self.dashboard_data_lock:
-                self.latest_data_for_dashboard = processed.copy()
-            
-            # CSV 버퍼에 추가
-            self.add_to_csv_buffer(processed)
-            
-            # Time 기준으로 0.1초마다 CSV 저장
-            self.save_csv_by_time()
-            
-            # 이벤트 정보 추출
-            event = processed.get('event', 'none')
-            trigger = processed.get('trigger', 'none')
-            
-            # 이벤트가 감지되었을 때 터미널에 알림 출력
-            if event != 'none':
-                # _on 접미사 제거
-                event_name = event.replace('_on', '')
-                print(f"🚨 이벤트 감지! 시간: {self.time_counter * 0.1:.1f}s, 이벤트: {event_name}")
-        
-        self.time_counter += 1
-        # 새로운 시간대 시작 (이전 데이터 복사)
-        if self.log_buffer.buffer:
-            self.current_time_data = self.log_buffer.buffer[-1].copy()
-        else:
-            self.current_time_data = {}
-        self.current_time_data['Time'] = round(self.time_counter * 0.1, 1)
-        self.current_time_data['event'] = 'none'
-        
-        return True  # 새로운 0xEA 신호 처리됨
-
-    def update_csv_header(self, sample_row):
-        """실제 데이터에 따라 CSV 헤더 동적 업데이트"""
-        if not self.csv_filename:
-            return
-            
-        # 현재 파일의 모든 데이터를 읽기
-        with open(self.csv_filename, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        if not lines:
-            return
-            
-        # 실제 데이터에 있는 모든 키를 순서대로 헤더 생성
-        header_parts = ['Time']  # Time은 항상 첫 번째
-        
-        # Time, event, trigger를 제외한 모든 신호를 순서대로 추가
-        for key in sample_row.keys():
-            if key not in ['Time', 'event', 'trigger']:
-                header_parts.append(key)
-        
-        # event와 trigger는 항상 마지막
-        header_parts.extend(['event', 'trigger'])
-        
-        # 새로운 헤더 생성
-        new_header = ','.join(header_parts) + '\n'
-        
-        # 기존 데이터를 새로운 컬럼 구조에 맞게 조정
-        adjusted_lines = [new_header]  # 새로운 헤더로 시작
-        
-        for i, line in enumerate(lines[1:], 1):  # 헤더 제외하고 처리
-            if line.strip():
-                # 기존 데이터를 파싱
-                old_parts = line.strip().split(',')
-                old_data = {}
-                
-                # 기존 헤더와 매칭
-                if len(lines) > 0:
-                    old_header = lines[0].strip().split(',')
-                    for j, key in enumerate(old_header):
-                        if j < len(old_parts):
-                            old_data[key] = old_parts[j]
-                
-                # 새로운 컬럼 순서에 맞게 데이터 재구성
-                new_parts = []
-                for key in header_parts:
-                    if key in old_data:
-                        new_parts.append(old_data[key])
-                    else:
-                        # 없는 컬럼은 빈 값으로 채움
-                        new_parts.append('')
-                
-                adjusted_lines.append(','.join(new_parts) + '\n')
-        
-        # 파일 다시 쓰기
-        with open(self.csv_filename, 'w', encoding='utf-8') as f:
-            f.writelines(adjusted_lines)
-        
-
-
-    def add_can_data(self, can_id, decoded_data):
-        """CAN 데이터를 현재 시간대에 추가 - 모든 해석된 데이터 저장"""
-        # 연속된 신호 체크 (같은 ID의 데이터가 이전과 동일하면 무시)
-        data_key = str(decoded_data)
-        if can_id in self.last_seen_ids and self.last_seen_ids[can_id] == data_key:
-            return False  # 연속된 신호는 무시
-        
-        self.last_seen_ids[can_id] = data_key
-        
-        # 현재 시간대 데이터에 모든 해석된 데이터 추가
-        new_columns_added = False
-        for key, value in decoded_data.items():
-            # 새로운 신호가 들어오면 알림 (값 설정 전에 체크)
-            if key not in self.current_time_data:
-                new_columns_added = True
-            
-            try:
-                # 숫자로 변환 가능하면 숫자로, 아니면 문자열로 저장
-                if isinstance(value, (int, float)):
-                    self.current_time_data[key] = value
-                else:
-                    # 문자열을 숫자로 변환 시도
-                    try:
-                        self.current_time_data[key] = float(value)
-                    except (ValueError, TypeError):
-                        self.current_time_data[key] = value
-            except (ValueError, TypeError):
-                self.current_time_data[key] = value
-        
-        # 새로운 컬럼이 추가되면 CSV 헤더 업데이트
-        if new_columns_added:
-            self.update_csv_header(self.current_time_data)
-        
-        return True  # 새로운 데이터 추가됨
+from parser.pipeline import (StreamEngine, SerialSource, CsvLogSink, LatestRowSink,
+                             EventPrintSink, ReplaySource, open_source)
+from parser.event_spans import EventSpanSink
+from parser import shm_bus, ipc_bus
+from parser.trigger_capture import TriggerCaptureSink, log_mode
+from event_logic.event_detector import derived
+
+class MonitorCore(StreamEngine):
+    """실시간 모니터 - 시리얼 소스 + 로그 CSV/대시보드/터미널 알림 싱크를 붙인 StreamEngine"""
+
+    def __init__(self, tick_source=None):
+        """tick_source: 시간대 분할 기준 (None이면 config/tick.py, 환경변수 TICK_SOURCE)"""
+        # CSV 저장 / 실시간 그래프용 메모리 저장 / 이벤트 구간 누적 / (이벤트 구간 캡처) / (공유 메모리 버스)
+        # / (IPC 발행) / 이벤트 알림
+        self.csv_sink = CsvLogSink()
+        self.dashboard_sink = LatestRowSink()
+        self.span_sink = EventSpanSink()
+        # LOG_MODE=trigger/both (config/capture.py) 이면 이벤트 전후 구간만 이벤트 파일로 저장
+        self.log_mode = log_mode()
+        self.capture_sink = TriggerCaptureSink() if self.log_mode != 'continuous' else None
+        # SHM_BUS=<이름> 이면 다른 프로세스(웹 서버, 로거, 분석)용 공유 메모리 버스에도 발행
+        self.bus_sink = shm_bus.sink_from_env()
+        sinks = [self.csv_sink, self.dashboard_sink, self.span_sink]
+        sinks += [sink for sink in (self.capture_sink, self.bus_sink) if sink]
+        frame_sinks = [self.capture_sink] if self.capture_sink and self.capture_sink.raw_frames else []
+        super().__init__(tick_source, sinks=sinks + [EventPrintSink()], frame_sinks=frame_sinks)
+        # IPC_SOCKET=<경로> 이면 원본 프레임/행/이벤트 구간을 Unix 소켓으로 발행 (start_ipc()로 소켓 열기)
+        self.ipc = ipc_bus.publisher_from_env(self.span_sink, self.metrics)
+        if self.ipc:
+            self.sinks.insert(-1, self.ipc)
+            self.frame_sinks.append(self.ipc)
+            self.metrics.register_gauge('ipc_subscribers', lambda: len(self.ipc.connections))
+        self.replay_source = None
+
+        # 계측 (프레임/디코딩/중복 카운터, 단계별 지연, 틱 지터, 버퍼 크기)
+        self.metrics.register_gauge('monitor_csv_unsynced_rows', self.csv_sink.pending)
+        self.metrics.register_gauge('monitor_log_buffer_rows', lambda: len(self.log_buffer.buffer))
+
+        # 시그널 처리는 실행하는 쪽(entry.py, uvicorn)에서 parser/shutdown.py로 설정
+
+    @property
+    def csv_filename(self):
+        return self.csv_sink.filename
+
+    def reset(self):
+        super().reset()
+        # 새 주행 데이터 - 이전 이벤트 구간은 시간축이 달라지므로 삭제
+        self.span_sink.reset()
+        # 재생 데이터는 닫힌 로그 세션에 속하지 않음 (유실로 세지 않음)
+        self.csv_sink.session_closed = False
+
+    async def start_ipc(self):
+        """IPC 발행 소켓 열기 (IPC_SOCKET이 없으면 아무것도 하지 않음) - 이벤트 루프에서 호출"""
+        if self.ipc:
+            await self.ipc.start()
 
     def compute_speed(self, row):
-        keys = ['WHEEL_SPEED_1', 'WHEEL_SPEED_2', 'WHEEL_SPEED_3', 'WHEEL_SPEED_4']
-        if all(k in row for k in keys):
-            row['SPEED'] = sum(row[k] for k in keys) / 4
-        else:
-            row['SPEED'] = 0
-        return row
+        # SPEED 등 파생 신호는 config/signals.py의 DERIVED_SIGNALS 정의로 계산
+        return derived.update(row)
 
     def clean_row(self, row):
         # 필요한 신호들만 추출하고 정리
         cleaned = {}
-        for key in ['ACCELERATOR_PEDAL_PRESSED', 'BRAKE_PRESSED', 'BRAKE_PRESSURE', 
+        for key in ['ACCELERATOR_PEDAL_PRESSED', 'BRAKE_PRESSED', 'BRAKE_PRESSURE',
                    'STEERING_ANGLE_2', 'STEERING_RATE', 'STEERING_COL_TORQUE',
                    'WHEEL_SPEED_1', 'WHEEL_SPEED_2', 'WHEEL_SPEED_3', 'WHEEL_SPEED_4', 'SPEED']:
             if key in row:
@@ -222,153 +72,68 @@ class MonitorCore:
         return cleaned
 
     def start_csv_logging(self):
-        """CSV 로깅 시작 - 동적 컬럼 처리"""
-        self.logging_start_time = datetime.datetime.now()
-        timestamp = self.logging_start_time.strftime("%Y%m%d_%H%M%S")
-        self.csv_filename = f"logs/realtime_log_{timestamp}.csv"
-        
-        # logs 디렉토리 생성
-        os.makedirs("logs", exist_ok=True)
-        
-        # 초기 CSV 헤더 작성 (Time, event, trigger만)
-        header = "Time,event,trigger\n"
-        
-        with open(self.csv_filename, 'w', encoding='utf-8') as f:
-            f.write(header)
-        
-        print(f"📁 CSV 로깅 시작: {self.csv_filename}")
-
-    def add_to_csv_buffer(self, row):
-        """CSV 버퍼에 데이터 추가 - 실제 들어오는 모든 신호를 동적으로 저장"""
-        if not self.csv_filename:
-            return
-            
-        # 실제 데이터에 있는 모든 키를 동적으로 처리
-        csv_parts = []
-        
-        # Time 컬럼 (항상 첫 번째)
-        csv_parts.append(f"{row.get('Time', 0):.1f}")
-        
-        # Time, event, trigger를 제외한 모든 신호 데이터를 순서대로 추가
-        for key, value in row.items():
-            if key in ['Time', 'event', 'trigger']:
-                continue
-            if isinstance(value, (int, float)):
-                csv_parts.append(str(value))
-            else:
-                csv_parts.append(str(value))
-        
-        # event와 trigger 컬럼 (항상 마지막)
-        csv_parts.append(row.get('event', 'none'))
-        csv_parts.append(row.get('trigger', 'none'))
-        
-        # CSV 라인 생성
-        csv_line = ','.join(csv_parts)
-        
-        with self.csv_save_lock:
-            self.csv_data_buffer.append(csv_line)
-
-    def save_csv_by_time(self):
-        """Time 기준으로 0.1초마다 CSV 저장"""
-        if not self.csv_filename or not self.csv_data_buffer:
+        """CSV 로깅 시작 - 동적 컬럼 처리 (LOG_MODE=trigger면 연속 CSV 없이 이벤트 구간만 저장)"""
+        if self.log_mode == 'trigger':
+            print(f"🎯 트리거 캡처 모드: 이벤트 전후 구간만 저장 ({self.capture_sink.directory})")
             return
-            
-        with self.csv_save_lock:
-            # 버퍼의 데이터를 CSV에 추가
-            with open(self.csv_filename, 'a', encoding='utf-8') as f:
-                for row_data in self.csv_data_buffer:
-                    f.write(row_data + '\n')
-            
-
-            self.csv_data_buffer.clear()
+        self.csv_sink.open()
 
     def stop_csv_logging(self):
-        """CSV 로깅 종료 및 최종 저장"""
-        if not self.csv_filename:
-            return
-            
-        # 남은 버퍼 데이터 저장
-        with self.csv_save_lock:
-            if self.csv_data_buffer:
-                with open(self.csv_filename, 'a', encoding='utf-8') as f:
-                    for row_data in self.csv_data_buffer:
-                        f.write(row_data + '\n')
-                
-
-                self.csv_data_buffer.clear()
-        
-        # 로깅 시간 계산
-        if self.logging_start_time:
-            duration = (datetime.datetime.now() - self.logging_start_time).total_seconds()
-            print(f"📁 저장된 파일: {self.csv_filename}")
+        """CSV 로깅 종료 및 최종 저장 - 닫히지 않은 마지막 시간대를 먼저 처리 (진행 중인 이벤트 구간 캡처도 여기까지 저장)
+        수신 작업이 끝난 뒤 호출 (종료 시에는 ShutdownCoordinator가 같은 순서로 flush → 싱크 close)"""
+        self.flush()
+        self.csv_sink.close()
+        if self.capture_sink:
+            self.capture_sink.close()
 
     def get_latest_data_for_dashboard(self):
         """대시보드용 최신 데이터 반환 (메모리에서 빠르게 접근)"""
-        with self.dashboard_data_lock:
-            if self.latest_data_for_dashboard:
-                return self.latest_data_for_dashboard.copy()
-        
+        latest = self.dashboard_sink.get()
+        if latest:
+            return latest
+
         # 메모리에 없으면 log_buffer에서 확인
         if self.log_buffer.buffer:
             return self.log_buffer.buffer[-1].copy()
-        
+
         # 또는 현재 시간대 데이터 확인
         elif self.current_time_data and self.current_time_data.get('Time'):
             return self.current_time_data.copy()
-        
+
         return None
 
     async def start(self, serial):
         self.running = True
-        
+
         # CSV 로깅 시작
         self.start_csv_logging()
-        
-        while self.running:
-            try:
-                # 비동기로 시리얼 읽기
-                line = await asyncio.get_event_loop().run_in_executor(
-                    None, serial.readline
-                )
-                
-                # UTF-8 디코딩 오류 처리
-                try:
-                    line = line.decode('utf-8', errors='ignore').strip()
-                except (UnicodeDecodeError, AttributeError):
-                    # 바이너리 데이터나 None인 경우 건너뛰기
-                    continue
-                
-                if line and 'CAN FD RX:' in line:
-                    # CAN ID 추출
-                    can_id = self.extract_can_id(line)
-                    if can_id is None:
-                        continue
-                    
-                    # CAN 디코딩
-                    decoded = decode_line(line)
-                    if not decoded:
-                        continue
-                    
-                    # 0xEA 신호 처리
-                    if can_id == 0xEA:
-                        self.process_ea_signal(decoded)
-                    else:
-                        # 다른 CAN ID 데이터 추가
-                        self.add_can_data(can_id, decoded)
-                        
-                # CPU 사용량을 줄이기 위해 짧은 대기
-                await asyncio.sleep(0.001)
-                        
-            except Exception as e:
-                print(f"Monitor error: {e}")
-                # 오류가 발생해도 계속 실행
-                await asyncio.sleep(0.1)
-                continue
-        
-        # CSV 로깅 종료
-        self.stop_csv_logging()
+
+        source = SerialSource(serial)
+        await source.feed(self)
+
+        # 종료 요청 전에 이미 도착한 라인까지 처리 - 마지막 시간대 처리와 CSV 종료는 호출한 쪽에서
+        # (ShutdownCoordinator: flush → 싱크 close, /stop_logging: stop_csv_logging)
+        source.drain(self)
         serial.close()
 
+    def open_replay(self, path, speed=1.0):
+        """녹화 파일(.txt/.cap 원본 캡처 또는 CSV) 재생 준비 - replay()로 실행"""
+        self.replay_source = ReplaySource(open_source(path), speed)
+        return self.replay_source
+
+    async def replay(self):
+        """open_replay로 준비한 파일을 실시간과 같은 경로(틱/탐지/싱크)로 재생"""
+        source = self.replay_source
+        self.reset()
+        self.running = True
+        started = time.perf_counter()
+        print(f"▶️ 재생 시작: {source.source.path} (배속 {source.speed:g})")
+        try:
+            await source.feed(self)
+        finally:
+            self.running = False
+        print(f"⏹️ 재생 종료: {self.rows_processed}개 시간대, {time.perf_counter() - started:.1f}초")
+
     def stop(self):
         self.running = False
         # CSV 로깅 종료
@@ -0,0 +1,769 @@
+# parser/pipeline.py
+# 스트리밍 처리 엔진 - 실시간(시리얼)과 오프라인(파일 재생)이 같은 경로를 사용
+#   소스 → 파싱 → 중복 제거 → 디코딩 → 틱(시간대 분할) → 이벤트 감지 → 싱크
+# 소스: SerialSource, TextFileSource, BinaryCaptureSource, CsvSource
+#       (파일 소스는 ReplaySource로 감싸면 배속/최대 속도로 실시간 경로에 재생)
+# 싱크: CsvLogSink(실시간 로그 CSV), DataFrameSink(CSV/Parquet 일괄 저장),
+#       LatestRowSink(대시보드 websocket), EventPrintSink(터미널 알림)
+# 프레임 싱크: 디코딩 전 원본 프레임 - write_frame(프레임 키, 데이터, 타임스탬프)
+#       (선택) tick_frame() - 방금 받은 프레임이 틱이라 새 시간대를 연다는 알림 (현재 시간대를 닫기 전에 호출)
+#       BinaryCaptureWriter(캡처 파일), IpcPublisher(parser/ipc_bus.py)
+
+import asyncio
+import datetime
+import os
+import struct
+import threading
+import time
+from collections import deque
+
+from config import capture as capture_config
+from parser.can_decoder import split_line, decode_frame, parse_timestamp
+from parser.log_segments import SegmentJournal, SegmentStore, open_log, split_compression
+from parser.log_buffer import LogBuffer
+from parser.metrics import Metrics
+from parser.tick_source import create_tick_source
+from event_logic import event_detector
+from event_logic.event_detector import process_data, derived, tick_dt
+
+# 이보다 긴 틱 간격은 수신 중단으로 보고 잘라냄 (규칙 타이머가 한 번에 크게 진행되지 않도록)
+MAX_TICK_DT = 1.0
+# CSV의 고정 컬럼 (Time은 처음, event/trigger는 마지막)
+META_COLUMNS = ('Time', 'event', 'trigger')
+
+# 종료 시 시리얼 포트에 남은 라인을 처리하는 최대 시간 (초)
+DRAIN_TIMEOUT = 1.0
+
+# 바이너리 캡처 형식: 헤더 + [타임스탬프(us, 없으면 -1), CAN ID, 데이터 길이, 데이터] 반복
+CAPTURE_MAGIC = b'CANCAP1\n'
+CAPTURE_RECORD = struct.Struct('<qIB')
+
+
+def fsync_file(path):
+    """파일 내용을 디스크까지 기록 (OS 캐시에만 남지 않도록)"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class StreamEngine:
+    """프레임 → 시간대별 행 → 이벤트 감지 → 싱크 (소스와 무관한 공통 처리 경로)"""
+
+    def __init__(self, tick_source=None, sinks=None, metrics=None, frame_sinks=None):
+        """tick_source: 시간대 분할 기준 (None이면 config/tick.py, 환경변수 TICK_SOURCE)"""
+        self.tick_source = tick_source or create_tick_source()
+        self.sinks = list(sinks or [])
+        self.frame_sinks = list(frame_sinks or [])
+        self.metrics = metrics or Metrics()
+        self.log_buffer = LogBuffer()
+        self.running = False
+        self.time_counter = 0  # 처리한 틱 수
+        self.elapsed = 0.0  # 실제 틱 간격(dt) 누적 시간 → Time 컬럼
+        self.last_tick_timestamp = None  # 마지막 틱 프레임 수신 시각 (monotonic 또는 게이트웨이 TS)
+        self.current_time_data = {}
+        self.last_seen_ids = {}  # 각 ID별로 마지막에 본 데이터를 저장 (연속 체크용)
+        self.rows_processed = 0  # 이벤트 감지까지 마친 시간대 수
+        self.last_row_time = 0.0  # 마지막으로 처리한 시간대의 Time
+        self.between_ticks = deque()  # 시간대가 바뀌는 순간 실행할 함수 (설정 교체 등)
+        self.between_ticks_queued_at = None  # 가장 오래 기다린 함수가 들어온 시각 (monotonic)
+
+    def reset(self):
+        """새 주행 데이터를 처음부터 처리할 때 - 시간대/중복 체크/이벤트 FSM 상태 초기화 (싱크는 유지)"""
+        self.log_buffer.clear()
+        self.time_counter = 0
+        self.elapsed = 0.0
+        self.last_tick_timestamp = None
+        self.current_time_data = {}
+        self.last_seen_ids = {}
+        self.rows_processed = 0
+        self.last_row_time = 0.0
+        self.tick_source.reset()
+        event_detector.reset_state()
+
+    def call_between_ticks(self, func):
+        """func를 다음 시간대 경계에서 실행 (다른 스레드에서 호출 가능)
+        한 시간대 안의 프레임이 서로 다른 설정으로 처리되지 않도록 함 - 수신 중이 아니면 바로 실행"""
+        if not self.between_ticks:
+            self.between_ticks_queued_at = time.monotonic()
+        self.between_ticks.append(func)
+        if not self.running:
+            self.run_between_ticks()
+
+    def run_overdue_between_ticks(self, timeout):
+        """시간대 경계를 timeout초 넘게 기다린 함수가 있으면 바로 실행 (틱 프레임이 오지 않는 실시간 연결)
+        → 실행했으면 True - 프레임 처리와 같은 이벤트 루프에서 호출"""
+        if not self.between_ticks or time.monotonic() - self.between_ticks_queued_at < timeout:
+            return False
+        self.run_between_ticks()
+        return True
+
+    def run_between_ticks(self):
+        while self.between_ticks:
+            try:
+                self.between_ticks.popleft()()
+            except IndexError:
+                break
+            except Exception as e:
+                print(f"⚠️ 시간대 경계 작업 실패: {e}")
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    def extract_can_id(self, line):
+        """CAN 라인에서 ID를 추출"""
+        return split_line(line)[0]
+
+    # ── 틱 ──────────────────────────────────────────────
+
+    def tick_interval(self, timestamp):
+        """직전 틱 이후 실제 경과 시간(dt) - 수신 시각이 없거나 역행하면 틱 소스의 공칭 주기"""
+        last, self.last_tick_timestamp = self.last_tick_timestamp, timestamp
+        nominal_dt = self.tick_source.nominal_dt
+        if timestamp is None or last is None:
+            return nominal_dt
+        dt = timestamp - last
+        if dt <= 0:
+            return nominal_dt
+        max_dt = max(MAX_TICK_DT, nominal_dt)
+        if dt > max_dt:
+            self.metrics.inc('monitor_tick_gaps_total')
+            return max_dt
+        return dt
+
+    def close_time_slot(self, timestamp=None):
+        """틱 처리 - 현재 시간대의 이벤트 감지/저장 후 새 시간대 시작
+        timestamp: 틱 프레임 수신 시각(초) - 닫히는 시간대의 길이(dt)를 계산해 규칙 타이머에 사용"""
+        metrics = self.metrics
+        metrics.observe_tick(timestamp, self.tick_source.nominal_dt)
+        metrics.inc('monitor_ticks_total')
+        dt = self.tick_interval(timestamp)
+
+        # 이전 시간대 데이터가 있으면 처리 (첫 틱 이전에 들어온 데이터는 Time 0 시간대)
+        if self.current_time_data:
+            self.current_time_data.setdefault('Time', 0.0)
+            self.process_row(self.current_time_data, dt)
+        if self.between_ticks:
+            self.run_between_ticks()
+
+        self.time_counter += 1
+        self.elapsed += dt
+        # 새로운 시간대 시작 (이전 데이터 복사)
+        if self.log_buffer.buffer:
+            self.current_time_data = self.log_buffer.buffer[-1].copy()
+        else:
+            self.current_time_data = {}
+        self.current_time_data['Time'] = round(self.elapsed, 3)
+        self.current_time_data['event'] = 'none'
+
+    def process_row(self, row, dt):
+        """시간대 1개 → 이벤트 감지 → 싱크 (이미 시간대별로 나뉜 CSV는 여기서부터 시작)"""
+        metrics = self.metrics
+        timed = metrics.enabled
+        if timed:
+            started = time.perf_counter()
+        processed = process_data(row, dt)
+        if timed:
+            metrics.observe_stage('detect', time.perf_counter() - started)
+            started = time.perf_counter()
+        self.log_buffer.add(processed)
+        self.rows_processed += 1
+        self.last_row_time = processed.get('Time', self.last_row_time)
+        for sink in self.sinks:
+            sink.write(processed)
+        if timed:
+            metrics.observe_stage('log', time.perf_counter() - started)
+        return processed
+
+    # ── 프레임 ──────────────────────────────────────────
+
+    def is_duplicate(self, can_id, decoded_data):
+        """같은 ID의 데이터가 직전과 동일하면 True (연속된 신호는 무시)"""
+        data_key = str(decoded_data)
+        if self.last_seen_ids.get(can_id) == data_key:
+            self.metrics.inc_id('can_frames_deduplicated_total', can_id)
+            return True
+        self.last_seen_ids[can_id] = data_key
+        return False
+
+    def process_frame(self, can_id, decoded_data, timestamp=None):
+        """디코딩된 프레임 1개 처리 - 틱이면 현재 시간대를 닫은 뒤, 프레임 데이터를 새 시간대에 추가"""
+        if self.is_duplicate(can_id, decoded_data):
+            return False
+        if self.tick_source.on_frame(can_id, timestamp):
+            for sink in self.frame_sinks:
+                tick_frame = getattr(sink, 'tick_frame', None)
+                if tick_frame is not None:
+                    tick_frame()
+            self.close_time_slot(timestamp)
+        return self.add_can_data(can_id, decoded_data)
+
+    def add_can_data(self, can_id, decoded_data):
+        """CAN 데이터를 현재 시간대에 추가 - 모든 해석된 데이터 저장"""
+        row = self.current_time_data
+        for key, value in decoded_data.items():
+            # 숫자로 변환 가능하면 숫자로, 아니면 문자열로 저장
+            if isinstance(value, (int, float)):
+                row[key] = value
+            else:
+                try:
+                    row[key] = float(value)
+                except (ValueError, TypeError):
+                    row[key] = value
+        return True  # 새로운 데이터 추가됨
+
+    def process_raw(self, can_id, data_bytes, timestamp=None):
+        """CAN ID + 데이터 bytes 1개 처리 (바이너리 캡처 등)"""
+        for sink in self.frame_sinks:
+            sink.write_frame(can_id, data_bytes, timestamp)
+        metrics = self.metrics
+        if metrics.enabled:
+            started = time.perf_counter()
+            decoded = decode_frame(can_id, data_bytes)
+            metrics.observe_stage('decode', time.perf_counter() - started)
+        else:
+            decoded = decode_frame(can_id, data_bytes)
+        if not decoded:
+            metrics.inc_id('can_frames_failed_total', can_id)
+            return False
+        metrics.inc_id('can_frames_decoded_total', can_id)
+        return self.process_frame(can_id, decoded, timestamp)
+
+    def process_line(self, line, received_at=None):
+        """CAN 라인 1개 처리 - 틱 프레임이면 시간대 전환 후, 데이터를 현재 시간대에 추가
+        received_at: 호스트 수신 시각(monotonic) - 라인에 게이트웨이 타임스탬프(TS=)가 있으면 그것을 우선 사용"""
+        if not line or 'CAN FD RX:' not in line:
+            return False
+        metrics = self.metrics
+        metrics.inc('can_frames_read_total')
+
+        can_id, data_bytes = split_line(line)
+        if can_id is None:
+            metrics.inc('can_frames_unparsed_total')
+            return False
+        if data_bytes is None:
+            metrics.inc_id('can_frames_failed_total', can_id)
+            return False
+
+        timestamp = parse_timestamp(line)
+        return self.process_raw(can_id, data_bytes, received_at if timestamp is None else timestamp)
+
+    def process_captured(self, can_id, data_bytes, timestamp=None):
+        """바이너리 캡처 프레임 1개 처리 (텍스트 파싱 단계 없음)"""
+        self.metrics.inc('can_frames_read_total')
+        return self.process_raw(can_id, data_bytes, timestamp)
+
+    # ── 실행 ────────────────────────────────────────────
+
+    def run(self, source):
+        """파일 소스를 대기 없이 끝까지 처리 (CPU가 허용하는 최대 속도)"""
+        self.running = True
+        try:
+            source.feed(self)
+        finally:
+            self.running = False
+        self.finish()
+
+    def flush(self):
+        """닫히지 않은 마지막 시간대 처리 (파일 끝)"""
+        if self.current_time_data:
+            self.current_time_data.setdefault('Time', 0.0)
+            self.process_row(self.current_time_data, self.tick_source.nominal_dt)
+            self.current_time_data = {}
+
+    def finish(self):
+        """마지막 시간대 처리 후 싱크 닫기 (오프라인 재생 종료 시)"""
+        self.flush()
+        for sink in self.sinks:
+            sink.close()
+
+
+# ── 소스 ────────────────────────────────────────────────
+
+class FileSource:
+    """파일 소스 공통 - records()는 (엔진 메서드 이름, 인자) 를 순서대로 생성
+    처리 중 오류가 난 레코드는 건너뛰고 계속 (잘못된 프레임 하나로 파일 전체가 중단되지 않도록)"""
+
+    unit = "레코드"  # 오류 메시지의 레코드 단위
+
+    def __init__(self, path):
+        self.path = path
+        self.errors = 0  # 처리 중 오류가 나서 건너뛴 레코드 수
+
+    def records(self):
+        raise NotImplementedError
+
+    def process(self, engine, number, method, args):
+        """레코드 1개 처리 (number: 1부터 시작하는 레코드 번호)"""
+        try:
+            getattr(engine, method)(*args)
+        except Exception as e:
+            self.errors += 1
+            engine.metrics.inc('monitor_errors_total')
+            print(f"❌ {self.unit} {number} 처리 오류: {e}")
+
+    def feed(self, engine):
+        for number, (method, args) in enumerate(self.records(), 1):
+            self.process(engine, number, method, args)
+
+
+class TextFileSource(FileSource):
+    """UART 로그 텍스트 파일 (한 줄에 "CAN FD RX: ..." 라인 1개, .gz/.zst도 그대로)"""
+
+    unit = "라인"
+
+    def records(self):
+        with open_log(self.path, 'rt') as f:
+            for line in f:
+                yield 'process_line', (line.strip(),)
+
+
+class BinaryCaptureSource(FileSource):
+    """바이너리 캡처 파일 (BinaryCaptureWriter 형식) - 텍스트 파싱 없이 바로 디코딩"""
+
+    unit = "프레임"
+
+    def frames(self):
+        """(CAN ID, 데이터 bytes, 타임스탬프(초) 또는 None)"""
+        with open_log(self.path, 'rb') as f:
+            if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+                raise ValueError(f"바이너리 캡처 파일이 아닙니다: {self.path}")
+            while True:
+                header = f.read(CAPTURE_RECORD.size)
+                if len(header) < CAPTURE_RECORD.size:
+                    return
+                timestamp_us, can_id, length = CAPTURE_RECORD.unpack(header)
+                data = f.read(length)
+                if len(data) < length:
+                    return
+                yield can_id, data, (None if timestamp_us < 0 else timestamp_us / 1_000_000)
+
+    def records(self):
+        for frame in self.frames():
+            yield 'process_captured', frame
+
+
+class BinaryCaptureWriter:
+    """바이너리 캡처 파일 기록 (텍스트 로그보다 작고 재생 시 파싱 비용이 없음)"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(CAPTURE_MAGIC)
+        self.count = 0
+
+    def write(self, can_id, data_bytes, timestamp=None):
+        timestamp_us = -1 if timestamp is None else int(timestamp * 1_000_000)
+        self.file.write(CAPTURE_RECORD.pack(timestamp_us, can_id, len(data_bytes)))
+        self.file.write(data_bytes)
+        self.count += 1
+
+    write_frame = write  # 프레임 싱크로 StreamEngine에 붙일 때
+
+    def write_line(self, line):
+        """"CAN FD RX: ..." 라인 1개를 캡처 레코드로 변환 (해석할 수 없는 라인은 건너뜀)"""
+        can_id, data_bytes = split_line(line)
+        if data_bytes is None:
+            return False
+        self.write(can_id, data_bytes, parse_timestamp(line))
+        return True
+
+    def close(self):
+        self.file.close()
+
+
+class CsvSource(FileSource):
+    """이미 시간대별로 나뉜 CSV (Time 컬럼) - 파싱/틱 단계 없이 이벤트 감지부터 처리"""
+
+    unit = "행"
+
+    def records(self):
+        import pandas as pd
+
+        with open_log(self.path, 'rt') as f:
+            df = pd.read_csv(f)
+        times = df['Time'].tolist() if 'Time' in df.columns else None
+        for index, row in enumerate(df.to_dict('records')):
+            row = {key: value for key, value in row.items()
+                   if key not in ('event', 'trigger') and not pd.isna(value)}
+            yield 'process_row', (row, tick_dt(times, index))
+
+
+class ReplaySource:
+    """파일 소스를 비동기로 재생 - 시간대 Time 기준 speed배속, speed가 0이면 대기 없이 최대 속도
+    (재생 중 set_speed/pause/resume 가능, 대시보드 websocket이 도는 이벤트 루프에서 사용)"""
+
+    YIELD_EVERY = 200  # 최대 속도에서도 이 레코드 수마다 이벤트 루프에 양보
+
+    def __init__(self, source, speed=1.0):
+        self.source = source
+        self.speed = speed
+        self.paused = False
+        self.position = 0.0  # 재생 중인 시간대의 Time
+        self.records = 0
+        self.finished = False
+        self._anchor = None  # (벽시계 시각, 그 때의 Time) - 배속 변경/재개 시 다시 잡음
+
+    def set_speed(self, speed):
+        self.speed = max(0.0, float(speed))
+        self._anchor = None
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+        self._anchor = None
+
+    def status(self):
+        return {'path': self.source.path, 'speed': self.speed, 'paused': self.paused,
+                'position': round(self.position, 3), 'records': self.records,
+                'finished': self.finished}
+
+    async def _pace(self):
+        if self.speed > 0:
+            now = time.perf_counter()
+            if self._anchor is None:
+                self._anchor = (now, self.position)
+            anchor_wall, anchor_position = self._anchor
+            delay = anchor_wall + (self.position - anchor_position) / self.speed - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+        # 대기 중에 일시정지되어도 다음 시간대는 처리하지 않도록 대기 후 확인
+        if self.paused:
+            while self.paused:
+                await asyncio.sleep(0.05)
+            self._anchor = None
+
+    async def feed(self, engine):
+        rows_seen = engine.rows_processed
+        try:
+            for method, args in self.source.records():
+                if not engine.running:
+                    break
+                self.records += 1
+                self.source.process(engine, self.records, method, args)
+                if engine.rows_processed != rows_seen:
+                    # 시간대가 하나 닫힐 때마다 재생 시각에 맞춰 대기
+                    rows_seen = engine.rows_processed
+                    self.position = engine.last_row_time
+                    await self._pace()
+                if self.records % self.YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
+            else:
+                engine.flush()
+        finally:
+            self.finished = True
+
+
+class SerialSource:
+    """시리얼 포트 (실시간) - engine.running이 False가 될 때까지 읽기"""
+
+    def __init__(self, serial):
+        self.serial = serial
+
+    async def feed(self, engine):
+        metrics = engine.metrics
+        loop = asyncio.get_running_loop()
+        while engine.running:
+            try:
+                # 비동기로 시리얼 읽기
+                timed = metrics.enabled
+                if timed:
+                    started = time.perf_counter()
+                line = await loop.run_in_executor(None, self.serial.readline)
+                received_at = time.monotonic()
+                if timed and line:
+                    metrics.observe_stage('read', time.perf_counter() - started)
+
+                # UTF-8 디코딩 오류 처리
+                try:
+                    line = line.decode('utf-8', errors='ignore').strip()
+                except (UnicodeDecodeError, AttributeError):
+                    # 바이너리 데이터나 None인 경우 건너뛰기
+                    continue
+
+                engine.process_line(line, received_at)
+
+                # CPU 사용량을 줄이기 위해 짧은 대기
+                await asyncio.sleep(0.001)
+
+            except Exception as e:
+                print(f"Monitor error: {e}")
+                metrics.inc('monitor_errors_total')
+                # 오류가 발생해도 계속 실행
+                await asyncio.sleep(0.1)
+
+    def drain(self, engine, timeout=DRAIN_TIMEOUT):
+        """종료 시 포트에 이미 도착한 라인 처리 (timeout초까지) → 처리하지 못하고 남은 바이트 수"""
+        deadline = time.monotonic() + timeout
+        drained = 0
+        try:
+            while self.serial.in_waiting and time.monotonic() < deadline:
+                line = self.serial.readline()
+                engine.process_line(line.decode('utf-8', errors='ignore').strip(), time.monotonic())
+                drained += 1
+            remaining = self.serial.in_waiting
+        except Exception as e:
+            print(f"⚠️ 시리얼 입력 비우기 실패: {e}")
+            return 0
+        if drained or remaining:
+            print(f"📥 종료 전 수신 라인 {drained}개 처리" + (f", 미처리 {remaining}바이트" if remaining else ""))
+        return remaining
+
+
+def open_source(path):
+    """파일 확장자로 소스 선택: .cap/.bin → 바이너리 캡처, .csv → 시간대별 CSV, 그 외 → 텍스트 로그
+    압축된 로그 세그먼트(.gz/.zst)는 압축 확장자 앞의 확장자로 판단 (예: realtime_log_..._0001.csv.gz)"""
+    extension = os.path.splitext(split_compression(path)[0])[1].lower()
+    if extension in ('.cap', '.bin'):
+        return BinaryCaptureSource(path)
+    if extension == '.csv':
+        return CsvSource(path)
+    return TextFileSource(path)
+
+
+# ── 싱크 ────────────────────────────────────────────────
+
+class CsvLogSink:
+    """실시간 로그 CSV - 행마다 세그먼트 저널에 추가 기록 (추가 전용, 새 신호가 나타나면 헤더 레코드 추가)
+    fsync는 LOG_FSYNC_INTERVAL초마다 별도 스레드에서 → 정전 시 유실은 그 구간 이내, 기록 경로는 fsync를 기다리지 않음
+    크기/시간 한도(config/capture.py)에 도달하면 새 세그먼트로 전환하고, 닫힌 세그먼트는
+    parser/log_segments.py의 작업 스레드가 CSV로 마감(원자적 교체) 후 압축/보존 정책 적용"""
+
+    def __init__(self, directory="logs", prefix="realtime_log", max_bytes=None, max_seconds=None,
+                 compression=None, fsync_interval=None):
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = capture_config.LOG_SEGMENT_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_seconds = capture_config.LOG_SEGMENT_MAX_SECONDS if max_seconds is None else max_seconds
+        self.compression = compression
+        self.fsync_interval = capture_config.LOG_FSYNC_INTERVAL if fsync_interval is None else fsync_interval
+        self.filename = None  # 현재 세그먼트 (마감 후의 CSV 경로, 기록 중에는 저널에 씀)
+        self.journal = None
+        self.lock = threading.Lock()
+        self.columns = []  # 현재 헤더의 신호 컬럼 (Time/event/trigger 제외)
+        self.started_at = None
+        self.is_open = False
+        self.store = None  # 세그먼트 목록/마감/압축/보존 정책
+        self.session = None
+        self.segment_index = 0
+        self.syncer = None
+        self.stop_sync = threading.Event()
+        self.session_closed = False
+        self.dropped = 0  # 세션을 닫은 뒤 들어와 기록하지 못한 행 (종료 보고에 유실로 포함)
+        self._reset_segment_stats()
+
+    def _reset_segment_stats(self):
+        self.segment_bytes = 0
+        self.segment_rows = 0
+        self.segment_opened = time.monotonic()
+        self.segment_first_time = None
+        self.segment_last_time = None
+
+    def recover(self):
+        """이전 실행(정전/강제 종료)이 남긴 저널을 CSV로 마감 (open()에서도 호출)"""
+        if self.store is None:
+            self.store = SegmentStore(self.directory, self.prefix, self.compression)
+        self.store.start()
+
+    def open(self):
+        """CSV 로깅 시작 - 동적 컬럼 처리 (이미 기록 중이면 그 세션을 마감하고 새 세션 시작)"""
+        if self.is_open:
+            self.close()
+        self.started_at = datetime.datetime.now()
+        session = self.started_at.strftime("%Y%m%d_%H%M%S")
+        if session != self.session:
+            # 같은 초에 다시 시작하면 세그먼트 번호를 이어서 사용 (이전 세션 파일을 덮어쓰지 않도록)
+            self.session = session
+            self.segment_index = 0
+        self.columns = []
+        self.session_closed = False
+        self.dropped = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self.recover()
+        self._open_segment()
+        self.is_open = True
+        if self.fsync_interval:
+            self.stop_sync.clear()
+            self.syncer = threading.Thread(target=self._sync_loop, name="log-fsync", daemon=True)
+            self.syncer.start()
+
+        print(f"📁 CSV 로깅 시작: {self.filename}")
+
+    def _open_segment(self):
+        """새 세그먼트 저널 - 첫 레코드는 지금까지 나타난 신호 컬럼의 헤더"""
+        self.segment_index += 1
+        self.filename = os.path.join(self.directory, f"{self.prefix}_{self.session}_{self.segment_index:04d}.csv")
+        self.store.open_segment(self.filename, self.session, self.segment_index)
+        self.journal = SegmentJournal(self.store.journal_path(self.filename), self.fsync_interval)
+        self._reset_segment_stats()
+        self._append_header()
+
+    def _append_header(self):
+        self.segment_bytes += self.journal.append_header(['Time'] + self.columns + ['event', 'trigger'])
+
+    def _close_segment(self):
+        """현재 세그먼트 저널을 fsync 후 닫고 마감/압축을 작업 스레드에 넘김 (lock 안에서 호출)"""
+        self.journal.close()
+        self.store.close_segment(self.filename, self.segment_rows,
+                                 self.segment_first_time, self.segment_last_time)
+
+    def _segment_full(self):
+        if self.max_bytes and self.segment_bytes >= self.max_bytes:
+            return True
+        return bool(self.max_seconds) and time.monotonic() - self.segment_opened >= self.max_seconds
+
+    def _sync_loop(self):
+        while not self.stop_sync.wait(self.fsync_interval):
+            journal = self.journal
+            try:
+                journal.sync()
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 로그 저널 fsync 실패 ({journal.path}): {e}")
+
+    def write(self, row):
+        """저널에 행 추가 - 실제 들어오는 모든 신호를 동적으로 저장"""
+        if not self.is_open:
+            if self.session_closed:
+                self.dropped += 1
+            return
+
+        # Time 컬럼 (항상 첫 번째), 나머지 신호, event와 trigger 컬럼 (항상 마지막)
+        columns = [key for key in row if key not in META_COLUMNS]
+        row_time = round(row.get('Time', 0), 3)
+        csv_parts = [str(row_time)]
+        csv_parts.extend(str(row[key]) for key in columns)
+        csv_parts.append(str(row.get('event', 'none')))
+        csv_parts.append(str(row.get('trigger', 'none')))
+
+        with self.lock:
+            # 새로운 신호가 들어오면 헤더 레코드 추가 (기존 행은 다시 쓰지 않음 - 마감할 때 한 헤더로 합침)
+            if columns != self.columns:
+                self.columns = columns
+                self._append_header()
+            line = ','.join(csv_parts)
+            self.journal.append(line)
+            self.segment_bytes += len(line) + 1
+            self.segment_rows += 1
+            if self.segment_first_time is None:
+                self.segment_first_time = row_time
+            self.segment_last_time = row_time
+            if self._segment_full():
+                self._close_segment()
+                self._open_segment()
+
+    def pending(self):
+        """아직 fsync하지 않은 행 수 (정전 시 유실될 수 있는 양 - OS까지는 이미 기록됨)"""
+        journal = self.journal
+        return journal.unsynced if journal and self.is_open else 0
+
+    def close(self):
+        """CSV 로깅 종료 - 마지막 세그먼트 fsync 후 마감 (못 끝내면 다음 실행의 recover()에서)"""
+        if not self.is_open:
+            return
+        self.stop_sync.set()
+        if self.syncer:
+            self.syncer.join()
+            self.syncer = None
+        with self.lock:
+            self._close_segment()
+        self.is_open = False
+        self.session_closed = True
+        self.store.finish()
+        print(f"📁 저장된 파일: {self.filename}")
+
+    def segments(self):
+        """세그먼트 목록/압축/보존 상태 + 기록 중인 저널의 fsync 상태 (로깅을 시작한 적이 없으면 None)"""
+        if self.store is None:
+            return None
+        status = self.store.status()
+        status['journal'] = self.journal.status() if self.is_open else None
+        return status
+
+
+class DataFrameSink:
+    """모든 행을 모아 종료 시 한 번에 저장 (.parquet이면 컬럼 형식, 그 외 CSV)"""
+
+    def __init__(self, path, exclude=()):
+        self.path = path
+        self.exclude = set(exclude)
+        self.rows = []
+
+    def write(self, row):
+        self.rows.append(row)
+
+    def pending(self):
+        return len(self.rows)
+
+    def close(self):
+        import pandas as pd
+
+        if not self.rows:
+            return None
+        df = pd.DataFrame(self.rows)
+        # Time과 event(trigger) 컬럼을 첫 번째와 마지막으로 이동
+        tail = [col for col in ('trigger', 'event') if col in df.columns and col not in self.exclude]
+        cols = [col for col in df.columns if col not in META_COLUMNS and col not in self.exclude]
+        df = df[['Time'] + cols + tail]
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if self.path.endswith('.parquet'):
+            df.to_parquet(self.path, index=False)
+        else:
+            df.to_csv(self.path, index=False)
+        fsync_file(self.path)
+        return df
+
+
+class LatestRowSink:
+    """대시보드 websocket용 최신 행 (파생 신호 포함)
+    최근 행을 일련번호와 함께 보관하므로 배속 재생 중에도 websocket이 빠짐없이 전송 가능"""
+
+    def __init__(self, history=2000):
+        self.latest = None
+        self.sequence = 0  # 지금까지 기록된 행 수
+        self.recent = deque(maxlen=history)
+        self.lock = threading.Lock()
+
+    def write(self, row):
+        dashboard_row = row.copy()
+        dashboard_row.update(derived.values())
+        with self.lock:
+            self.latest = dashboard_row
+            self.sequence += 1
+            self.recent.append(dashboard_row)
+
+    def get(self):
+        with self.lock:
+            return self.latest.copy() if self.latest else None
+
+    def since(self, sequence, limit=None):
+        """sequence 이후 기록된 행들 → (현재 일련번호, 행 리스트) - 보관 범위를 넘은 행은 생략"""
+        with self.lock:
+            missed = min(self.sequence - sequence, len(self.recent))
+            if missed <= 0:
+                return self.sequence, []
+            if limit is not None:
+                missed = min(missed, limit)
+            return self.sequence, [row.copy() for row in list(self.recent)[-missed:]]
+
+    def close(self):
+        pass
+
+
+class EventPrintSink:
+    """이벤트가 활성화된 시간대를 터미널에 알림"""
+
+    def write(self, row):
+        event = row.get('event', 'none')
+        if event != 'none':
+            # _on 접미사 제거
+            event_name = event.replace('_on', '')
+            print(f"🚨 이벤트 감지! 시간: {row.get('Time', 0):.1f}s, 이벤트: {event_name}")
+
+    def close(self):
+        pass
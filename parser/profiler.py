@@ -0,0 +1,161 @@
+# parser/profiler.py
+# 모니터링 루프 프로파일러 - 실행 중 켜고 끄며, 지정 시간 후 자동 종료
+#  - sample  : SIGPROF 타이머로 메인 스레드 스택을 주기적으로 수집 → collapsed stack (.folded)
+#              (flamegraph.pl, speedscope 등에서 바로 열 수 있음)
+#  - cprofile: cProfile 전체 호출 기록 → .prof + 누적 시간 상위 함수 요약(.txt)
+# 리눅스 전용 (signal.setitimer / SIGUSR1 사용)
+
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import signal
+import time
+from collections import Counter
+from datetime import datetime
+
+PROFILE_DIR = "logs"
+DEFAULT_SECONDS = float(os.environ.get("PROFILE_SECONDS", "30"))
+SAMPLE_INTERVAL = 0.005  # CPU 시간 기준 샘플 간격 (초)
+MAX_STACK_DEPTH = 64
+MODES = ('sample', 'cprofile')
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class Profiler:
+    """프로세스당 하나만 동작 (SIGPROF 타이머 공유)"""
+
+    def __init__(self, output_dir=PROFILE_DIR, interval=SAMPLE_INTERVAL):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.mode = None
+        self.started_at = None
+        self.deadline = None
+        self.last_output = None
+        self._stacks = Counter()
+        self._cprofile = None
+        self._stop_handle = None
+
+    @property
+    def running(self):
+        return self.mode is not None
+
+    def start(self, seconds=DEFAULT_SECONDS, mode='sample'):
+        """프로파일링 시작 - 메인 스레드(이벤트 루프)에서 호출해야 함"""
+        if self.running:
+            raise RuntimeError(f"이미 프로파일링 중입니다 ({self.mode})")
+        if mode not in MODES:
+            raise ValueError(f"알 수 없는 프로파일 모드: {mode} (사용 가능: {', '.join(MODES)})")
+        if mode == 'sample' and not hasattr(signal, 'setitimer'):
+            raise RuntimeError("이 플랫폼은 샘플링 프로파일러(setitimer)를 지원하지 않습니다")
+
+        self.mode = mode
+        self.started_at = time.time()
+        self.deadline = time.perf_counter() + seconds
+        self._stacks.clear()
+
+        if mode == 'sample':
+            signal.signal(signal.SIGPROF, self._sample)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+        # 자동 종료 (샘플링은 SIGPROF 핸들러에서도 마감 시간을 확인)
+        try:
+            self._stop_handle = asyncio.get_running_loop().call_later(seconds, self.stop)
+        except RuntimeError:
+            self._stop_handle = None
+        print(f"🔬 프로파일링 시작 ({mode}, {seconds:g}초 후 자동 종료)")
+
+    def _sample(self, signum, frame):
+        if time.perf_counter() >= self.deadline:
+            self.stop()
+            return
+        stack = []
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        if stack:
+            self._stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        """프로파일링 종료 후 결과 파일 경로 반환 (실행 중이 아니면 None)"""
+        if not self.running:
+            return None
+        mode, self.mode = self.mode, None
+        if self._stop_handle is not None:
+            self._stop_handle.cancel()
+            self._stop_handle = None
+
+        if mode == 'sample':
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, signal.SIG_DFL)
+        else:
+            self._cprofile.disable()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.fromtimestamp(self.started_at).strftime('%Y%m%d_%H%M%S')
+        base = os.path.join(self.output_dir, f"profile_{stamp}")
+        if mode == 'sample':
+            path = self._write_folded(base + ".folded")
+        else:
+            path = self._write_cprofile(base)
+        self.last_output = path
+        print(f"🔬 프로파일링 종료 → {path}")
+        return path
+
+    def _write_folded(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        self._stacks.clear()
+        return path
+
+    def _write_cprofile(self, base):
+        path = base + ".prof"
+        self._cprofile.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(self._cprofile, stream=summary).sort_stats('cumulative').print_stats(40)
+        with open(base + ".txt", 'w', encoding='utf-8') as f:
+            f.write(summary.getvalue())
+        self._cprofile = None
+        return path
+
+    def toggle(self, seconds=DEFAULT_SECONDS, mode='sample'):
+        if self.running:
+            return self.stop()
+        self.start(seconds, mode)
+        return None
+
+    def status(self):
+        return {
+            'running': self.running,
+            'mode': self.mode,
+            'remaining': round(max(0.0, self.deadline - time.perf_counter()), 1) if self.running else 0,
+            'samples': sum(self._stacks.values()),
+            'last_output': self.last_output,
+        }
+
+    def install_signal_toggle(self, loop=None, signum=None):
+        """SIGUSR1 수신 시 샘플링 프로파일링 시작/종료 (kill -USR1 <pid>)"""
+        signum = signum or getattr(signal, 'SIGUSR1', None)
+        if signum is None:
+            return False
+        loop = loop or asyncio.get_running_loop()
+
+        def on_signal():
+            try:
+                self.toggle(DEFAULT_SECONDS, os.environ.get("PROFILE_MODE", "sample"))
+            except (RuntimeError, ValueError) as e:
+                print(f"⚠️ 프로파일링 전환 실패: {e}")
+        loop.add_signal_handler(signum, on_signal)
+        return True
+
+
+profiler = Profiler()
@@ -0,0 +1,291 @@
+# parser/shm_bus.py
+# 공유 메모리 행 버스 - 모니터 프로세스가 시간대 행을 multiprocessing.shared_memory 링 버퍼에 발행하면
+# 다른 프로세스(웹 서버, 로거, 분석)가 복사/직렬화 없이 읽음 (디코딩과 GIL을 다투지 않음)
+#   발행: 환경변수 SHM_BUS=<이름> 으로 MonitorCore를 실행하면 ShmRowSink가 싱크로 추가됨
+#   구독: ShmRowReader(<이름>) - LatestRowSink와 같은 sequence/since() 인터페이스 (RowSnapshots에 그대로 사용)
+#         대시보드는 SHM_BUS_ATTACH=<이름>, 그 밖의 소비자는 bus_consumer.py
+# 스키마는 생성 시점에 고정: STANDARD_COLUMNS + 파생 신호 + 이벤트 코드 (모두 float64, 값이 없으면 NaN)
+#   핫 리로드로 STANDARD_COLUMNS가 바뀌어도 발행 프로세스를 다시 시작하기 전까지는 기존 스키마 유지
+# 슬롯마다 일련번호를 두어 쓰는 중이거나 이미 덮어쓴 슬롯은 읽는 쪽에서 걸러냄 (seqlock 방식, 락 없음)
+# 헤더에 발행 프로세스 PID를 기록 - 같은 이름으로 두 번째 발행을 시작하면 이전 발행이 살아 있는 한 거부
+
+import json
+import os
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from config import signals as signal_config  # 핫 리로드로 교체되므로 모듈 속성으로 참조
+from config.event_rules import EVENT_PRIORITY
+from event_logic.event_detector import derived
+from parser.event_spans import event_code
+
+DEFAULT_NAME = "can_monitor_bus"
+DEFAULT_SLOTS = int(os.environ.get("SHM_BUS_SLOTS", "4096"))  # 10Hz 기준 약 7분
+MAGIC = b'CANSHM1\n'
+VERSION = 1
+HEADER_SIZE = 4096  # 고정 필드 + 스키마 JSON
+OWNER_OFFSET = 40  # 발행 프로세스 PID (uint64)
+SCHEMA_OFFSET = 64
+EVENT_COLUMN = 'event'
+REATTACH_INTERVAL = 1.0  # 발행 프로세스가 없을 때 다시 연결을 시도하는 간격 (초)
+
+
+def bus_columns():
+    """발행할 컬럼 - STANDARD_COLUMNS(Time 포함) + 파생 신호 + 이벤트 코드"""
+    columns = list(signal_config.STANDARD_COLUMNS)
+    columns += [name for name in signal_config.DERIVED_SIGNALS if name not in columns]
+    return columns + [EVENT_COLUMN]
+
+
+def _layout(buf, slots, column_count):
+    """공유 메모리 → (제어 필드[일련번호, 종료 여부], 슬롯 일련번호, 슬롯 값) numpy 뷰"""
+    control = np.ndarray((2,), dtype=np.uint64, buffer=buf, offset=24)
+    seqs = np.ndarray((slots,), dtype=np.uint64, buffer=buf, offset=HEADER_SIZE)
+    values = np.ndarray((slots, column_count), dtype=np.float64, buffer=buf,
+                        offset=HEADER_SIZE + slots * 8)
+    return control, seqs, values
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # 다른 사용자의 프로세스
+    return True
+
+
+def _live_owner(shm):
+    """기존 영역을 아직 발행 중인 프로세스의 PID (종료 표시됐거나 PID가 없는 프로세스면 None)"""
+    buf = shm.buf
+    if bytes(buf[:8]) != MAGIC:
+        return None
+    closed = int(np.frombuffer(buf[32:40], dtype=np.uint64)[0])
+    pid = int(np.frombuffer(buf[OWNER_OFFSET:OWNER_OFFSET + 8], dtype=np.uint64)[0])
+    if closed or not pid or not _pid_alive(pid):
+        return None
+    return pid
+
+
+def _to_float(value):
+    if isinstance(value, (bool, int, float)):
+        return float(value)
+    return np.nan
+
+
+class ShmRowSink:
+    """시간대 행을 공유 메모리 링 버퍼에 기록하는 싱크 (발행 프로세스 하나만 사용)"""
+
+    def __init__(self, name=DEFAULT_NAME, slots=DEFAULT_SLOTS, columns=None):
+        self.name = name
+        self.slots = slots
+        self.columns = list(columns or bus_columns())
+        self.events = ['none'] + list(EVENT_PRIORITY)  # 이벤트 코드 값 → 이름
+        self.event_index = {code: index for index, code in enumerate(self.events)}
+        self.derived_names = set(signal_config.DERIVED_SIGNALS)
+        self.sequence = 0
+        schema = json.dumps({'columns': self.columns, 'events': self.events}).encode('utf-8')
+        if SCHEMA_OFFSET + len(schema) > HEADER_SIZE:
+            raise ValueError(f"공유 메모리 스키마가 너무 큽니다 ({len(self.columns)}개 컬럼)")
+
+        size = HEADER_SIZE + slots * 8 + slots * len(self.columns) * 8
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            existing = shared_memory.SharedMemory(name=name)
+            owner = _live_owner(existing)
+            if owner is not None:
+                # 살아 있는 발행 영역 - 이 프로세스가 끝날 때 resource_tracker가 지우지 않도록 등록 해제
+                resource_tracker.unregister(existing._name, 'shared_memory')
+                existing.close()
+                raise RuntimeError(f"공유 메모리 버스 {name}을(를) 다른 발행 프로세스(PID {owner})가 사용 중입니다 "
+                                   f"- 그 프로세스를 끝내거나 다른 SHM_BUS 이름을 사용하세요")
+            # 이전 발행 프로세스가 비정상 종료하며 남긴 영역 - 지우고 새로 만듦
+            existing.close()
+            existing.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        buf = self.shm.buf
+        buf[:8] = MAGIC
+        buf[8:24] = np.array([VERSION, slots, len(self.columns), len(schema)], dtype=np.uint32).tobytes()
+        buf[SCHEMA_OFFSET:SCHEMA_OFFSET + len(schema)] = schema
+        self.control, self.seqs, self.values = _layout(buf, slots, len(self.columns))
+        self.control[:] = 0
+        self.seqs[:] = 0
+        buf[OWNER_OFFSET:OWNER_OFFSET + 8] = np.array([os.getpid()], dtype=np.uint64).tobytes()
+        self._scratch = np.empty(len(self.columns), dtype=np.float64)
+        print(f"🧩 공유 메모리 버스 발행: {name} ({slots}개 슬롯, {len(self.columns)}개 컬럼, "
+              f"{size / 1024 / 1024:.1f}MB)")
+
+    def write(self, row):
+        if self.values is None:
+            return
+        scratch = self._scratch
+        derived_values = None
+        for index, name in enumerate(self.columns):
+            if name == EVENT_COLUMN:
+                code = event_code(row.get(EVENT_COLUMN))
+                scratch[index] = self.event_index.get(code, np.nan) if code else 0.0
+                continue
+            value = row.get(name)
+            if value is None and name in self.derived_names:
+                # 파생 신호는 저장 행에서 빠지므로 마지막 계산 값 사용 (LatestRowSink와 같음)
+                if derived_values is None:
+                    derived_values = derived.values()
+                value = derived_values.get(name)
+            scratch[index] = _to_float(value)
+
+        sequence = self.sequence + 1
+        slot = (sequence - 1) % self.slots
+        self.seqs[slot] = 0  # 쓰는 중 표시 → 읽는 쪽은 이 슬롯을 건너뜀
+        self.values[slot] = scratch
+        self.seqs[slot] = sequence
+        self.control[0] = sequence
+        self.sequence = sequence
+
+    def close(self):
+        """종료 표시 후 공유 메모리 삭제 (이미 연결한 소비자는 표시를 보고 다시 연결을 시도)"""
+        if self.values is None:
+            return
+        self.control[1] = 1
+        # numpy 뷰가 남아 있으면 공유 메모리를 닫을 수 없음
+        self.control = self.seqs = self.values = None
+        self.shm.close()
+        self.shm.unlink()
+        print(f"🧩 공유 메모리 버스 종료: {self.name} ({self.sequence}개 행 발행)")
+
+
+class ShmRowReader:
+    """공유 메모리 버스 구독 - 발행 프로세스가 없거나 다시 시작해도 자동으로 (다시) 연결
+    sequence는 재연결 후에도 줄어들지 않으므로 LatestRowSink 대신 그대로 사용할 수 있음"""
+
+    def __init__(self, name=DEFAULT_NAME):
+        self.name = name
+        self.shm = None
+        self.base = 0  # 이전 연결까지 읽은 일련번호 (재연결 후 일련번호에 더함)
+        self.head = 0  # 현재 연결의 마지막 일련번호
+        self.columns = []
+        self.events = []
+        self._next_attempt = 0.0
+
+    def _attach(self):
+        now = time.monotonic()
+        if now < self._next_attempt:
+            return False
+        self._next_attempt = now + REATTACH_INTERVAL
+        try:
+            shm = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return False
+        # 읽는 쪽 프로세스가 끝날 때 resource_tracker가 발행 중인 영역을 지우지 않도록 등록 해제
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        buf = shm.buf
+        version, slots, column_count, schema_len = np.frombuffer(buf[8:24], dtype=np.uint32).tolist()
+        if bytes(buf[:8]) != MAGIC or version != VERSION:
+            shm.close()
+            print(f"⚠️ 공유 메모리 버스 형식이 다릅니다: {self.name}")
+            return False
+        schema = json.loads(bytes(buf[SCHEMA_OFFSET:SCHEMA_OFFSET + schema_len]).decode('utf-8'))
+        control, seqs, values = _layout(buf, slots, column_count)
+        if control[1]:
+            # 종료 표시된 영역 (발행 쪽이 지우기 직전) - numpy 뷰를 먼저 버려야 닫을 수 있음
+            del control, seqs, values
+            shm.close()
+            return False
+        self.shm, self.slots = shm, slots
+        self.control, self.seqs, self.values = control, seqs, values
+        self.columns, self.events = schema['columns'], schema['events']
+        self.head = 0
+        print(f"🧩 공유 메모리 버스 연결: {self.name} ({len(self.columns)}개 컬럼)")
+        return True
+
+    def _detach(self):
+        self.base += self.head
+        self.head = 0
+        self.control = self.seqs = self.values = None
+        self.shm.close()
+        self.shm = None
+        print(f"🧩 공유 메모리 버스 연결 끊김: {self.name} (발행 종료)")
+
+    def _ensure(self):
+        """연결되어 있으면 True - 발행이 끝났으면 끊고 새 발행에 다시 연결 시도"""
+        if self.shm is not None and self.control[1]:
+            self._detach()
+        if self.shm is None:
+            return self._attach()
+        return True
+
+    @property
+    def attached(self):
+        return self._ensure()
+
+    @property
+    def sequence(self):
+        """지금까지 발행된 행 수 (재연결 전 행 포함)"""
+        if self._ensure():
+            self.head = int(self.control[0])
+        return self.base + self.head
+
+    def arrays(self, sequence, limit=None):
+        """sequence 이후 행들 → (현재 일련번호, 일련번호 배열, 값 배열[행, 컬럼]) - 분석용 (dict 변환 없음)
+        보관 범위(슬롯 수)를 넘은 행과 읽는 중에 덮어쓴 행은 생략"""
+        current = self.sequence
+        if self.shm is None:
+            return current, np.empty(0, dtype=np.uint64), np.empty((0, len(self.columns)))
+        head = self.head
+        start = max(sequence - self.base, head - self.slots, 0)
+        if limit is not None:
+            start = max(start, head - limit)
+        if start >= head:
+            return current, np.empty(0, dtype=np.uint64), np.empty((0, len(self.columns)))
+        wanted = np.arange(start + 1, head + 1, dtype=np.uint64)
+        slots = (wanted - 1) % self.slots
+        values = self.values[slots]  # 복사
+        # 복사 후 슬롯 일련번호 확인 - 복사 도중 발행 쪽이 덮어쓴 슬롯은 번호가 달라짐
+        valid = self.seqs[slots] == wanted
+        return current, wanted[valid] + self.base, values[valid]
+
+    def since(self, sequence, limit=None):
+        """sequence 이후 행들 → (현재 일련번호, 행 dict 리스트) - LatestRowSink.since와 같은 형식"""
+        current, _, values = self.arrays(sequence, limit)
+        return current, self.rows(values)
+
+    def rows(self, values):
+        """arrays()의 값 배열 → 행 dict 리스트 (값이 없는 신호는 생략, 이벤트 코드 → "PM_on"/"none")"""
+        columns, events = self.columns, self.events
+        result = []
+        for row_values in values.tolist():
+            row = {}
+            for name, value in zip(columns, row_values):
+                if value == value:  # NaN(값 없음)은 생략
+                    row[name] = value
+            code = row.get(EVENT_COLUMN)
+            row[EVENT_COLUMN] = f"{events[int(code)]}_on" if code else 'none'
+            result.append(row)
+        return result
+
+    def status(self):
+        attached = self._ensure()
+        return {'name': self.name, 'attached': attached, 'sequence': self.sequence,
+                'slots': self.slots if attached else None, 'columns': self.columns if attached else None}
+
+    def close(self):
+        if self.shm is not None:
+            self.control = self.seqs = self.values = None
+            self.shm.close()
+            self.shm = None
+
+
+def sink_from_env():
+    """SHM_BUS=<이름> 이면 발행 싱크 (없으면 None)"""
+    name = os.environ.get("SHM_BUS")
+    return ShmRowSink(name) if name else None
+
+
+def reader_from_env():
+    """SHM_BUS_ATTACH=<이름> 이면 구독 (없으면 None)"""
+    name = os.environ.get("SHM_BUS_ATTACH")
+    return ShmRowReader(name) if name else None
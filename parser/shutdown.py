@@ -0,0 +1,175 @@
+# parser/shutdown.py
+# 종료 처리 - 시그널/HTTP 요청/다른 스레드 어디서 요청해도 같은 순서로 정리
+#   수신 중지 → 소스 작업 종료 대기(시리얼 입력 비우기 포함) → 마지막 시간대 처리
+#   → 싱크 flush/fsync → 유실 보고
+# 시그널 핸들러는 요청 플래그만 세우고(비차단), 실제 정리는 이벤트 루프 또는 호출 스레드에서 수행
+# 디스크가 멈춰도 종료가 무한정 걸리지 않도록 싱크 정리는 별도 스레드에서 마감 시간까지만 기다림
+
+import asyncio
+import os
+import signal
+import threading
+import time
+
+DEFAULT_TIMEOUT = float(os.environ.get("SHUTDOWN_TIMEOUT", "5"))
+
+
+def pending_rows(sink):
+    """싱크에 아직 디스크로 기록되지 않은 행 수 (pending()이 없는 싱크는 0)"""
+    pending = getattr(sink, 'pending', None)
+    return pending() if pending else 0
+
+
+def dropped_rows(sink):
+    """싱크가 닫힌 뒤 들어와 버린 행 수 (dropped가 없는 싱크는 0)"""
+    return getattr(sink, 'dropped', 0)
+
+
+class ShutdownCoordinator:
+    """StreamEngine 하나의 종료 절차 - 여러 번 요청해도 한 번만 수행하고 같은 결과를 반환"""
+
+    def __init__(self, engine, timeout=DEFAULT_TIMEOUT):
+        self.engine = engine
+        self.timeout = timeout
+        self.reason = None
+        self.report = None
+        self.requested = threading.Event()
+        self.tasks = set()  # 종료 전에 끝나기를 기다릴 소스 작업 (시리얼 수신, 재생)
+        self._lock = threading.Lock()
+        self._started = False
+        self._done = threading.Event()
+        self._loop = None
+        self._wakeup = None
+
+    def track(self, task):
+        """종료 시 기다릴 asyncio 작업 등록"""
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def request(self, reason="종료 요청"):
+        """종료 요청 - 시그널 핸들러/다른 스레드에서 호출해도 즉시 반환"""
+        if self.requested.is_set():
+            return
+        self.reason = reason
+        self.engine.running = False
+        self.requested.set()
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        print(f"\n🛑 종료 요청 ({reason})")
+
+    def install_signal_handlers(self, loop=None):
+        """SIGINT/SIGTERM → request() (이벤트 루프에 등록, 핸들러 안에서 저장/종료하지 않음)"""
+        self._bind(loop or asyncio.get_running_loop())
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self._loop.add_signal_handler(signum, self.request, f"시그널 {signum.name}")
+
+    def _bind(self, loop):
+        if self._loop is None:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            if self.requested.is_set():
+                self._wakeup.set()
+
+    async def wait(self):
+        """종료 요청이 올 때까지 대기"""
+        self._bind(asyncio.get_running_loop())
+        await self._wakeup.wait()
+
+    async def shutdown(self, reason="종료 요청"):
+        """이벤트 루프에서 종료 절차 수행 → 결과 dict"""
+        self._bind(asyncio.get_running_loop())
+        self.request(reason)
+        if not self._claim():
+            while not self._done.is_set():
+                await asyncio.sleep(0.01)
+            return self.report
+
+        deadline = time.monotonic() + self.timeout
+        started = time.monotonic()
+        tasks = [task for task in self.tasks if not task.done()]
+        if tasks:
+            # 소스 작업은 running=False를 보고 남은 입력을 처리한 뒤 스스로 끝남
+            _, unfinished = await asyncio.wait(tasks, timeout=max(0.0, deadline - time.monotonic()))
+            for task in unfinished:
+                task.cancel()
+            tasks_timed_out = len(unfinished)
+        else:
+            tasks_timed_out = 0
+
+        report, worker = self._start_close()
+        while worker.is_alive() and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        return self._finish(report, worker, started, tasks_timed_out)
+
+    def shutdown_blocking(self, reason="종료 요청"):
+        """이벤트 루프 밖의 스레드에서 종료 절차 수행 → 결과 dict
+        이벤트 루프가 다른 스레드에서 돌고 있으면 그 루프에서 shutdown()을 실행하고 결과를 기다림"""
+        if self._done.is_set():
+            return self.report
+        if self._loop is not None and self._loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(self.shutdown(reason), self._loop)
+            return future.result(self.timeout + 1)
+
+        self.request(reason)
+        if not self._claim():
+            self._done.wait(self.timeout + 1)
+            return self.report
+        started = time.monotonic()
+        report, worker = self._start_close()
+        worker.join(self.timeout)
+        return self._finish(report, worker, started, 0)
+
+    def _claim(self):
+        """처음 호출한 쪽만 True - 나머지는 그 결과를 기다림"""
+        with self._lock:
+            first, self._started = not self._started, True
+        return first
+
+    def _start_close(self):
+        report = {'reason': self.reason, 'closed': [], 'failed': [], 'lost_rows': 0}
+
+        def close_all():
+            # 마지막 시간대 처리 후 싱크를 순서대로 닫음 (CsvLogSink는 flush + fsync)
+            try:
+                self.engine.flush()
+            except Exception as e:
+                print(f"⚠️ 마지막 시간대 처리 실패: {e}")
+            for sink in self.engine.sinks:
+                name = type(sink).__name__
+                try:
+                    sink.close()
+                    report['closed'].append(name)
+                except Exception as e:
+                    print(f"⚠️ {name} 닫기 실패: {e}")
+                    report['failed'].append(name)
+
+        worker = threading.Thread(target=close_all, name="shutdown-flush", daemon=True)
+        worker.start()
+        return report, worker
+
+    def _finish(self, report, worker, started, tasks_timed_out):
+        report['rows'] = self.engine.rows_processed
+        report['timed_out'] = worker.is_alive()
+        report['tasks_timed_out'] = tasks_timed_out
+        # 닫지 못한 싱크에 남은 행, 닫힌 뒤 들어와 버린 행은 유실로 보고
+        for sink in self.engine.sinks:
+            name = type(sink).__name__
+            if name not in report['closed']:
+                report['lost_rows'] += pending_rows(sink)
+            report['lost_rows'] += dropped_rows(sink)
+        report['elapsed'] = round(time.monotonic() - started, 3)
+        self.report = report
+        self._done.set()
+        print(self.describe())
+        return report
+
+    def describe(self):
+        report = self.report
+        if report is None:
+            return "⏳ 종료 처리 전"
+        status = "⚠️ 마감 시간 초과" if report['timed_out'] or report['tasks_timed_out'] else "✅ 안전 종료"
+        lost = f", 유실 {report['lost_rows']}행" if report['lost_rows'] else ""
+        failed = f", 실패 싱크: {', '.join(report['failed'])}" if report['failed'] else ""
+        return (f"{status} ({report['reason']}): {report['rows']}개 시간대 처리, "
+                f"{report['elapsed']}초{lost}{failed}")
@@ -0,0 +1,132 @@
+# parser/subscriptions.py
+# 대시보드 websocket 클라이언트별 구독 - 필요한 신호만, 원하는 주기로, 또는 이벤트 변화만 전송
+#   클라이언트 → 서버: {"type": "subscribe", "signals": [...], "max_rate": 10, "events_only": false}
+#     signals: 받을 신호 목록 (없거나 null이면 전체 필드), max_rate: 초당 최대 행 수 (0/null이면 제한 없음)
+#     events_only: 이벤트 상태가 바뀐 행만 (신호 값 없이 Time/event만)
+#     spans: true면 이벤트 구간 open/close 메시지도 받음 (parser/event_spans.py)
+# 새 행은 시간대마다 한 번만 JSON 변환해 RowSnapshots에 보관하고 모든 클라이언트가 공유
+# (구독이 없는 클라이언트는 행 전체의 직렬화 결과까지 공유)
+
+import json
+from collections import deque
+
+# 구독과 관계없이 항상 보내는 필드 (페이지의 시간축/이벤트 표시/로깅 시간 표시용)
+BASE_FIELDS = ('Time', 'event', 'logging_start_time', 'logging_duration')
+MAX_SIGNALS = 200
+MAX_RATE = 1000.0
+
+
+def dumps(data):
+    """starlette send_json과 같은 형식의 JSON 문자열"""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+class Snapshot:
+    """시간대 하나의 JSON 변환된 행 - 전체 행 직렬화 결과는 처음 요청될 때 한 번만 만듦"""
+    __slots__ = ('row', '_text')
+
+    def __init__(self, row):
+        self.row = row
+        self._text = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = dumps(self.row)
+        return self._text
+
+
+class RowSnapshots:
+    """LatestRowSink의 새 행을 시간대마다 한 번만 가져와 변환하고 클라이언트들이 공유"""
+
+    def __init__(self, sink, prepare, history=2000):
+        """prepare: 원본 행 → JSON 변환된 행 (로깅 시간 등 공통 필드 추가 포함)"""
+        self.sink = sink
+        self.prepare = prepare
+        self.sequence = 0
+        self.snapshots = deque(maxlen=history)
+
+    def update(self):
+        if self.sink.sequence == self.sequence:
+            return
+        self.sequence, rows = self.sink.since(self.sequence, limit=self.snapshots.maxlen)
+        for row in rows:
+            self.snapshots.append(Snapshot(self.prepare(row)))
+
+    def since(self, sequence, limit=None):
+        """sequence 이후 행들 → (현재 일련번호, Snapshot 리스트) - 보관 범위를 넘은 행은 생략"""
+        self.update()
+        missed = min(self.sequence - sequence, len(self.snapshots))
+        if missed <= 0:
+            return self.sequence, []
+        if limit is not None:
+            missed = min(missed, limit)
+        return self.sequence, list(self.snapshots)[-missed:]
+
+    def latest_sequence(self):
+        self.update()
+        return self.sequence
+
+
+class Subscription:
+    """websocket 클라이언트 하나의 구독 상태 (기본: 모든 필드, 제한 없음)"""
+
+    def __init__(self, signals=None, max_rate=None, events_only=False, spans=False):
+        self.signals = signals
+        self.max_rate = max_rate
+        self.events_only = events_only
+        self.spans = spans
+        self.fields = None if signals is None else tuple(dict.fromkeys(BASE_FIELDS + tuple(signals)))
+        self.last_time = None   # 마지막으로 보낸 행의 Time
+        self.last_event = None  # 마지막으로 본 행의 event (보내지 않은 행 포함)
+
+    @classmethod
+    def from_message(cls, message):
+        """구독 메시지 → Subscription (형식이 잘못되면 ValueError)"""
+        signals = message.get('signals')
+        if signals is not None:
+            if not isinstance(signals, list) or not all(isinstance(sig, str) for sig in signals):
+                raise ValueError("signals는 신호명 목록이어야 합니다")
+            if len(signals) > MAX_SIGNALS:
+                raise ValueError(f"signals는 최대 {MAX_SIGNALS}개입니다")
+        max_rate = message.get('max_rate')
+        if max_rate is not None:
+            max_rate = float(max_rate)
+            if max_rate < 0 or max_rate > MAX_RATE:
+                raise ValueError(f"max_rate는 0~{MAX_RATE:g} 사이여야 합니다")
+            max_rate = max_rate or None
+        return cls(signals, max_rate, bool(message.get('events_only', False)),
+                   bool(message.get('spans', False)))
+
+    def describe(self):
+        return {'signals': self.signals, 'max_rate': self.max_rate, 'events_only': self.events_only,
+                'spans': self.spans}
+
+    def _wanted(self, row):
+        """이 행을 보낼지 - 이벤트 상태가 바뀐 행은 주기 제한과 관계없이 항상 보냄"""
+        event = row.get('event')
+        changed, self.last_event = event != self.last_event, event
+        if self.events_only:
+            return changed
+        if changed or self.max_rate is None or self.last_time is None:
+            return True
+        time = row.get('Time')
+        if not isinstance(time, (int, float)) or time < self.last_time:
+            return True  # 새 재생 등으로 시간이 되돌아가면 바로 보냄
+        return time - self.last_time >= 1.0 / self.max_rate
+
+    def messages(self, snapshots):
+        """보낼 JSON 문자열 목록"""
+        texts = []
+        for snapshot in snapshots:
+            row = snapshot.row
+            if not self._wanted(row):
+                continue
+            self.last_time = row.get('Time')
+            if self.events_only:
+                texts.append(dumps({key: row[key] for key in BASE_FIELDS if key in row}))
+            elif self.fields is None:
+                texts.append(snapshot.text)
+            else:
+                texts.append(dumps({key: row[key] for key in self.fields if key in row}))
+        return texts
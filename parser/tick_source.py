@@ -0,0 +1,91 @@
+# parser/tick_source.py
+# 시간대(틱) 분할 기준 - 어떤 프레임에서 현재 시간대를 닫고 새 시간대를 시작할지 판단
+# 규칙 타이머는 시간대 길이(dt)만큼 진행하므로 틱 주기를 바꿔도 임계 시간(초)은 그대로 유지됨
+
+import os
+
+from config.tick import (TICK_SOURCE, FRAME_TICK_DT, DEFAULT_FRAME_TICK_DT,
+                         EVERY_FRAME_TICK_DT)
+
+
+class FrameTick:
+    """지정한 CAN ID 프레임마다 틱 (기본: 0xEA)"""
+
+    def __init__(self, frame_id=0xEA):
+        self.frame_id = frame_id
+        self.nominal_dt = FRAME_TICK_DT.get(frame_id, DEFAULT_FRAME_TICK_DT)
+
+    def reset(self):
+        pass
+
+    def on_frame(self, can_id, timestamp=None):
+        return can_id == self.frame_id
+
+    def describe(self):
+        return f"frame:0x{self.frame_id:X}"
+
+
+class RateTick:
+    """수신 시각 기준 고정 주기 틱 - 주기 경계를 넘은 첫 프레임에서 틱
+    데이터 시각(실시간 수신 시각, 게이트웨이 TS=, 바이너리 캡처의 타임스탬프)이 필요 - 시각이 없는 프레임
+    (TS= 없는 텍스트 로그 등)은 처리 속도를 시각으로 쓰게 되므로 거부"""
+
+    def __init__(self, hz):
+        if hz <= 0:
+            raise ValueError(f"틱 주기는 0보다 커야 합니다: {hz}")
+        self.hz = hz
+        self.nominal_dt = 1.0 / hz
+        self.next_tick_at = None
+
+    def reset(self):
+        self.next_tick_at = None
+
+    def on_frame(self, can_id, timestamp=None):
+        if timestamp is None:
+            raise ValueError(f"{self.describe()} 틱에는 프레임 시각이 필요합니다 - 시각이 없는 파일(TS= 없는 텍스트 로그 등)은 "
+                             f"TICK_SOURCE=frame:0xEA 로 처리하세요")
+        if self.next_tick_at is None or timestamp < self.next_tick_at - self.nominal_dt:
+            # 첫 프레임이거나 시각이 역행(재시작)한 경우 주기 기준점 재설정
+            self.next_tick_at = timestamp + self.nominal_dt
+            return True
+        if timestamp < self.next_tick_at:
+            return False
+        # 여러 주기를 건너뛴 경우 다음 경계로 맞춤 (누락된 틱은 dt에 반영됨)
+        skipped = int((timestamp - self.next_tick_at) / self.nominal_dt)
+        self.next_tick_at += (skipped + 1) * self.nominal_dt
+        return True
+
+    def describe(self):
+        return f"rate:{self.hz:g}"
+
+
+class EveryFrameTick:
+    """중복이 아닌 모든 프레임마다 틱"""
+
+    def __init__(self, nominal_dt=EVERY_FRAME_TICK_DT):
+        self.nominal_dt = nominal_dt
+
+    def reset(self):
+        pass
+
+    def on_frame(self, can_id, timestamp=None):
+        return True
+
+    def describe(self):
+        return "every"
+
+
+def create_tick_source(spec=None):
+    """'frame:0xEA' / 'rate:50' / 'every' → 틱 소스 (spec이 없으면 환경변수 TICK_SOURCE, 설정값 순)"""
+    spec = (spec or os.environ.get('TICK_SOURCE') or TICK_SOURCE).strip().lower()
+    kind, _, arg = spec.partition(':')
+    try:
+        if kind == 'frame':
+            return FrameTick(int(arg, 16) if arg else 0xEA)
+        if kind == 'rate':
+            return RateTick(float(arg))
+        if kind == 'every':
+            return EveryFrameTick(float(arg) if arg else EVERY_FRAME_TICK_DT)
+    except ValueError as e:
+        raise ValueError(f"잘못된 틱 설정: {spec} ({e})")
+    raise ValueError(f"알 수 없는 틱 설정: {spec} (사용 가능: frame:<ID>, rate:<Hz>, every)")
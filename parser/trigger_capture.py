@@ -0,0 +1,189 @@
+# parser/trigger_capture.py
+# 트리거 캡처 - 모든 시간대를 기록하는 대신 이벤트 전후 구간만 이벤트 파일로 저장 (config/capture.py)
+#   최근 CAPTURE_PRE_SECONDS초의 행(과 원본 프레임)을 링 버퍼에 보관하다가
+#   trigger 컬럼에 *_on이 나타나면 이전 구간 + 이후 CAPTURE_POST_SECONDS초를 한 파일로 저장
+#   이후 구간 안에 새 트리거가 오면 구간 연장 (CAPTURE_MAX_SECONDS까지)
+# 파일: <이름>.csv.gz (행, 전체 해상도), <이름>.cap (원본 프레임, 바이너리 캡처 형식 - 그대로 재생 가능)
+#       index.jsonl에 구간마다 한 줄 (파일명, 트리거, 시작/끝 Time, 행/프레임 수)
+# 저장은 별도 스레드에서 (수신 경로는 파일 쓰기를 기다리지 않음)
+
+import csv
+import datetime
+import gzip
+import json
+import os
+import threading
+from collections import deque
+
+from config import capture as capture_config
+from parser.pipeline import BinaryCaptureWriter, META_COLUMNS, fsync_file
+
+INDEX_NAME = "index.jsonl"
+
+
+def log_mode():
+    """현재 로깅 방식 (환경변수 LOG_MODE 우선)"""
+    mode = os.environ.get("LOG_MODE", capture_config.LOG_MODE)
+    if mode not in ('continuous', 'trigger', 'both'):
+        raise ValueError(f"알 수 없는 LOG_MODE: {mode} (continuous/trigger/both)")
+    return mode
+
+
+def on_triggers(row):
+    """행의 trigger 컬럼 ("SB_on, PM_off") → 켜진 이벤트 코드 목록"""
+    trigger = row.get('trigger')
+    if not trigger or trigger == 'none':
+        return []
+    return [item.strip()[:-3] for item in str(trigger).split(',') if item.strip().endswith('_on')]
+
+
+class TriggerCaptureSink:
+    """행 싱크 + (원본 프레임 저장 시) 프레임 싱크"""
+
+    def __init__(self, directory=None, pre_seconds=None, post_seconds=None, max_seconds=None, raw_frames=None):
+        self.directory = directory or capture_config.CAPTURE_DIR
+        self.pre_seconds = capture_config.CAPTURE_PRE_SECONDS if pre_seconds is None else pre_seconds
+        self.post_seconds = capture_config.CAPTURE_POST_SECONDS if post_seconds is None else post_seconds
+        self.max_seconds = capture_config.CAPTURE_MAX_SECONDS if max_seconds is None else max_seconds
+        self.raw_frames = capture_config.CAPTURE_RAW_FRAMES if raw_frames is None else raw_frames
+        self.ring = deque()  # (행, 그 시간대의 원본 프레임 목록) - 최근 pre_seconds초
+        self.frames = []  # 아직 행이 닫히지 않은 시간대의 원본 프레임
+        self.next_frames = []  # 새 시간대를 연 틱 프레임 - 현재 시간대의 행이 저장된 뒤 다음 시간대로
+        self.capture = None  # 진행 중인 캡처
+        self.workers = []
+        self.lock = threading.Lock()
+        self.captures = 0
+        self.rows_seen = 0
+        self.rows_saved = 0
+        self.bytes_saved = 0
+
+    def write_frame(self, can_id, data_bytes, timestamp=None):
+        if self.raw_frames:
+            self.frames.append((can_id, data_bytes, timestamp))
+
+    def tick_frame(self):
+        """StreamEngine 알림 - 마지막으로 받은 프레임(틱)은 닫히는 시간대가 아니라 새 시간대에 속함
+        (닫히는 시간대가 비어 행이 없었으면 이전 틱 프레임은 그대로 현재 시간대에 남음)"""
+        if not self.raw_frames or not self.frames:
+            return
+        frames = self.next_frames + self.frames
+        self.next_frames = [frames.pop()]
+        self.frames = frames
+
+    def write(self, row):
+        entry = (row, self.frames)
+        self.frames = self.next_frames
+        self.next_frames = []
+        self.rows_seen += 1
+        time = row.get('Time') or 0.0
+        codes = on_triggers(row)
+        capture = self.capture
+
+        if capture is not None:
+            if time < capture['end']:
+                # 시간이 되돌아감 = 새 주행 데이터 - 진행 중인 캡처는 여기까지 저장
+                self._finish()
+            else:
+                capture['entries'].append(entry)
+                capture['end'] = time
+                if codes:
+                    capture['codes'].extend(code for code in codes if code not in capture['codes'])
+                    capture['until'] = time + self.post_seconds
+                if time >= capture['until'] or time - capture['start'] >= self.max_seconds:
+                    self._finish()
+                return
+
+        if self.ring and time < self.ring[-1][0].get('Time', 0.0):
+            self.ring.clear()
+        self.ring.append(entry)
+        while self.ring and self.ring[0][0].get('Time', 0.0) < time - self.pre_seconds:
+            self.ring.popleft()
+        if codes:
+            entries = list(self.ring)
+            self.ring.clear()
+            self.capture = {'entries': entries, 'codes': list(codes), 'trigger_time': time,
+                            'start': entries[0][0].get('Time', 0.0), 'end': time,
+                            'until': time + self.post_seconds,
+                            'started_at': datetime.datetime.now()}
+
+    def _finish(self):
+        """진행 중인 캡처를 저장 스레드로 넘김 - 끝부분은 다음 캡처의 이전 구간으로 다시 사용"""
+        capture, self.capture = self.capture, None
+        end = capture['end']
+        self.ring = deque(entry for entry in capture['entries']
+                          if entry[0].get('Time', 0.0) >= end - self.pre_seconds)
+        worker = threading.Thread(target=self._save, args=(capture,), name="trigger-capture", daemon=True)
+        self.workers = [thread for thread in self.workers if thread.is_alive()] + [worker]
+        worker.start()
+
+    def _save(self, capture):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = capture['started_at'].strftime("%Y%m%d_%H%M%S")
+        base = os.path.join(self.directory, f"event_{stamp}_{'-'.join(capture['codes'])}_{capture['trigger_time']:.1f}s")
+        entries = capture['entries']
+
+        # 행 - CsvLogSink와 같은 컬럼 순서 (Time, 신호들, event, trigger), 처음 나타난 순서대로 모든 신호
+        columns = list(dict.fromkeys(key for row, _ in entries for key in row if key not in META_COLUMNS))
+        rows_path = base + ".csv.gz"
+        with gzip.open(rows_path, 'wt', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Time'] + columns + ['event', 'trigger'])
+            for row, _ in entries:
+                writer.writerow([row.get('Time', 0)] + [row.get(key, '') for key in columns] +
+                                [row.get('event', 'none'), row.get('trigger', 'none')])
+        fsync_file(rows_path)
+        saved_bytes = os.path.getsize(rows_path)
+
+        frames_path = None
+        frame_count = sum(len(frames) for _, frames in entries)
+        if frame_count:
+            frames_path = base + ".cap"
+            writer = BinaryCaptureWriter(frames_path)
+            for _, frames in entries:
+                for can_id, data_bytes, timestamp in frames:
+                    writer.write(can_id, data_bytes, timestamp)
+            writer.close()
+            fsync_file(frames_path)
+            saved_bytes += os.path.getsize(frames_path)
+
+        record = {'rows': os.path.basename(rows_path),
+                  'frames': os.path.basename(frames_path) if frames_path else None,
+                  'codes': capture['codes'], 'trigger_time': capture['trigger_time'],
+                  'start': capture['start'], 'end': capture['end'], 'row_count': len(entries),
+                  'frame_count': frame_count, 'bytes': saved_bytes,
+                  'saved_at': datetime.datetime.now().isoformat(timespec='seconds')}
+        with self.lock:
+            with open(os.path.join(self.directory, INDEX_NAME), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self.captures += 1
+            self.rows_saved += len(entries)
+            self.bytes_saved += saved_bytes
+        print(f"🎯 이벤트 구간 저장: {rows_path} ({', '.join(capture['codes'])}, "
+              f"{capture['start']:.1f}~{capture['end']:.1f}s, {len(entries)}행, 프레임 {frame_count}개)")
+
+    def pending(self):
+        """아직 저장하지 않은 캡처 행 수"""
+        return len(self.capture['entries']) if self.capture else 0
+
+    def close(self):
+        """진행 중인 캡처는 이후 구간이 덜 찼어도 저장하고 저장 스레드를 기다림"""
+        if self.capture is not None:
+            self._finish()
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
+
+    def status(self):
+        with self.lock:
+            return {'mode': log_mode(), 'directory': self.directory, 'captures': self.captures,
+                    'capturing': self.capture is not None, 'rows_seen': self.rows_seen,
+                    'rows_saved': self.rows_saved, 'bytes_saved': self.bytes_saved}
+
+    def index(self, limit=100):
+        """저장된 이벤트 구간 목록 (최근 limit개)"""
+        path = os.path.join(self.directory, INDEX_NAME)
+        if not os.path.exists(path):
+            return []
+        with self.lock, open(path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        return records[-limit:]
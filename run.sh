@@ -2,15 +2,17 @@
 
 MODE=$1
 FILE=$2
+SPEED=${3:-1}
 
 if [ "$MODE" == "" ]; then
   MODE="0"
 fi
 
 if [ "$MODE" == "2" ] && [ "$FILE" == "" ]; then
-  echo "❗ replay 모드(2)에서는 CSV 파일 경로를 지정하세요"
-  echo "예: ./run.sh 2 logs/logged_20250702.csv"
+  echo "❗ replay 모드(2)에서는 재생할 파일 경로를 지정하세요 (원본 캡처 .txt/.cap 또는 CSV)"
+  echo "예: ./run.sh 2 logs/logged_20250702.csv      # 실시간 속도"
+  echo "    ./run.sh 2 logs/drive_20250702.cap 0     # 배속 0 = 최대 속도"
   exit 1
 fi
 
-python entry.py "$MODE" "$FILE"
+python entry.py "$MODE" "$FILE" "$SPEED"
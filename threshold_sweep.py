@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+이벤트 임계값 스윕 - 주행 데이터를 한 번만 로드(디코딩)한 뒤 여러 파라미터 조합을 병렬 평가
+
+사용 예:
+  python threshold_sweep.py logs/original/*.txt --grid SB_pressure=250,300,350 --grid DD_hold=2.5,3.0
+  python threshold_sweep.py logs/simulated_*.csv --grid SH_rate=80,100,120 --workers 4
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from config.event_rules import DEFAULT_PARAMS, EVENT_PRIORITY, RULE_SIGNALS
+from event_logic.event_detector import tick_dt
+from parser.derived_signals import DerivedSignalEngine
+
+CACHE_DIR = "logs/sweep_cache"
+
+# 워커 프로세스별로 한 번만 전달받는 주행 데이터
+_drives = None
+
+
+def _file_hash(path, digest):
+    with open(path, 'rb') as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+
+
+def decode_cache_key(path):
+    """디코딩 결과를 바꾸는 모든 입력의 해시 - 로그 내용, 버스/DBC 내용, 틱 설정, 파생 신호 정의"""
+    from config import buses, signals
+    from parser.tick_source import create_tick_source
+
+    digest = hashlib.sha256()
+    _file_hash(path, digest)
+    digest.update(json.dumps(buses.BUSES, sort_keys=True, default=str).encode())
+    for _, spec in sorted(buses.BUSES.items()):
+        _file_hash(spec['dbc'], digest)
+    digest.update(create_tick_source().describe().encode())
+    digest.update(json.dumps(signals.DERIVED_SIGNALS, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+def decode_raw_log(path):
+    """원본 UART 로그(.txt)를 시간대별 행 CSV로 변환 (결과는 캐시되어 재사용)
+    캐시 이름에 decode_cache_key()가 들어가므로 로그/DBC/TICK_SOURCE/DERIVED_SIGNALS가 바뀌면 다시 디코딩"""
+    from uart_simulator import UARTSimulator
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    base_name = os.path.splitext(os.path.basename(path))[0]
+    cache_path = os.path.join(CACHE_DIR, f"{base_name}_{decode_cache_key(path)}.csv")
+    if os.path.exists(cache_path):
+        return cache_path
+
+    print(f"🔄 디코딩 (최초 1회): {path}")
+    # 중간에 중단돼도 불완전한 캐시가 남지 않도록 임시 파일에 쓴 뒤 교체
+    temp_path = cache_path[:-len(".csv")] + ".tmp.csv"
+    UARTSimulator().simulate_from_file(path, temp_path)
+    if not os.path.exists(temp_path):
+        # 시간대가 하나도 만들어지지 않으면 DataFrameSink가 파일을 쓰지 않음
+        raise ValueError(f"디코딩 가능한 행이 없습니다: {path}")
+    os.replace(temp_path, cache_path)
+    return cache_path
+
+
+def load_drive(path):
+    """주행 데이터 1개를 (시간대 길이 dt, 규칙 평가에 필요한 신호만 담은 행) 리스트로 로드"""
+    if path.endswith('.txt'):
+        path = decode_raw_log(path)
+
+    df = pd.read_csv(path).ffill().fillna(0)
+    engine = DerivedSignalEngine()
+    names = set(RULE_SIGNALS.values())
+
+    times = df['Time'].tolist() if 'Time' in df.columns else None
+    rows = []
+    for index, record in enumerate(df.to_dict('records')):
+        engine.update(record)
+        rows.append((tick_dt(times, index), {name: record.get(name, 0) for name in names}))
+    return rows
+
+
+def _init_worker(drives):
+    global _drives
+    _drives = drives
+
+
+def evaluate_config(overrides):
+    """파라미터 조합 1개를 모든 주행 데이터에 대해 평가"""
+    from event_logic.rule_engine import load_rule_set
+    from event_logic.rules import EventFSM
+
+    started = time.perf_counter()
+    rule_set = load_rule_set(overrides=overrides)
+
+    stats = {event: {'count': 0, 'seconds': 0.0, 'first_on': None} for event in EVENT_PRIORITY}
+    ticks = 0
+    for rows in _drives.values():
+        fsm = EventFSM(rule_set)
+        elapsed = 0.0
+        for dt, row in rows:
+            elapsed += dt
+            for trigger in fsm.detect(row, dt):
+                event, state = trigger.rsplit('_', 1)
+                if state == 'on':
+                    stats[event]['count'] += 1
+                    first_on = stats[event]['first_on']
+                    if first_on is None or elapsed < first_on:
+                        stats[event]['first_on'] = round(elapsed, 1)
+            current = fsm.get_current_event()
+            if current != 'none':
+                stats[current[:-3]]['seconds'] += dt
+        ticks += len(rows)
+
+    result = dict(overrides)
+    for event in EVENT_PRIORITY:
+        result[f'{event}_count'] = stats[event]['count']
+        result[f'{event}_seconds'] = round(stats[event]['seconds'], 1)
+        result[f'{event}_first_on'] = stats[event]['first_on']
+    result['ticks'] = ticks
+    result['eval_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+def _parse_value(text):
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def parse_grid(specs):
+    """['SB_pressure=250,300', ...] → 파라미터 조합 리스트"""
+    axes = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if name not in DEFAULT_PARAMS:
+            raise ValueError(f"알 수 없는 파라미터: {name}")
+        axes[name] = [_parse_value(v) for v in values.split(',')]
+
+    names = list(axes)
+    return [dict(zip(names, combo)) for combo in itertools.product(*axes.values())]
+
+
+def run_sweep(paths, configs, workers=None):
+    """주행 데이터를 한 번 로드하고 모든 조합을 프로세스 풀로 평가"""
+    load_started = time.perf_counter()
+    drives = {}
+    for path in paths:
+        try:
+            drives[path] = load_drive(path)
+        except ValueError as e:
+            print(f"⚠️ 주행 데이터 제외: {e}")
+    if not drives:
+        raise ValueError("평가할 주행 데이터가 없습니다")
+    total_rows = sum(len(rows) for rows in drives.values())
+    print(f"📁 주행 데이터 {len(drives)}개 로드 완료: {total_rows}행 "
+          f"({time.perf_counter() - load_started:.1f}초)")
+
+    started = time.perf_counter()
+    if workers == 1:
+        _init_worker(drives)
+        results = [evaluate_config(config) for config in configs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(drives,)) as pool:
+            results = list(pool.map(evaluate_config, configs))
+    duration = time.perf_counter() - started
+    print(f"⚙️ {len(configs)}개 조합 평가 완료: {duration:.1f}초 "
+          f"({len(configs) * total_rows / max(duration, 1e-9):.0f} 행/초)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이벤트 임계값 파라미터 스윕")
+    parser.add_argument('paths', nargs='+', help="원본 로그(.txt) 또는 시간대별 CSV")
+    parser.add_argument('--grid', action='append', default=[],
+                        help="파라미터=값1,값2,... (여러 번 지정 가능)")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (1이면 단일 프로세스)")
+    parser.add_argument('--output', default=None, help="결과 CSV 경로")
+    args = parser.parse_args()
+
+    configs = parse_grid(args.grid) if args.grid else [{}]
+    results = run_sweep(args.paths, configs, args.workers)
+
+    output = args.output or f"logs/sweep_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    df = pd.DataFrame(results)
+    df.to_csv(output, index=False)
+
+    print(df.to_string(index=False))
+    print(f"✅ 스윕 결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
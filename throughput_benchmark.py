@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+처리량 벤치마크 - CAN FD 트래픽을 가상 시리얼(pty)로 흘려보내며
+MonitorCore.start가 지연 없이 처리할 수 있는 프레임/초와 단계별 지연, CPU 사용률을 측정
+
+사용 예:
+  python throughput_benchmark.py                       # 배율 1,2,4,8 단계별 측정
+  python throughput_benchmark.py --scales 1,5,10 --duration 20
+  python throughput_benchmark.py --unthrottled         # 송신 대기 없이 최대 속도
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+from serial import Serial
+
+import parser.pipeline as pipeline
+from can_traffic_generator import CanTrafficGenerator, feed, open_pty
+from parser.monitor_core import MonitorCore
+
+STAGES = ['read', 'decode', 'detect', 'log', 'websocket']
+# 송신량 대비 이 비율 이상 처리하면 "따라잡음"으로 판단
+SUSTAINED_RATIO = 0.99
+
+
+class StageProbe:
+    """MonitorCore의 각 단계 호출 시간을 측정하는 래퍼"""
+
+    def __init__(self):
+        self.samples = {stage: [] for stage in STAGES}
+        self.processed = 0
+
+    def wrap(self, stage, func):
+        samples = self.samples[stage]
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter() - started)
+        return timed
+
+    def attach(self, monitor, serial):
+        serial.readline = self.wrap('read', serial.readline)
+        pipeline.decode_frame = self.wrap('decode', pipeline.decode_frame)
+        pipeline.process_data = self.wrap('detect', pipeline.process_data)
+        monitor.csv_sink.write = self.wrap('log', monitor.csv_sink.write)
+
+        process_line = monitor.process_line
+
+        def counted(line, *args):
+            if line:
+                self.processed += 1
+            return process_line(line, *args)
+        monitor.process_line = counted
+
+    def summary(self):
+        result = {}
+        for stage, samples in self.samples.items():
+            if not samples:
+                result[stage] = None
+                continue
+            ordered = sorted(samples)
+            result[stage] = {
+                'count': len(samples),
+                'mean_us': round(statistics.fmean(samples) * 1e6, 1),
+                'p50_us': round(ordered[len(ordered) // 2] * 1e6, 1),
+                'p99_us': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1e6, 1),
+            }
+        return result
+
+
+async def websocket_consumer(monitor, probe, stop):
+    """대시보드 websocket과 같은 주기(0.05초)로 최신 데이터를 직렬화"""
+    timed = probe.wrap('websocket', lambda: json.dumps(monitor.get_latest_data_for_dashboard(), default=str))
+    while not stop.is_set():
+        timed()
+        await asyncio.sleep(0.05)
+
+
+async def run_level(scale, duration, unthrottled=False, keep_logs=False, metrics=True):
+    """배율 1개에 대해 송신 → MonitorCore.start 처리를 측정"""
+    generator = CanTrafficGenerator(scale=scale)
+    frames = list(generator.frames(duration))  # 인코딩 비용은 측정에서 제외
+
+    master, path = open_pty()
+    serial = Serial(path, 115200, timeout=0.1)
+    monitor = MonitorCore()
+    monitor.metrics.set_enabled(metrics)
+    if not keep_logs:
+        monitor.csv_sink.directory = tempfile.mkdtemp(prefix="throughput_logs_")
+    probe = StageProbe()
+    probe.attach(monitor, serial)
+    original = (pipeline.decode_frame, pipeline.process_data)
+
+    sent_info = {}
+
+    def send():
+        sent_info['sent'], sent_info['seconds'] = feed(master, frames, not unthrottled)
+    writer = threading.Thread(target=send, daemon=True)
+
+    stop = threading.Event()
+    backlog_max = 0
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        monitor_task = asyncio.ensure_future(monitor.start(serial))
+        consumer_task = asyncio.ensure_future(websocket_consumer(monitor, probe, stop))
+        writer.start()
+
+        # 송신 중: 송신 예정 시각 기준 적체량 추적
+        while writer.is_alive():
+            await asyncio.sleep(0.1)
+            offered = min(len(frames), int((time.perf_counter() - started) * generator.frames_per_second))
+            backlog_max = max(backlog_max, offered - probe.processed)
+
+        # 송신 완료 후 처리량이 송신량을 따라잡을 때까지 (최대 5초) 대기
+        drain_deadline = time.perf_counter() + 5
+        while probe.processed < sent_info['sent'] and time.perf_counter() < drain_deadline:
+            await asyncio.sleep(0.1)
+        finished = time.perf_counter()
+
+        monitor.running = False
+        stop.set()
+        await asyncio.gather(monitor_task, consumer_task)
+        monitor.stop_csv_logging()
+    cpu = time.process_time() - cpu_started
+    writer.join()
+    os.close(master)
+    pipeline.decode_frame, pipeline.process_data = original
+
+    if not keep_logs:
+        shutil.rmtree(monitor.csv_sink.directory, ignore_errors=True)
+
+    wall = finished - started
+    sent = sent_info['sent']
+    offered_fps = sent / sent_info['seconds']
+    # pty 버퍼가 차면 송신이 막히므로, 송신률이 목표보다 낮아진 경우도 처리 지연으로 봄
+    kept_up = probe.processed >= sent * SUSTAINED_RATIO
+    if not unthrottled:
+        kept_up = kept_up and offered_fps >= generator.frames_per_second * SUSTAINED_RATIO
+    return {
+        'scale': scale,
+        'metrics': metrics,
+        'target_fps': round(generator.frames_per_second, 1),
+        'offered_fps': round(offered_fps, 1),
+        'sent': sent,
+        'processed': probe.processed,
+        'sustained_fps': round(probe.processed / wall, 1),
+        'kept_up': kept_up,
+        'backlog_max_frames': backlog_max,
+        'cpu_percent': round(cpu / wall * 100, 1),
+        'stages': probe.summary(),
+    }
+
+
+def print_result(result):
+    status = "✅" if result['kept_up'] else "❌ 지연"
+    print(f"{status} 배율 {result['scale']} (계측 {'on' if result['metrics'] else 'off'}): 목표 {result['target_fps']} fps, 송신 {result['offered_fps']} fps → 처리 {result['sustained_fps']} fps "
+          f"({result['processed']}/{result['sent']}), 최대 적체 {result['backlog_max_frames']}프레임, "
+          f"CPU {result['cpu_percent']}%")
+    for stage in STAGES:
+        stats = result['stages'][stage]
+        if stats:
+            print(f"     {stage:<10} n={stats['count']:<7} 평균 {stats['mean_us']:>8}us  "
+                  f"p50 {stats['p50_us']:>8}us  p99 {stats['p99_us']:>8}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MonitorCore 처리량 벤치마크 (pty 사용)")
+    parser.add_argument('--scales', default='1,2,4,8', help="메시지 주기 배율 목록 (쉼표 구분)")
+    parser.add_argument('--duration', type=float, default=10, help="배율별 송신 구간 (초)")
+    parser.add_argument('--unthrottled', action='store_true', help="송신 대기 없이 최대 속도로 송신")
+    parser.add_argument('--metrics', choices=['on', 'off', 'both'], default='on',
+                        help="MonitorCore 계측 on/off (both: 오버헤드 비교)")
+    parser.add_argument('--keep-logs', action='store_true', help="측정 중 생성된 CSV 로그 유지")
+    parser.add_argument('--output', help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    results = []
+    metrics_modes = {'on': [True], 'off': [False], 'both': [False, True]}[args.metrics]
+    for scale in [float(s) for s in args.scales.split(',')]:
+        for metrics in metrics_modes:
+            result = asyncio.run(run_level(scale, args.duration, args.unthrottled,
+                                           args.keep_logs, metrics))
+            print_result(result)
+            results.append(result)
+
+    sustained = [r for r in results if r['kept_up']]
+    if sustained:
+        best = max(sustained, key=lambda r: r['sustained_fps'])
+        print(f"📈 지연 없이 처리한 최대 부하: {best['sustained_fps']} 프레임/초 (배율 {best['scale']})")
+    else:
+        print("📉 모든 부하에서 처리 지연 발생")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"📁 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
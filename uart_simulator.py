@@ -6,10 +6,7 @@ UART 시뮬레이터 - 실제 UART 연결 없이 로그 파일을 시뮬레이
 import time
 import serial
 import threading
-from parser.can_decoder import decode_line
-from parser.monitor_core import MonitorCore
-from event_logic.event_detector import process_data
-import pandas as pd
+from parser.pipeline import StreamEngine, DataFrameSink, open_source
 import os
 from datetime import datetime
 
@@ -18,7 +15,6 @@ class UARTSimulator:
         self.port = port
         self.baudrate = baudrate
         self.serial = None
-        self.monitor = MonitorCore()
         self.running = False
         self.cycle_count = 0
         self.event_count = 0
@@ -55,8 +51,9 @@ class UARTSimulator:
         except:
             return None
         
-    def simulate_from_file(self, filename, output_filename=None):
-        """로그 파일을 읽어서 시뮬레이션하고 결과를 CSV로 저장"""
+    def simulate_from_file(self, filename, output_filename=None, tick_source=None):
+        """로그 파일(.txt 텍스트, .cap 바이너리 캡처)을 읽어서 시뮬레이션하고 결과를 CSV로 저장
+        (.parquet 출력 경로를 주면 컬럼 형식으로 저장)"""
         print(f"🚀 UART 시뮬레이션 시작: {filename}")
         
         if not os.path.exists(filename):
@@ -72,135 +69,23 @@ class UARTSimulator:
         # 출력 디렉토리 생성
         os.makedirs(os.path.dirname(output_filename), exist_ok=True)
         
-        results = []
-        cycle_count = 0
-        event_count = 0
-        time_counter = 0  # 정수 카운터 (0xEA마다 1씩 증가)
-        last_seen_ids = {}  # 각 ID별로 마지막에 본 데이터를 저장
-        current_time_data = {}  # 현재 시간대의 모든 데이터를 저장
-        last_values = {}  # 각 신호별로 마지막 값을 저장
-        last_ea_data = None  # 마지막 0xEA 데이터 저장 (연속 체크용)
+        # 실시간 경로와 같은 StreamEngine으로 대기 없이 재생
+        sink = DataFrameSink(output_filename, exclude=['trigger'])
+        engine = StreamEngine(tick_source, sinks=[sink])
+        # 이벤트 FSM/파생 신호는 전역 상태 - 이전 파일의 타이머/변화율 히스토리가 이어지지 않도록 초기화
+        engine.reset()
+        source = open_source(filename)
+        started = time.perf_counter()
+        engine.run(source)
+        duration = time.perf_counter() - started
+        if source.errors:
+            print(f"⚠️ 처리 오류로 건너뛴 {source.unit}: {source.errors}개")
         
-        with open(filename, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line or 'CAN FD RX:' not in line:
-                    continue
-                    
-                try:
-                    # CAN ID 추출
-                    can_id = self.extract_can_id(line)
-                    if can_id is None:
-                        continue
-                    
-                    # CAN 디코딩
-                    decoded = decode_line(line)
-                    if not decoded:
-                        continue
-                    
-                    # 0xEA 신호 처리
-                    if can_id == 0xEA:
-                        # 연속된 0xEA 신호 체크
-                        current_ea_data = str(decoded)
-                        if last_ea_data == current_ea_data:
-                            print(f"⚠️ 연속된 0xEA 신호 무시: 라인 {line_num}")
-                            continue  # 연속된 신호는 무시
-                        
-                        last_ea_data = current_ea_data
-                        
-                        # 이전 시간대 데이터가 있으면 이벤트 처리 및 저장
-                        if current_time_data:
-                            # 이벤트 감지
-                            result = process_data(current_time_data)
-                            
-                            # 이벤트 정보 업데이트
-                            if result and 'event' in result and result['event'] != 'none':
-                                current_time_data['event'] = result['event']
-                                event_count += 1
-                                print(f"   🔥 이벤트 감지: {result['event']}")
-                            
-                            # none값들을 이전값으로 처리
-                            for key, value in current_time_data.items():
-                                if key == 'Time' or key == 'event':
-                                    continue
-                                if value == '' or value is None:
-                                    if key in last_values:
-                                        current_time_data[key] = last_values[key]
-                                else:
-                                    last_values[key] = value
-                            
-                            results.append(current_time_data)
-                            print(f"✅ 시간대 처리 완료: {current_time_data.get('Time', 0)}s, 이벤트: {current_time_data.get('event', 'none')}")
-                        
-                        time_counter += 1
-                        cycle_count += 1
-                        # 새로운 시간대 시작 (이전 데이터 복사)
-                        if results:
-                            current_time_data = results[-1].copy()
-                        else:
-                            current_time_data = {}
-                        current_time_data['Time'] = round(time_counter * 0.1, 1)
-                        current_time_data['event'] = 'none'
-                    
-                    # 연속된 신호 체크 (같은 ID의 데이터가 이전과 동일하면 무시)
-                    data_key = str(decoded)
-                    if can_id in last_seen_ids and last_seen_ids[can_id] == data_key:
-                        continue  # 연속된 신호는 무시
-                    
-                    last_seen_ids[can_id] = data_key
-                    
-                    # 현재 시간대 데이터에 추가 (이미 있는 값은 덮어쓰기)
-                    for key, value in decoded.items():
-                        try:
-                            current_time_data[key] = float(value)
-                        except (ValueError, TypeError):
-                            current_time_data[key] = value
-                    
-                    # 진행상황 출력 (1000주기마다)
-                    if cycle_count % 1000 == 0:
-                        print(f"   📊 처리된 주기: {cycle_count}, 이벤트: {event_count}")
-                        
-                except Exception as e:
-                    print(f"   ❌ 라인 {line_num} 처리 오류: {e}")
-                    continue
-        
-        # 마지막 시간대 데이터 처리
-        if current_time_data:
-            # 이벤트 감지
-            result = process_data(current_time_data)
-            
-            # 이벤트 정보 업데이트
-            if result and 'event' in result and result['event'] != 'none':
-                current_time_data['event'] = result['event']
-                event_count += 1
-                print(f"   🔥 이벤트 감지: {result['event']}")
-            
-            # none값들을 이전값으로 처리
-            for key, value in current_time_data.items():
-                if key == 'Time' or key == 'event':
-                    continue
-                if value == '' or value is None:
-                    if key in last_values:
-                        current_time_data[key] = last_values[key]
-                else:
-                    last_values[key] = value
-            
-            results.append(current_time_data)
-            print(f"✅ 마지막 시간대 처리 완료: {current_time_data.get('Time', 0)}s, 이벤트: {current_time_data.get('event', 'none')}")
-        
-        # 결과를 DataFrame으로 변환하고 CSV 저장
-        if results:
-            df = pd.DataFrame(results)
-            
-            # Time과 event 컬럼을 첫 번째와 마지막으로 이동
-            cols = [col for col in df.columns if col not in ['Time', 'event']]
-            cols = ['Time'] + cols + ['event']
-            df = df[cols]
-            
-            df.to_csv(output_filename, index=False)
+        if sink.rows:
+            event_count = sum(1 for row in sink.rows if row.get('event', 'none') != 'none')
             print(f"✅ 시뮬레이션 완료!")
             print(f"   📁 저장된 파일: {output_filename}")
-            print(f"   📊 총 처리 주기: {cycle_count}")
+            print(f"   📊 총 처리 주기: {engine.time_counter} ({len(sink.rows) / max(duration, 1e-9):.0f} 주기/초)")
             print(f"   🎯 감지된 이벤트: {event_count}")
         else:
             print("❌ 처리된 데이터가 없습니다.")
@@ -216,7 +101,7 @@ def main():
         print(f"❌ {original_dir} 폴더가 없습니다.")
         return
         
-    txt_files = [f for f in os.listdir(original_dir) if f.endswith('.txt')]
+    txt_files = [f for f in os.listdir(original_dir) if f.endswith(('.txt', '.cap'))]
     if not txt_files:
         print(f"❌ {original_dir} 폴더에 .txt 파일이 없습니다.")
         return